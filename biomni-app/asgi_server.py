@@ -0,0 +1,89 @@
+import asyncio
+import os
+from typing import Any
+
+from biomni.agent import A1
+from biomni.tool.database import query_clinvar
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# Load environment variables from .env if present
+load_dotenv()
+
+
+def create_agent() -> Any:
+    data_path = os.getenv("BIOMNI_DATA_PATH", "./data")
+    # Model selection: can be set via BIOMNI_MODEL (e.g., "claude-sonnet-4-20250514" or "azure-gpt-4o")
+    model_name = os.getenv("BIOMNI_MODEL", "gpt-5-2025-08-07")
+    source = "OpenAI"
+    api_key = os.getenv("OPENAI_API_KEY")
+
+    return A1(
+        path=data_path,
+        llm=model_name,
+        source=source,  # type: ignore[arg-type]
+        api_key=api_key,
+        # Fetch data lake files on first use instead of downloading ~11GB before serving
+        lazy_data_lake=os.getenv("BIOMNI_LAZY_DATA_LAKE", "false").lower() in {"1", "true", "yes"},
+        code_workers=int(os.getenv("BIOMNI_CODE_WORKERS", "32")),
+    )
+
+
+# A single shared agent; sessions run concurrently through A1.ago instead of behind a lock
+agent = create_agent()
+# Upper bound on in-flight sessions so a burst cannot exhaust LLM rate limits or memory
+session_slots = asyncio.Semaphore(int(os.getenv("BIOMNI_MAX_SESSIONS", "256")))
+
+
+async def health(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok"})
+
+
+async def go(request: Request) -> JSONResponse:
+    try:
+        payload: dict[str, Any] = await request.json()
+        prompt = payload.get("prompt")
+        if not prompt:
+            return JSONResponse({"error": "Missing 'prompt'"}, status_code=400)
+
+        async with session_slots:
+            log, final = await agent.ago(str(prompt))
+
+        return JSONResponse({"final": final})
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def clinvar(request: Request) -> JSONResponse:
+    try:
+        payload: dict[str, Any] = await request.json()
+        search_query = payload.get("search_query")
+        if not search_query:
+            return JSONResponse({"error": "Missing 'search_query'"}, status_code=400)
+
+        # query_clinvar is synchronous; run it off the event loop
+        final = await asyncio.to_thread(query_clinvar, prompt=search_query, model="gpt-5-nano-2025-08-07")
+        return JSONResponse({"final": final})
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+app = Starlette(
+    routes=[
+        Route("/health", health, methods=["GET"]),
+        Route("/go", go, methods=["POST"]),
+        Route("/clinvar", clinvar, methods=["POST"]),
+    ]
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    host = os.getenv("ASGI_HOST", "0.0.0.0")
+    port = int(os.getenv("ASGI_PORT", "8080"))
+    # One process, one event loop: concurrency comes from awaiting LLM I/O, not from threads
+    uvicorn.run(app, host=host, port=port)
@@ -0,0 +1,101 @@
+"""Import-time benchmark for Biomni worker cold start.
+
+Each statement runs in a fresh interpreter so nothing is served from an already-warm module cache.
+Results are printed as JSON so CI can store them; pass a previous result with ``--baseline`` to fail
+when any statement regresses by more than ``--threshold``.
+
+    python benchmarks/import_time.py --output import_time.json
+    python benchmarks/import_time.py --baseline import_time.json --threshold 0.25
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = {
+    "biomni": "import biomni",
+    "biomni.llm": "import biomni.llm",
+    "biomni.utils": "import biomni.utils",
+    "biomni.agent.a1": "from biomni.agent import A1",
+    "read_module2api": "from biomni.utils import read_module2api; read_module2api()",
+    "biomni.tool.genetics": "import biomni.tool.genetics",
+    "biomni.tool.genomics": "import biomni.tool.genomics",
+    "biomni.tool.database": "import biomni.tool.database",
+}
+
+
+def time_statement(statement: str, repeat: int) -> dict:
+    """Time a statement in fresh subprocesses.
+
+    Args:
+        statement: Python code to run
+        repeat: Number of fresh interpreters to start
+
+    Returns:
+        Dictionary with the median and minimum wall time in seconds, or the error if it failed
+
+    """
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1] if result.stderr else "failed"}
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return {"median": statistics.median(samples), "min": min(samples)}
+
+
+def baseline_interpreter(repeat: int) -> float:
+    """Startup time of a bare interpreter, reported so import times can be read in context."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """List the statements whose median import time grew by more than the threshold."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name, {})
+        if "median" not in current or "median" not in previous:
+            continue
+        if current["median"] > previous["median"] * (1 + threshold):
+            regressions.append(f"{name}: {previous['median']:.3f}s -> {current['median']:.3f}s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Biomni import and startup times")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per statement")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown")
+    args = parser.parse_args()
+
+    results = {name: time_statement(statement, args.repeat) for name, statement in STATEMENTS.items()}
+    report = {"python": sys.version.split()[0], "interpreter": baseline_interpreter(args.repeat), "imports": results}
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["imports"], args.threshold)
+        if regressions:
+            print("✗ Import time regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("✓ No import time regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,11 @@
-from biomni.agent.a1 import A1
+# A1 is resolved on first attribute access (PEP 562) so that importing a sibling module such as
+# biomni.agent.qa_llm does not drag in langgraph and the whole agent stack.
+__all__ = ["A1"]
+
+
+def __getattr__(name):
+    if name == "A1":
+        from biomni.agent.a1 import A1
+
+        return A1
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
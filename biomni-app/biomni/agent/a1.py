@@ -1,7 +1,11 @@
+import asyncio
+import functools
 import glob
 import inspect
 import os
 import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Literal, TypedDict
 
@@ -9,9 +13,17 @@ import pandas as pd
 from dotenv import load_dotenv
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
 
+from biomni.data_lake.catalog import DataLakeCatalog
+from biomni.data_lake.gene_ids import load_gene_normalizer, normalize_genes
+from biomni.data_lake.gene_index import LazyGeneIndex
+from biomni.data_lake.knowledge_graph import LazyKnowledgeGraph
+from biomni.data_lake.loader import DataLakeLoader
+from biomni.data_lake.query import DataLakeQuery
+from biomni.data_lake.shared_cache import SharedTableCache
 from biomni.env_desc import data_lake_dict, library_content_dict
 from biomni.llm import SourceType, get_llm
 from biomni.model.retriever import ToolRetriever
@@ -49,6 +61,8 @@ class A1:
         timeout_seconds=600,
         base_url: str | None = None,
         api_key: str = "EMPTY",
+        code_workers: int = 32,
+        lazy_data_lake: bool = False,
     ):
         """Initialize the biomni agent.
 
@@ -60,6 +74,9 @@ class A1:
             timeout_seconds: Timeout for code execution in seconds
             base_url: Base URL for custom model serving (e.g., "http://localhost:8000/v1")
             api_key: API key for the custom LLM
+            code_workers: Size of the thread pool that runs code blocks for `ago` sessions
+            lazy_data_lake: If True, skip the up-front data lake and benchmark downloads and fetch
+                each data lake file the first time it is used
 
         """
         self.path = path
@@ -77,18 +94,27 @@ class A1:
         os.makedirs(data_lake_dir, exist_ok=True)
 
         expected_data_lake_files = list(data_lake_dict.keys())
+        self.lazy_data_lake = lazy_data_lake
+        self.data_lake = DataLakeCatalog(data_lake_dir)
+        self.data_lake_query = DataLakeQuery(self.data_lake)
+        self.shared_tables = SharedTableCache(self.data_lake)
+        self.knowledge_graph = LazyKnowledgeGraph(self.data_lake)
+        self.gene_index = LazyGeneIndex(self.data_lake)
+
+        if lazy_data_lake:
+            print("Lazy data lake: files will be downloaded on first access")
+        else:
+            # Check and download missing data lake files
+            print("Checking and downloading missing data lake files...")
+            check_and_download_s3_files(
+                s3_bucket_url="https://biomni-release.s3.amazonaws.com",
+                local_data_lake_path=data_lake_dir,
+                expected_files=expected_data_lake_files,
+                folder="data_lake",
+            )
 
-        # Check and download missing data lake files
-        print("Checking and downloading missing data lake files...")
-        check_and_download_s3_files(
-            s3_bucket_url="https://biomni-release.s3.amazonaws.com",
-            local_data_lake_path=data_lake_dir,
-            expected_files=expected_data_lake_files,
-            folder="data_lake",
-        )
-
-        # Check if benchmark directory structure is complete
-        benchmark_ok = False
+        # Check if benchmark directory structure is complete; lazy mode never needs it to serve requests
+        benchmark_ok = lazy_data_lake
         if os.path.isdir(benchmark_dir):
             patient_gene_detection_dir = os.path.join(benchmark_dir, "hle")
             if os.path.isdir(patient_gene_detection_dir):
@@ -118,6 +144,8 @@ class A1:
 
         # Add timeout parameter
         self.timeout_seconds = timeout_seconds  # 10 minutes default timeout
+        # Blocking code execution for async sessions is offloaded here so the event loop stays free
+        self._code_executor = ThreadPoolExecutor(max_workers=code_workers, thread_name_prefix="biomni-exec")
         self.configure()
 
     def add_tool(self, api):
@@ -556,6 +584,7 @@ class A1:
                         break
 
         if removed:
+            self._retrieval_resources = None
             print(f"Custom tool '{name}' has been removed")
         else:
             print(f"Custom tool '{name}' was not found")
@@ -657,6 +686,7 @@ class A1:
             removed = True
 
         if removed:
+            self._retrieval_resources = None
             print(f"Custom data item '{name}' has been removed")
         else:
             print(f"Custom data item '{name}' was not found")
@@ -756,6 +786,7 @@ class A1:
             removed = True
 
         if removed:
+            self._retrieval_resources = None
             print(f"Custom software item '{name}' has been removed")
         else:
             print(f"Custom software item '{name}' was not found")
@@ -1056,7 +1087,7 @@ Environment Resources:
 
 - Biological data lake
 You can access a biological data lake at the following path: {data_lake_path}.
-{data_lake_intro}
+{data_lake_intro}{data_lake_access}
 Each item is listed with its description to help you understand its contents.
 ----
 {data_lake_content}
@@ -1099,6 +1130,31 @@ Each library is listed with its description to help you understand its functiona
             "import_instruction": import_instruction,
             "data_lake_path": self.path + "/data_lake",
             "data_lake_intro": data_lake_intro,
+            "data_lake_access": (
+                (
+                    "\nFiles are downloaded on first use: any file named in your code is fetched before the code runs, "
+                    "and in Python `data_lake.path(name)` returns a local path for a file."
+                    if getattr(self, "lazy_data_lake", False)
+                    else ""
+                )
+                + "\nTo filter or join tabular files (parquet, csv, tsv) without loading them whole, use "
+                "`query_data_lake(sql, params)` in Python; it returns a pandas DataFrame. Each file is a table named "
+                "after the file without its extension, e.g. "
+                '`query_data_lake("SELECT * FROM gene_info WHERE symbol = ?", ["TP53"])`.'
+                "\nTo load a file as a DataFrame, use `load_data_lake(name, columns=None, filters=None)` instead of "
+                "pd.read_csv/pd.read_parquet: it parses each file once per session and serves later calls from memory. "
+                "Filters are (column, op, value) tuples, e.g. "
+                '`load_data_lake("DisGeNET.parquet", filters=[("gene_symbol", "in", ["TP53", "BRCA1"])])`.'
+                "\nFor graph questions over kg.csv, use `knowledge_graph` instead of loading the CSV: "
+                "`neighbors(node, relations=None)`, `k_hop(nodes, k=2)`, `meta_path(start, [relation, ...])` and "
+                "`shortest_paths(sources, targets, max_depth=4)` take node names or ids and return DataFrames."
+                "\nFor everything the data lake records about a gene, call `gene_profile(gene)` first: it accepts a "
+                "symbol, alias, Entrez or Ensembl id and returns a dict with the gene's ids and, under 'tables', the "
+                "matching rows of gene_info, DisGeNET, OMIM, GTEx, markers, variants, interactions and MSigDB sets."
+                "\nTo map gene identifiers, use `normalize_genes(ids)` instead of upper-casing symbols or calling web "
+                "services: it resolves symbols, aliases, previous symbols, HGNC, Entrez and Ensembl ids offline and "
+                "returns a DataFrame with query, symbol, hgnc_id, entrez, ensembl and matched_as columns."
+            ),
             "data_lake_content": data_lake_content_formatted,
             "library_intro": library_intro,
             "library_content_formatted": library_content_formatted,
@@ -1126,11 +1182,11 @@ Each library is listed with its description to help you understand its functiona
         """
         # Store self_critic for later use
         self.self_critic = self_critic
+        # Tools, data or software may have changed; regather the retrieval resources on next use
+        self._retrieval_resources = None
 
         # Get data lake content
-        data_lake_path = self.path + "/data_lake"
-        data_lake_content = glob.glob(data_lake_path + "/*")
-        data_lake_items = [x.split("/")[-1] for x in data_lake_content]
+        data_lake_items = self._data_lake_items()
 
         # Store data_lake_dict as instance variable for use in retrieval
         self.data_lake_dict = data_lake_dict
@@ -1193,13 +1249,7 @@ Each library is listed with its description to help you understand its functiona
         )
 
         # Define the nodes
-        def generate(state: AgentState) -> AgentState:
-            messages = [SystemMessage(content=self.system_prompt)] + state["messages"]
-            response = self.llm.invoke(messages)
-
-            # Parse the response
-            msg = str(response.content)
-
+        def parse_response(state: AgentState, msg: str) -> AgentState:
             # Check for incomplete tags and fix them
             if "<execute>" in msg and "</execute>" not in msg:
                 msg += "</execute>"
@@ -1248,56 +1298,89 @@ Each library is listed with its description to help you understand its functiona
                     state["next_step"] = "generate"
             return state
 
-        def execute(state: AgentState) -> AgentState:
+        def generate(state: AgentState) -> AgentState:
+            messages = [SystemMessage(content=self.system_prompt)] + state["messages"]
+            response = self.llm.invoke(messages)
+            return parse_response(state, str(response.content))
+
+        async def agenerate(state: AgentState, config: RunnableConfig) -> AgentState:
+            session = config["configurable"]["session"]
+            messages = [SystemMessage(content=session["system_prompt"])] + state["messages"]
+            response = await self.llm.ainvoke(messages)
+            return parse_response(state, str(response.content))
+
+        def extract_code(state: AgentState) -> str | None:
             last_message = state["messages"][-1].content
             # Only add the closing tag if it's not already there
             if "<execute>" in last_message and "</execute>" not in last_message:
                 last_message += "</execute>"
 
             execute_match = re.search(r"<execute>(.*?)</execute>", last_message, re.DOTALL)
-            if execute_match:
-                code = execute_match.group(1)
-
-                # Set timeout duration (10 minutes = 600 seconds)
-                timeout = self.timeout_seconds
-
-                # Check if the code is R code
-                if (
-                    code.strip().startswith("#!R")
-                    or code.strip().startswith("# R code")
-                    or code.strip().startswith("# R script")
-                ):
-                    # Remove the R marker and run as R code
-                    r_code = re.sub(r"^#!R|^# R code|^# R script", "", code, 1).strip()  # noqa: B034
-                    result = run_with_timeout(run_r_code, [r_code], timeout=timeout)
-                # Check if the code is a Bash script or CLI command
-                elif (
-                    code.strip().startswith("#!BASH")
-                    or code.strip().startswith("# Bash script")
-                    or code.strip().startswith("#!CLI")
-                ):
-                    # Handle both Bash scripts and CLI commands with the same function
-                    if code.strip().startswith("#!CLI"):
-                        # For CLI commands, extract the command and run it as a simple bash script
-                        cli_command = re.sub(r"^#!CLI", "", code, 1).strip()  # noqa: B034
-                        # Remove any newlines to ensure it's a single command
-                        cli_command = cli_command.replace("\n", " ")
-                        result = run_with_timeout(run_bash_script, [cli_command], timeout=timeout)
-                    else:
-                        # For Bash scripts, remove the marker and run as a bash script
-                        bash_script = re.sub(r"^#!BASH|^# Bash script", "", code, 1).strip()  # noqa: B034
-                        result = run_with_timeout(run_bash_script, [bash_script], timeout=timeout)
-                # Otherwise, run as Python code
+            return execute_match.group(1) if execute_match else None
+
+        def run_code(code: str, namespace: dict | None = None) -> str:
+            # Set timeout duration (10 minutes = 600 seconds)
+            timeout = self.timeout_seconds
+
+            if self.lazy_data_lake:
+                # Fetch any data lake file the code mentions before it tries to open it
+                self.data_lake.materialize_referenced(code)
+
+            # Check if the code is R code
+            if (
+                code.strip().startswith("#!R")
+                or code.strip().startswith("# R code")
+                or code.strip().startswith("# R script")
+            ):
+                # Remove the R marker and run as R code
+                r_code = re.sub(r"^#!R|^# R code|^# R script", "", code, 1).strip()  # noqa: B034
+                result = run_with_timeout(run_r_code, [r_code], timeout=timeout)
+            # Check if the code is a Bash script or CLI command
+            elif (
+                code.strip().startswith("#!BASH")
+                or code.strip().startswith("# Bash script")
+                or code.strip().startswith("#!CLI")
+            ):
+                # Handle both Bash scripts and CLI commands with the same function
+                if code.strip().startswith("#!CLI"):
+                    # For CLI commands, extract the command and run it as a simple bash script
+                    cli_command = re.sub(r"^#!CLI", "", code, 1).strip()  # noqa: B034
+                    # Remove any newlines to ensure it's a single command
+                    cli_command = cli_command.replace("\n", " ")
+                    result = run_with_timeout(run_bash_script, [cli_command], timeout=timeout)
                 else:
-                    # Inject custom functions into the Python execution environment
-                    self._inject_custom_functions_to_repl()
-                    result = run_with_timeout(run_python_repl, [code], timeout=timeout)
-
-                if len(result) > 10000:
-                    result = (
-                        "The output is too long to be added to context. Here are the first 10K characters...\n"
-                        + result[:10000]
-                    )
+                    # For Bash scripts, remove the marker and run as a bash script
+                    bash_script = re.sub(r"^#!BASH|^# Bash script", "", code, 1).strip()  # noqa: B034
+                    result = run_with_timeout(run_bash_script, [bash_script], timeout=timeout)
+            # Otherwise, run as Python code
+            else:
+                # Inject custom functions into the Python execution environment
+                self._inject_custom_functions_to_repl(namespace)
+                self._inject_data_lake_to_repl(namespace)
+                result = run_with_timeout(run_python_repl, [code, namespace], timeout=timeout)
+
+            if len(result) > 10000:
+                result = (
+                    "The output is too long to be added to context. Here are the first 10K characters...\n"
+                    + result[:10000]
+                )
+            return result
+
+        def execute(state: AgentState) -> AgentState:
+            code = extract_code(state)
+            if code is not None:
+                result = run_code(code)
+                observation = f"\n<observation>{result}</observation>"
+                state["messages"].append(AIMessage(content=observation.strip()))
+
+            return state
+
+        async def aexecute(state: AgentState, config: RunnableConfig) -> AgentState:
+            code = extract_code(state)
+            if code is not None:
+                session = config["configurable"]["session"]
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._code_executor, run_code, code, session["namespace"])
                 observation = f"\n<observation>{result}</observation>"
                 state["messages"].append(AIMessage(content=observation.strip()))
 
@@ -1327,71 +1410,94 @@ Each library is listed with its description to help you understand its functiona
             else:
                 raise ValueError(f"Unexpected next_step: {next_step}")
 
-        def execute_self_critic(state: AgentState) -> AgentState:
-            if self.critic_count < test_time_scale_round:
-                # Generate feedback based on message history
-                messages = state["messages"]
-                feedback_prompt = f"""
-                Here is a reminder of what is the user requested: {self.user_task}
+        def critic_prompt(user_task: str) -> str:
+            return f"""
+                Here is a reminder of what is the user requested: {user_task}
                 Examine the previous executions, reaosning, and solutions.
                 Critic harshly on what could be improved?
                 Be specific and constructive.
                 Think hard what are missing to solve the task.
                 No question asked, just feedbacks.
                 """
-                feedback = self.llm.invoke(messages + [HumanMessage(content=feedback_prompt)])
 
-                # Add feedback as a new message
-                state["messages"].append(
-                    HumanMessage(
-                        content=f"Wait... this is not enough to solve the task. Here are some feedbacks for improvement:\n{feedback.content}"
-                    )
+        def add_feedback(state: AgentState, feedback) -> AgentState:
+            # Add feedback as a new message
+            state["messages"].append(
+                HumanMessage(
+                    content=f"Wait... this is not enough to solve the task. Here are some feedbacks for improvement:\n{feedback.content}"
                 )
+            )
+            state["next_step"] = "generate"
+            return state
+
+        def execute_self_critic(state: AgentState) -> AgentState:
+            if self.critic_count < test_time_scale_round:
+                # Generate feedback based on message history
+                messages = state["messages"]
+                feedback = self.llm.invoke(messages + [HumanMessage(content=critic_prompt(self.user_task))])
                 self.critic_count += 1
-                state["next_step"] = "generate"
-            else:
-                state["next_step"] = "end"
+                return add_feedback(state, feedback)
 
+            state["next_step"] = "end"
             return state
 
-        # Create the workflow
-        workflow = StateGraph(AgentState)
+        async def aexecute_self_critic(state: AgentState, config: RunnableConfig) -> AgentState:
+            session = config["configurable"]["session"]
+            if session["critic_count"] < test_time_scale_round:
+                messages = state["messages"]
+                feedback = await self.llm.ainvoke(
+                    messages + [HumanMessage(content=critic_prompt(session["user_task"]))]
+                )
+                session["critic_count"] += 1
+                return add_feedback(state, feedback)
 
-        # Add nodes
-        workflow.add_node("generate", generate)
-        workflow.add_node("execute", execute)
+            state["next_step"] = "end"
+            return state
 
-        if self_critic:
-            workflow.add_node("self_critic", execute_self_critic)
-            # Add conditional edges
-            workflow.add_conditional_edges(
-                "generate",
-                routing_function,
-                path_map={
-                    "execute": "execute",
-                    "generate": "generate",
-                    "end": "self_critic",
-                },
-            )
-            workflow.add_conditional_edges(
-                "self_critic",
-                routing_function_self_critic,
-                path_map={"generate": "generate", "end": END},
-            )
-        else:
-            # Add conditional edges
-            workflow.add_conditional_edges(
-                "generate",
-                routing_function,
-                path_map={"execute": "execute", "generate": "generate", "end": END},
-            )
-        workflow.add_edge("execute", "generate")
-        workflow.add_edge(START, "generate")
+        def build_workflow(generate_node, execute_node, self_critic_node):
+            # Create the workflow
+            workflow = StateGraph(AgentState)
+
+            # Add nodes
+            workflow.add_node("generate", generate_node)
+            workflow.add_node("execute", execute_node)
+
+            if self_critic:
+                workflow.add_node("self_critic", self_critic_node)
+                # Add conditional edges
+                workflow.add_conditional_edges(
+                    "generate",
+                    routing_function,
+                    path_map={
+                        "execute": "execute",
+                        "generate": "generate",
+                        "end": "self_critic",
+                    },
+                )
+                workflow.add_conditional_edges(
+                    "self_critic",
+                    routing_function_self_critic,
+                    path_map={"generate": "generate", "end": END},
+                )
+            else:
+                # Add conditional edges
+                workflow.add_conditional_edges(
+                    "generate",
+                    routing_function,
+                    path_map={"execute": "execute", "generate": "generate", "end": END},
+                )
+            workflow.add_edge("execute", "generate")
+            workflow.add_edge(START, "generate")
+
+            return workflow.compile()
 
         # Compile the workflow
-        self.app = workflow.compile()
+        self.app = build_workflow(generate, execute, execute_self_critic)
         self.checkpointer = MemorySaver()
         self.app.checkpointer = self.checkpointer
+        # The async graph carries per-session state in its config and keeps no checkpointer,
+        # so concurrent sessions don't accumulate checkpoints in memory
+        self.async_app = build_workflow(agenerate, aexecute, aexecute_self_critic)
         # display(Image(self.app.get_graph().draw_mermaid_png()))
 
     def go(self, prompt):
@@ -1405,69 +1511,14 @@ Each library is listed with its description to help you understand its functiona
         self.user_task = prompt
 
         if self.use_tool_retriever:
-            # Gather all available resources
-            # 1. Tools from the registry
-            all_tools = self.tool_registry.tools if hasattr(self, "tool_registry") else []
-
-            # 2. Data lake items with descriptions
-            data_lake_path = self.path + "/data_lake"
-            data_lake_content = glob.glob(data_lake_path + "/*")
-            data_lake_items = [x.split("/")[-1] for x in data_lake_content]
-
-            # Create data lake descriptions for retrieval
-            data_lake_descriptions = []
-            for item in data_lake_items:
-                description = self.data_lake_dict.get(item, f"Data lake item: {item}")
-                data_lake_descriptions.append({"name": item, "description": description})
-
-            # Add custom data items to retrieval if they exist
-            if hasattr(self, "_custom_data") and self._custom_data:
-                for name, info in self._custom_data.items():
-                    data_lake_descriptions.append({"name": name, "description": info["description"]})
-
-            # 3. Libraries with descriptions - use library_content_dict directly
-            library_descriptions = []
-            for lib_name, lib_desc in self.library_content_dict.items():
-                library_descriptions.append({"name": lib_name, "description": lib_desc})
-
-            # Add custom software items to retrieval if they exist
-            if hasattr(self, "_custom_software") and self._custom_software:
-                for name, info in self._custom_software.items():
-                    # Check if it's not already in the library descriptions to avoid duplicates
-                    if not any(lib["name"] == name for lib in library_descriptions):
-                        library_descriptions.append({"name": name, "description": info["description"]})
-
-            # Use retrieval to get relevant resources
-            resources = {
-                "tools": all_tools,
-                "data_lake": data_lake_descriptions,
-                "libraries": library_descriptions,
-            }
+            resources = self._retrieval_resources_cached()
 
             # Use prompt-based retrieval with the agent's LLM
             selected_resources = self.retriever.prompt_based_retrieval(prompt, resources, llm=self.llm)
             print("Using prompt-based retrieval with the agent's LLM")
 
-            # Extract the names from the selected resources for the system prompt
-            selected_resources_names = {
-                "tools": selected_resources["tools"],
-                "data_lake": [],
-                "libraries": [lib["name"] if isinstance(lib, dict) else lib for lib in selected_resources["libraries"]],
-            }
-
-            # Process data lake items to extract just the names
-            for item in selected_resources["data_lake"]:
-                if isinstance(item, dict):
-                    selected_resources_names["data_lake"].append(item["name"])
-                elif isinstance(item, str) and ": " in item:
-                    # If the item already has a description, extract just the name
-                    name = item.split(": ")[0]
-                    selected_resources_names["data_lake"].append(name)
-                else:
-                    selected_resources_names["data_lake"].append(item)
-
             # Update the system prompt with the selected resources
-            self.update_system_prompt_with_selected_resources(selected_resources_names)
+            self.update_system_prompt_with_selected_resources(self._selected_resource_names(selected_resources))
 
         inputs = {"messages": [HumanMessage(content=prompt)], "next_step": None}
         config = {"recursion_limit": 500, "configurable": {"thread_id": 42}}
@@ -1480,8 +1531,184 @@ Each library is listed with its description to help you understand its functiona
 
         return self.log, message.content
 
+    async def ago(self, prompt):
+        """Async variant of `go` for serving many concurrent sessions from one agent.
+
+        LLM calls use `ainvoke` and the graph is driven with `astream`, so a session waiting on the
+        model does not hold a thread. Code blocks run on the agent's code executor. Each call keeps its
+        own system prompt, critic state and Python namespace, and does not touch `self.log`.
+
+        Args:
+            prompt: The user's query
+
+        Returns:
+            A tuple of (log, final message content)
+
+        """
+        session = {
+            "user_task": prompt,
+            "critic_count": 0,
+            "system_prompt": self.system_prompt,
+            "namespace": {},
+        }
+
+        if self.use_tool_retriever:
+            resources = self._retrieval_resources_cached()
+            selected_resources = await self.retriever.aprompt_based_retrieval(prompt, resources, llm=self.llm)
+            session["system_prompt"] = self._build_selected_resources_prompt(
+                self._selected_resource_names(selected_resources)
+            )
+
+        inputs = {"messages": [HumanMessage(content=prompt)], "next_step": None}
+        config = {"recursion_limit": 500, "configurable": {"thread_id": str(uuid.uuid4()), "session": session}}
+        log = []
+
+        async for s in self.async_app.astream(inputs, stream_mode="values", config=config):
+            message = s["messages"][-1]
+            out = pretty_print(message)
+            log.append(out)
+
+        return log, message.content
+
+    def _data_lake_items(self):
+        """Names of the data lake files to offer the agent.
+
+        In lazy mode this is the whole catalogue, since most files are not on disk yet.
+        """
+        if self.lazy_data_lake:
+            local_names = self.data_lake.local_names()
+            return self.data_lake.names() + [name for name in local_names if name not in self.data_lake]
+        data_lake_path = self.path + "/data_lake"
+        data_lake_content = glob.glob(data_lake_path + "/*")
+        return [x.split("/")[-1] for x in data_lake_content if not x.endswith(".part")]
+
+    def warm_up(self, data_lake_files=None, shared_tables=None, import_tools=True):
+        """Build the shared read-only state up front instead of on the first request.
+
+        Meant for a pre-fork server: the master calls this once, then forks workers that share the
+        warmed pages copy-on-write. The tool registry and system prompt are already built by
+        ``__init__``; this adds the tool modules, the retrieval resources, the parsed HPO ontology, the
+        gene identifier index and any data lake files a deployment always needs.
+
+        Args:
+            data_lake_files: Data lake file names to materialize (and, where cached, parse) now
+            shared_tables: Data lake file names to decode into the host-wide shared table cache, which
+                workers on this host then attach to zero-copy
+            import_tools: Import every tool module so workers do not each import them
+
+        Returns:
+            dict: Summary of what was warmed, also suitable for a readiness endpoint
+
+        """
+        import importlib
+        import time
+
+        from biomni.utils import load_hpo_obo
+
+        start = time.perf_counter()
+        summary = {"tool_modules": [], "failed_tool_modules": [], "data_lake_files": {}, "shared_tables": {}}
+
+        if import_tools:
+            for module_name in self.module2api:
+                try:
+                    importlib.import_module(module_name)
+                    summary["tool_modules"].append(module_name)
+                except Exception as e:
+                    print(f"✗ Could not import {module_name}: {e}")
+                    summary["failed_tool_modules"].append(module_name)
+
+        if data_lake_files:
+            summary["data_lake_files"] = self.data_lake.prefetch(list(data_lake_files))
+
+        for name in shared_tables or []:
+            try:
+                summary["shared_tables"][name] = self.shared_tables.get(name).num_rows
+            except Exception as e:
+                print(f"✗ Could not cache {name}: {e}")
+                summary["shared_tables"][name] = None
+
+        hpo_path = self.data_lake.local_path("hp.obo")
+        if os.path.exists(hpo_path):
+            summary["hpo_terms"] = len(load_hpo_obo(hpo_path))
+        if self.data_lake.is_local("gene_info.parquet"):
+            summary["genes"] = len(load_gene_normalizer(self.data_lake.data_lake_dir))
+
+        summary["retrieval_resources"] = {key: len(value) for key, value in self._retrieval_resources_cached().items()}
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        print(f"✓ Agent warmed up in {summary['seconds']}s")
+        return summary
+
+    def _retrieval_resources_cached(self):
+        """Return the retrieval resources, gathered once and reused until tools, data or software change."""
+        if self._retrieval_resources is None:
+            self._retrieval_resources = self._gather_retrieval_resources()
+        return self._retrieval_resources
+
+    def _gather_retrieval_resources(self):
+        """Collect the tools, data lake items and libraries the retriever chooses from."""
+        # Gather all available resources
+        # 1. Tools from the registry
+        all_tools = self.tool_registry.tools if hasattr(self, "tool_registry") else []
+
+        # 2. Data lake items with descriptions
+        data_lake_items = self._data_lake_items()
+
+        # Create data lake descriptions for retrieval
+        data_lake_descriptions = []
+        for item in data_lake_items:
+            description = self.data_lake_dict.get(item, f"Data lake item: {item}")
+            data_lake_descriptions.append({"name": item, "description": description})
+
+        # Add custom data items to retrieval if they exist
+        if hasattr(self, "_custom_data") and self._custom_data:
+            for name, info in self._custom_data.items():
+                data_lake_descriptions.append({"name": name, "description": info["description"]})
+
+        # 3. Libraries with descriptions - use library_content_dict directly
+        library_descriptions = []
+        for lib_name, lib_desc in self.library_content_dict.items():
+            library_descriptions.append({"name": lib_name, "description": lib_desc})
+
+        # Add custom software items to retrieval if they exist
+        if hasattr(self, "_custom_software") and self._custom_software:
+            for name, info in self._custom_software.items():
+                # Check if it's not already in the library descriptions to avoid duplicates
+                if not any(lib["name"] == name for lib in library_descriptions):
+                    library_descriptions.append({"name": name, "description": info["description"]})
+
+        return {
+            "tools": all_tools,
+            "data_lake": data_lake_descriptions,
+            "libraries": library_descriptions,
+        }
+
+    def _selected_resource_names(self, selected_resources):
+        """Extract the names from the selected resources for the system prompt."""
+        selected_resources_names = {
+            "tools": selected_resources["tools"],
+            "data_lake": [],
+            "libraries": [lib["name"] if isinstance(lib, dict) else lib for lib in selected_resources["libraries"]],
+        }
+
+        # Process data lake items to extract just the names
+        for item in selected_resources["data_lake"]:
+            if isinstance(item, dict):
+                selected_resources_names["data_lake"].append(item["name"])
+            elif isinstance(item, str) and ": " in item:
+                # If the item already has a description, extract just the name
+                name = item.split(": ")[0]
+                selected_resources_names["data_lake"].append(name)
+            else:
+                selected_resources_names["data_lake"].append(item)
+
+        return selected_resources_names
+
     def update_system_prompt_with_selected_resources(self, selected_resources):
         """Update the system prompt with the selected resources."""
+        self.system_prompt = self._build_selected_resources_prompt(selected_resources)
+
+    def _build_selected_resources_prompt(self, selected_resources):
+        """Build the retrieval system prompt for the selected resources without storing it."""
         # Extract tool descriptions for the selected tools
         tool_desc = {}
         for tool in selected_resources["tools"]:
@@ -1573,7 +1800,7 @@ Each library is listed with its description to help you understand its functiona
             for name, info in self._custom_software.items():
                 custom_software.append({"name": name, "description": info["description"]})
 
-        self.system_prompt = self._generate_system_prompt(
+        return self._generate_system_prompt(
             tool_desc=tool_desc,
             data_lake_content=data_lake_with_desc,
             library_content_list=selected_resources["libraries"],
@@ -1584,11 +1811,6 @@ Each library is listed with its description to help you understand its functiona
             custom_software=custom_software if custom_software else None,
         )
 
-        # Print the raw system prompt for debugging
-        # print("\n" + "="*20 + " RAW SYSTEM PROMPT FROM AGENT " + "="*20)
-        # print(self.system_prompt)
-        # print("="*70 + "\n")
-
     def result_formatting(self, output_class, task_intention):
         self.format_check_prompt = ChatPromptTemplate.from_messages(
             [
@@ -1609,17 +1831,24 @@ Each library is listed with its description to help you understand its functiona
         result = checker_llm.invoke({"messages": [("user", str(self.log))]}).dict()
         return result
 
-    def _inject_custom_functions_to_repl(self):
+    def _inject_custom_functions_to_repl(self, namespace=None):
         """Inject custom functions into the Python REPL execution environment.
         This makes custom tools available during code execution.
+
+        Args:
+            namespace: Namespace to inject into; defaults to the persistent namespace used by run_python_repl
+
         """
         if hasattr(self, "_custom_functions") and self._custom_functions:
-            # Access the persistent namespace used by run_python_repl
-            from biomni.tool.support_tools import _persistent_namespace
+            if namespace is None:
+                # Access the persistent namespace used by run_python_repl
+                from biomni.tool.support_tools import _persistent_namespace
+
+                namespace = _persistent_namespace
 
             # Inject all custom functions into the execution namespace
             for name, func in self._custom_functions.items():
-                _persistent_namespace[name] = func
+                namespace[name] = func
 
             # Also make them available in builtins for broader access
             import builtins
@@ -1628,6 +1857,29 @@ Each library is listed with its description to help you understand its functiona
                 builtins._biomni_custom_functions = {}
             builtins._biomni_custom_functions.update(self._custom_functions)
 
+    def _inject_data_lake_to_repl(self, namespace=None):
+        """Expose the data lake to the Python REPL.
+
+        Injects `data_lake`, `query_data_lake`, `load_data_lake`, `knowledge_graph`, `gene_profile` and
+        `normalize_genes`.
+
+        Args:
+            namespace: Namespace to inject into; defaults to the persistent namespace used by run_python_repl
+
+        """
+        if namespace is None:
+            from biomni.tool.support_tools import _persistent_namespace
+
+            namespace = _persistent_namespace
+        namespace["data_lake"] = self.data_lake
+        namespace["query_data_lake"] = self.data_lake_query.sql
+        namespace["knowledge_graph"] = self.knowledge_graph
+        namespace["gene_profile"] = self.gene_index.gene_profile
+        namespace["normalize_genes"] = functools.partial(normalize_genes, data_lake_path=self.data_lake.data_lake_dir)
+        # One loader per namespace, so each session keeps its own frame cache across steps
+        if not isinstance(namespace.get("load_data_lake"), DataLakeLoader):
+            namespace["load_data_lake"] = DataLakeLoader(self.data_lake, shared_tables=self.shared_tables)
+
     def create_mcp_server(self, tool_modules=None):
         """
         Create an MCP server object that exposes internal Biomni tools.
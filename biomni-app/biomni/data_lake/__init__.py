@@ -0,0 +1,40 @@
+from biomni.data_lake.catalog import DataLakeCatalog, data_lake_file
+from biomni.data_lake.convert import convert_data_lake
+from biomni.data_lake.ddinter import DDInterStore, build_ddinter_store
+from biomni.data_lake.download import DownloadManager, build_manifest
+from biomni.data_lake.drug_names import DrugNameResolver, load_drug_name_resolver
+from biomni.data_lake.gene_ids import GeneNormalizer, load_gene_normalizer, normalize_genes
+from biomni.data_lake.gene_index import GeneIndex, build_gene_index
+from biomni.data_lake.jaspar import JasparMotifs, jaspar_matrix, load_jaspar_motifs
+from biomni.data_lake.knowledge_graph import KnowledgeGraph, build_knowledge_graph
+from biomni.data_lake.loader import DataLakeLoader
+from biomni.data_lake.query import DataLakeQuery
+from biomni.data_lake.shared_cache import SharedTableCache
+from biomni.data_lake.txgnn import TxGNNPredictions, build_txgnn_store
+
+__all__ = [
+    "DataLakeCatalog",
+    "DataLakeLoader",
+    "DataLakeQuery",
+    "DDInterStore",
+    "DownloadManager",
+    "DrugNameResolver",
+    "GeneIndex",
+    "GeneNormalizer",
+    "JasparMotifs",
+    "KnowledgeGraph",
+    "SharedTableCache",
+    "TxGNNPredictions",
+    "build_ddinter_store",
+    "build_gene_index",
+    "build_knowledge_graph",
+    "build_manifest",
+    "build_txgnn_store",
+    "convert_data_lake",
+    "data_lake_file",
+    "jaspar_matrix",
+    "load_drug_name_resolver",
+    "load_gene_normalizer",
+    "load_jaspar_motifs",
+    "normalize_genes",
+]
@@ -0,0 +1,189 @@
+"""Lazy data lake: a catalogue of file descriptors that are downloaded on first access.
+
+With ``A1(lazy_data_lake=True)`` nothing is downloaded at start-up. A file is fetched the first time
+tool code asks for it through `data_lake_file`, REPL code calls ``data_lake.path(name)``, or agent
+code mentions its name. Downloads are single-flight: concurrent requests for the same file, from
+threads or from other processes sharing the data directory, wait for one transfer instead of
+starting their own.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+from biomni.data_lake.download import PART_SUFFIX, S3_BUCKET_URL, DownloadManager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+LOCK_DIR = ".locks"
+
+_thread_locks: dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+@contextmanager
+def single_flight(directory: str, name: str):
+    """Hold an exclusive lock for one file across threads and processes."""
+    key = os.path.join(os.path.abspath(directory), name)
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(key, threading.Lock())
+
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        lock_dir = os.path.join(directory, LOCK_DIR)
+        os.makedirs(lock_dir, exist_ok=True)
+        with open(os.path.join(lock_dir, name + ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class DataLakeCatalog:
+    """Descriptors of the data lake files, materialized on demand."""
+
+    def __init__(
+        self,
+        data_lake_dir: str,
+        descriptions: dict[str, str] | None = None,
+        base_url: str = S3_BUCKET_URL,
+        folder: str = "data_lake",
+    ):
+        """Initialize the catalogue.
+
+        Args:
+            data_lake_dir: Local directory the files are materialized into
+            descriptions: File name to description mapping; defaults to `env_desc.data_lake_dict`
+            base_url: Base URL of the bucket to fetch from
+            folder: Bucket folder holding the files
+
+        """
+        if descriptions is None:
+            from biomni.env_desc import data_lake_dict
+
+            descriptions = data_lake_dict
+
+        self.data_lake_dir = data_lake_dir
+        self.descriptions = descriptions
+        self.folder = folder
+        self._manager = DownloadManager(base_url=base_url, workers=1)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.descriptions
+
+    def names(self) -> list[str]:
+        """List every file in the catalogue, local or not."""
+        return list(self.descriptions)
+
+    def describe(self, name: str) -> str:
+        return self.descriptions.get(name, f"Data lake item: {name}")
+
+    def local_path(self, name: str) -> str:
+        return os.path.join(self.data_lake_dir, name)
+
+    def optimized_path(self, name: str) -> str | None:
+        """Return the up-to-date sorted Parquet copy of a file, if `biomni.data_lake.convert` made one."""
+        from biomni.data_lake.convert import optimized_copy
+
+        return optimized_copy(self.data_lake_dir, name)
+
+    def is_local(self, name: str) -> bool:
+        return os.path.exists(self.local_path(name))
+
+    def local_names(self) -> list[str]:
+        """List the files already materialized, ignoring partial downloads and bookkeeping files."""
+        if not os.path.isdir(self.data_lake_dir):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.data_lake_dir)
+            if not name.startswith(".") and not name.endswith(PART_SUFFIX)
+        )
+
+    def path(self, name: str) -> str:
+        """Return the local path of a data lake file, downloading it first if needed.
+
+        Args:
+            name: File name as listed in the catalogue
+
+        Returns:
+            Local path of the file
+
+        Raises:
+            KeyError: If the file is neither local nor in the catalogue
+            RuntimeError: If the download fails
+
+        """
+        file_path = self.local_path(name)
+        if os.path.exists(file_path):
+            return file_path
+        if name not in self.descriptions:
+            raise KeyError(f"'{name}' is not in the data lake catalogue")
+
+        os.makedirs(self.data_lake_dir, exist_ok=True)
+        with single_flight(self.data_lake_dir, name):
+            # Another thread or process may have finished the download while we waited
+            if not os.path.exists(file_path):
+                print(f"Fetching data lake file on first access: {name}")
+                results = self._manager.download_files(self.folder, self.data_lake_dir, [name])
+                if not results.get(name):
+                    raise RuntimeError(f"Failed to download data lake file '{name}'")
+        return file_path
+
+    def prefetch(self, names: list[str]) -> dict[str, bool]:
+        """Materialize several files, e.g. the few tables a deployment always needs."""
+        results = {}
+        for name in names:
+            try:
+                self.path(name)
+                results[name] = True
+            except (KeyError, RuntimeError) as e:
+                print(f"✗ {e}")
+                results[name] = False
+        return results
+
+    def materialize_referenced(self, text: str) -> list[str]:
+        """Fetch every catalogue file whose name appears in a piece of code.
+
+        Returns:
+            Names of the files that were fetched
+
+        """
+        fetched = []
+        for name in self.descriptions:
+            if name in text and not self.is_local(name):
+                try:
+                    self.path(name)
+                    fetched.append(name)
+                except (KeyError, RuntimeError) as e:
+                    print(f"✗ {e}")
+        return fetched
+
+
+def data_lake_file(data_lake_path: str, name: str) -> str:
+    """Return the local path of a data lake file for tool code, fetching it on first access.
+
+    Files that already exist are returned as-is, so this is free when the data lake was downloaded
+    eagerly. Files outside the catalogue are returned unchanged and fail at open time as before.
+
+    Args:
+        data_lake_path: Path to the data lake directory
+        name: File name inside the data lake
+
+    Returns:
+        Local path of the file
+
+    """
+    file_path = os.path.join(data_lake_path, name)
+    if os.path.exists(file_path):
+        return file_path
+    catalog = DataLakeCatalog(data_lake_path)
+    if name not in catalog:
+        return file_path
+    return catalog.path(name)
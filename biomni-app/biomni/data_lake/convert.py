@@ -0,0 +1,252 @@
+"""Offline conversion of row-oriented data lake files into sorted Parquet.
+
+The largest data lake files are gzipped TSVs, CSVs and pickles, so every lookup parses the whole file.
+This pipeline writes a Parquet copy of each one into ``<data_lake>/.optimized/``. Rows are sorted by
+gene (or by chromosome and position when there is no gene column), and each row group records min/max
+statistics, so a filter on the sort key only reads the row groups that can match. Text files are
+streamed through DuckDB, which sorts out of core; pickles have to be unpickled whole.
+
+The originals are kept. `DataLakeCatalog.optimized_path` returns a copy only while it is newer than
+its source, and `DataLakeQuery` reads the copy instead of the original.
+
+    python -m biomni.data_lake.convert --path ./data/biomni_data/data_lake
+"""
+
+import argparse
+import fnmatch
+import os
+import time
+
+from biomni.data_lake.download import load_manifest, update_manifest
+from biomni.data_lake.query import quote_literal, scan_expression, tabular_format
+
+OPTIMIZED_DIR = ".optimized"
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
+# Large row-oriented files that are usually filtered by gene or locus
+CONVERT_PATTERNS = [
+    "Cosmic_*.tsv.gz",
+    "BindingDB_All_*.tsv",
+    "DepMap_*.csv",
+    "proteinatlas.tsv",
+    "gwas_catalog.pkl",
+    "genebass_*.pkl",
+    "kg.csv",
+    "sgRNA_KO_SP_*.txt",
+]
+
+# Sort keys for files where the column-name heuristic would pick the wrong column
+SORT_KEYS = {
+    "kg.csv": ["x_type", "x_name"],
+    # Guides of one gene form a contiguous, best-first run
+    "sgRNA_KO_SP_human.txt": ["Target Gene Symbol", "Combined Rank"],
+    "sgRNA_KO_SP_mouse.txt": ["Target Gene Symbol", "Combined Rank"],
+}
+
+GENE_COLUMNS = ["gene_symbol", "hugo_symbol", "gene_name", "gene", "symbol", "genesymbol", "mapped_gene"]
+CHROMOSOME_COLUMNS = ["chromosome", "chrom", "chr", "chr_id", "chromosome_name"]
+POSITION_COLUMNS = ["position", "pos", "start", "genome_start", "chr_pos", "start_position"]
+
+
+def optimized_dir(data_lake_dir: str) -> str:
+    return os.path.join(data_lake_dir, OPTIMIZED_DIR)
+
+
+def optimized_copy(data_lake_dir: str, name: str) -> str | None:
+    """Return the Parquet copy of a data lake file if it is up to date with its source.
+
+    Args:
+        data_lake_dir: Data lake directory
+        name: Data lake file name
+
+    Returns:
+        Path of the Parquet copy, or None if there is none or the source changed since conversion
+
+    """
+    source = os.path.join(data_lake_dir, name)
+    entry = load_manifest(optimized_dir(data_lake_dir)).get(name)
+    if entry is None or not os.path.exists(source):
+        return None
+    stat = os.stat(source)
+    if entry["source_size"] != stat.st_size or entry["source_mtime"] != stat.st_mtime:
+        return None
+    path = os.path.join(optimized_dir(data_lake_dir), entry["parquet"])
+    return path if os.path.exists(path) else None
+
+
+def detect_sort_keys(name: str, columns: list[str]) -> list[str]:
+    """Pick the columns to sort a file by: gene, else chromosome and position, else the first column."""
+    if name in SORT_KEYS:
+        return [column for column in SORT_KEYS[name] if column in columns] or columns[:1]
+
+    normalized = {column.strip().lower().replace(" ", "_"): column for column in columns}
+    for candidate in GENE_COLUMNS:
+        if candidate in normalized:
+            return [normalized[candidate]]
+    for candidate in CHROMOSOME_COLUMNS:
+        if candidate in normalized:
+            keys = [normalized[candidate]]
+            position = next((normalized[p] for p in POSITION_COLUMNS if p in normalized), None)
+            return keys + [position] if position else keys
+    return columns[:1]
+
+
+def _convert_text(con, source: str, name: str, target: str, row_group_size: int) -> tuple[list[str], int]:
+    scan = scan_expression(source, name)
+    columns = [row[0] for row in con.execute(f"DESCRIBE SELECT * FROM {scan}").fetchall()]
+    sort_by = detect_sort_keys(name, columns)
+    order = ", ".join(f'"{column}"' for column in sort_by)
+    con.execute(
+        f"COPY (SELECT * FROM {scan} ORDER BY {order}) TO {quote_literal(target)} "
+        f"(FORMAT parquet, COMPRESSION zstd, ROW_GROUP_SIZE {row_group_size})"
+    )
+    rows = con.execute(f"SELECT count(*) FROM read_parquet({quote_literal(target)})").fetchone()[0]
+    return sort_by, rows
+
+
+def _convert_pickle(source: str, name: str, target: str, row_group_size: int) -> tuple[list[str], int]:
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = pd.read_pickle(source)
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError(f"{name} holds a {type(df).__name__}, not a DataFrame")
+    sort_by = detect_sort_keys(name, [str(column) for column in df.columns])
+    df = df.sort_values(sort_by, kind="stable").reset_index(drop=True)
+    pq.write_table(
+        pa.Table.from_pandas(df, preserve_index=False),
+        target,
+        row_group_size=row_group_size,
+        compression="zstd",
+        write_statistics=True,
+    )
+    return sort_by, len(df)
+
+
+def convert_file(
+    data_lake_dir: str, name: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE, force: bool = False, con=None
+) -> dict | None:
+    """Write the sorted Parquet copy of one data lake file.
+
+    Args:
+        data_lake_dir: Data lake directory
+        name: Data lake file name
+        row_group_size: Rows per Parquet row group
+        force: Convert even if an up-to-date copy exists
+        con: DuckDB connection to reuse for text files
+
+    Returns:
+        The manifest entry of the copy, or None if the source is missing
+
+    """
+    source = os.path.join(data_lake_dir, name)
+    if not os.path.exists(source):
+        print(f"✗ {name}: not in the local data lake")
+        return None
+    if not force and optimized_copy(data_lake_dir, name):
+        print(f"✓ {name}: already converted")
+        return load_manifest(optimized_dir(data_lake_dir))[name]
+
+    out_dir = optimized_dir(data_lake_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    parquet_name = name + ".parquet"
+    target = os.path.join(out_dir, parquet_name)
+    tmp_target = target + ".tmp"
+    stat = os.stat(source)
+
+    start = time.perf_counter()
+    if tabular_format(name) == "pickle":
+        sort_by, rows = _convert_pickle(source, name, tmp_target, row_group_size)
+    else:
+        if con is None:
+            con = _connect(out_dir)
+        sort_by, rows = _convert_text(con, source, name, tmp_target, row_group_size)
+    os.replace(tmp_target, target)
+
+    entry = {
+        "parquet": parquet_name,
+        "source_size": stat.st_size,
+        "source_mtime": stat.st_mtime,
+        "size": os.path.getsize(target),
+        "rows": rows,
+        "sort_by": sort_by,
+        "row_group_size": row_group_size,
+    }
+    update_manifest(out_dir, {name: entry})
+    print(
+        f"✓ {name}: {rows} rows sorted by {', '.join(sort_by)}, "
+        f"{stat.st_size / 1e6:.1f} MB -> {entry['size'] / 1e6:.1f} MB in {time.perf_counter() - start:.1f}s"
+    )
+    return entry
+
+
+def _connect(out_dir: str):
+    import duckdb
+
+    config = {"temp_directory": os.path.join(out_dir, ".spill")}
+    memory_limit = os.getenv("BIOMNI_DUCKDB_MEMORY_LIMIT")
+    if memory_limit:
+        config["memory_limit"] = memory_limit
+    return duckdb.connect(database=":memory:", config=config)
+
+
+def convertible_files(data_lake_dir: str, patterns: list[str] | None = None) -> list[str]:
+    """List the local data lake files matching the conversion patterns."""
+    patterns = patterns or CONVERT_PATTERNS
+    if not os.path.isdir(data_lake_dir):
+        return []
+    return sorted(
+        name
+        for name in os.listdir(data_lake_dir)
+        if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+        and os.path.isfile(os.path.join(data_lake_dir, name))
+    )
+
+
+def convert_data_lake(
+    data_lake_dir: str,
+    names: list[str] | None = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    force: bool = False,
+) -> dict[str, bool]:
+    """Convert data lake files to sorted Parquet.
+
+    Args:
+        data_lake_dir: Data lake directory
+        names: Files to convert; defaults to the local files matching CONVERT_PATTERNS
+        row_group_size: Rows per Parquet row group
+        force: Reconvert files whose copy is up to date
+
+    Returns:
+        Dictionary mapping file names to whether conversion succeeded
+
+    """
+    names = names or convertible_files(data_lake_dir)
+    con = None
+    results = {}
+    for name in names:
+        try:
+            if con is None and tabular_format(name) != "pickle":
+                con = _connect(optimized_dir(data_lake_dir))
+            results[name] = convert_file(data_lake_dir, name, row_group_size, force, con) is not None
+        except Exception as e:
+            print(f"✗ {name}: {e}")
+            results[name] = False
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert data lake text and pickle files into sorted Parquet")
+    parser.add_argument("--path", default="./data/biomni_data/data_lake", help="Data lake directory")
+    parser.add_argument("names", nargs="*", help="Files to convert (default: the large row-oriented files)")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    parser.add_argument("--force", action="store_true", help="Reconvert up-to-date copies")
+    args = parser.parse_args(argv)
+
+    results = convert_data_lake(args.path, args.names or None, args.row_group_size, args.force)
+    print(f"Converted {sum(results.values())}/{len(results)} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""Compiled store for the DDInter 2.0 drug-drug interaction tables.
+
+The eight ``ddinter_*.csv`` files are compiled once into ``<data_lake>/.ddinter/``:
+
+- ``drugs.parquet``: the integer drug table (DDInter id, name, standardized name, category bitmask and
+  number of distinct interaction partners)
+- ``indptr.npy`` / ``indices.npy``: symmetric CSR interaction matrix over drug numbers, with each drug's
+  partners sorted
+- ``levels.npy`` / ``categories.npy``: severity and DDInter category code of every stored interaction
+- ``meta.json``: level and category names and the size and mtime of each source file
+
+The arrays are memory-mapped and the store is opened once per process, so a query pays neither a CSV
+parse nor an unpickle.
+
+    python -m biomni.data_lake.ddinter --path ./data/biomni_data/data_lake
+"""
+
+import argparse
+import functools
+import json
+import os
+import time
+
+import numpy as np
+
+DDINTER_DIR = ".ddinter"
+DDINTER_CATEGORIES = [
+    "alimentary_tract_metabolism",
+    "antineoplastic",
+    "antiparasitic",
+    "blood_organs",
+    "dermatological",
+    "hormonal",
+    "respiratory",
+    "various",
+]
+DDINTER_FILES = [f"ddinter_{category}.csv" for category in DDINTER_CATEGORIES]
+# Severity codes in increasing order, so "at least Moderate" is a comparison
+LEVELS = ["Unknown", "Minor", "Moderate", "Major"]
+
+# Salt forms dropped when standardizing names, as in DDInter's own name matching
+_SALT_SUFFIXES = r" (?:hydrochloride|sulfate|sodium|potassium|calcium|magnesium)"
+
+
+def standardize_drug_names(names):
+    """Lower-case drug names and drop common salt forms, e.g. "Metformin Hydrochloride" -> "metformin"."""
+    import pandas as pd
+
+    names = pd.Series(names, dtype=object)
+    standardized = names.astype(str).str.strip().str.lower().str.replace(_SALT_SUFFIXES, "", regex=True)
+    return standardized.where(names.notna(), "")
+
+
+def _source_stat(path: str) -> dict:
+    stat = os.stat(path)
+    return {"source_size": stat.st_size, "source_mtime": stat.st_mtime}
+
+
+def build_ddinter_store(data_lake_dir: str, out_dir: str) -> dict:
+    """Compile the DDInter CSV files into the memory-mapped interaction store.
+
+    Args:
+        data_lake_dir: Data lake directory holding the ddinter_*.csv files
+        out_dir: Directory to write the store into
+
+    Returns:
+        The store's metadata
+
+    Raises:
+        FileNotFoundError: If none of the DDInter files is present
+
+    """
+    import pandas as pd
+
+    start = time.perf_counter()
+    frames = []
+    sources = {}
+    for code, name in enumerate(DDINTER_FILES):
+        path = os.path.join(data_lake_dir, name)
+        if not os.path.exists(path):
+            continue
+        df = pd.read_csv(path, usecols=["DDInterID_A", "Drug_A", "DDInterID_B", "Drug_B", "Level"], dtype=str)
+        df["category"] = code
+        frames.append(df)
+        sources[name] = _source_stat(path)
+    if not frames:
+        raise FileNotFoundError("No DDInter CSV files found in data lake")
+    df = pd.concat(frames, ignore_index=True)
+
+    # Number drugs in the order they first appear, reading each row as (A, B)
+    ids = np.column_stack([df["DDInterID_A"].to_numpy(dtype=object), df["DDInterID_B"].to_numpy(dtype=object)])
+    names = np.column_stack([df["Drug_A"].to_numpy(dtype=object), df["Drug_B"].to_numpy(dtype=object)])
+    codes, uniques = pd.factorize(ids.ravel())
+    a, b = codes[0::2].astype(np.int64), codes[1::2].astype(np.int64)
+    first = np.unique(codes, return_index=True)[1]
+
+    level_names = LEVELS + sorted(set(df["Level"].dropna()) - set(LEVELS))
+    level = pd.Categorical(df["Level"].fillna("Unknown"), categories=level_names).codes.astype(np.int8)
+    category = df["category"].to_numpy(np.int8)
+
+    category_mask = np.zeros(len(uniques), dtype=np.int64)
+    np.bitwise_or.at(category_mask, a, np.left_shift(1, category.astype(np.int64)))
+    np.bitwise_or.at(category_mask, b, np.left_shift(1, category.astype(np.int64)))
+
+    # Both directions, sorted by (drug, partner, category) so a pair is one contiguous run
+    src, dst = np.concatenate([a, b]), np.concatenate([b, a])
+    level, category = np.concatenate([level, level]), np.concatenate([category, category])
+    order = np.lexsort((category, dst, src))
+    src, dst, level, category = src[order], dst[order], level[order], category[order]
+    indptr = np.zeros(len(uniques) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=len(uniques)), out=indptr[1:])
+    new_partner = np.ones(len(src), dtype=bool)
+    new_partner[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+
+    drug_names = names.ravel()[first]
+    drugs = pd.DataFrame(
+        {
+            "drug": np.arange(len(uniques)),
+            "ddinter_id": np.asarray(uniques, dtype=object),
+            "name": drug_names,
+            "standardized_name": standardize_drug_names(drug_names).to_numpy(dtype=object),
+            "category_mask": category_mask,
+            "partners": np.bincount(src[new_partner], minlength=len(uniques)),
+        }
+    )
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    def replace(name, write, mode="wb"):
+        # Write beside and rename, so processes that have the old arrays mapped keep a valid file
+        tmp_path = os.path.join(out_dir, f".{name}.{os.getpid()}.tmp")
+        with open(tmp_path, mode) as f:
+            write(f)
+        os.replace(tmp_path, os.path.join(out_dir, name))
+
+    replace("drugs.parquet", lambda f: drugs.to_parquet(f, index=False))
+    for name, array in (
+        ("indptr.npy", indptr),
+        ("indices.npy", dst.astype(np.int32)),
+        ("levels.npy", level),
+        ("categories.npy", category),
+    ):
+        replace(name, lambda f, array=array: np.save(f, array))
+
+    # Every interaction is stored in both directions
+    level_counts = np.bincount(level, minlength=len(level_names)) // 2
+    meta = {
+        "levels": level_names,
+        "categories": DDINTER_CATEGORIES,
+        "drugs": len(drugs),
+        "interactions": len(df),
+        "level_counts": {name: int(n) for name, n in zip(level_names, level_counts, strict=True)},
+        "sources": sources,
+    }
+    # Written last: a store is only considered current once all arrays are in place
+    replace("meta.json", lambda f: json.dump(meta, f, indent=2), mode="w")
+    print(
+        f"✓ Compiled DDInter store: {meta['drugs']} drugs, {meta['interactions']} interactions "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    return meta
+
+
+class DDInterStore:
+    """Read-only drug and interaction lookups over the compiled DDInter store."""
+
+    def __init__(self, store_dir: str):
+        """Open a compiled store.
+
+        Args:
+            store_dir: Directory written by `build_ddinter_store`
+
+        """
+        import pandas as pd
+
+        from biomni.data_lake.drug_names import normalize_drug_name
+
+        self.data_lake_dir = os.path.dirname(os.path.abspath(store_dir))
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.level_names = self.meta["levels"]
+        self.category_names = self.meta["categories"]
+        self.drugs = pd.read_parquet(os.path.join(store_dir, "drugs.parquet"))
+        self.indptr = np.load(os.path.join(store_dir, "indptr.npy"), mmap_mode="r")
+        self.indices = np.load(os.path.join(store_dir, "indices.npy"), mmap_mode="r")
+        self.levels = np.load(os.path.join(store_dir, "levels.npy"), mmap_mode="r")
+        self.categories = np.load(os.path.join(store_dir, "categories.npy"), mmap_mode="r")
+        self._category_masks = self.drugs["category_mask"].to_numpy(np.int64)
+
+        # Original, standardized and normalized names, later drugs winning on collisions as DDInter's own
+        # mapping did
+        self.name_index: dict[str, int] = {}
+        for drug, name, standardized in zip(
+            self.drugs["drug"], self.drugs["name"], self.drugs["standardized_name"], strict=True
+        ):
+            self.name_index[str(name).lower()] = int(drug)
+            self.name_index[standardized] = int(drug)
+            self.name_index[normalize_drug_name(name)] = int(drug)
+
+    def __len__(self) -> int:
+        return len(self.drugs)
+
+    @classmethod
+    def open(cls, data_lake_dir: str) -> "DDInterStore":
+        """Open the DDInter store of a data lake, compiling it from the CSV files first if needed.
+
+        Stores are cached per process, so repeated calls return the same memory-mapped instance.
+        """
+        store_dir = os.path.join(data_lake_dir, DDINTER_DIR)
+        if not cls._is_current(store_dir, data_lake_dir):
+            from biomni.data_lake.catalog import single_flight
+
+            with single_flight(data_lake_dir, DDINTER_DIR):
+                # Another process may have compiled it while we waited
+                if not cls._is_current(store_dir, data_lake_dir):
+                    build_ddinter_store(data_lake_dir, store_dir)
+        store_dir = os.path.abspath(store_dir)
+        return _open_store(store_dir, os.path.getmtime(os.path.join(store_dir, "meta.json")))
+
+    @staticmethod
+    def _is_current(store_dir: str, data_lake_dir: str) -> bool:
+        meta_path = os.path.join(store_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path) as f:
+            sources = json.load(f)["sources"]
+        present = {name for name in DDINTER_FILES if os.path.exists(os.path.join(data_lake_dir, name))}
+        if present != set(sources):
+            return False
+        return all(_source_stat(os.path.join(data_lake_dir, name)) == sources[name] for name in present)
+
+    def resolve(self, drug_name: str, cutoff: float = 0.8) -> int | None:
+        """Map a drug name to its drug number.
+
+        Exact names (case-insensitive, standardized or normalized) are looked up directly. Anything else goes
+        through the data lake's drug-name resolver, which also knows repurposing hub synonyms, and resolves
+        to its best candidate that is a DDInter drug.
+
+        Args:
+            drug_name: Drug name, synonym or misspelling
+            cutoff: Minimum fuzzy-match score in [0, 1]
+
+        Returns:
+            Drug number, or None if no DDInter drug matches
+
+        """
+        from biomni.data_lake.drug_names import load_drug_name_resolver, normalize_drug_name
+
+        for key in (str(drug_name).lower(), normalize_drug_name(drug_name)):
+            if key in self.name_index:
+                return self.name_index[key]
+        resolver = load_drug_name_resolver(self.data_lake_dir)
+        matches = resolver.candidates(drug_name, k=1, cutoff=cutoff, labels=self.name_index)
+        return self.name_index[matches[0][0]] if matches else None
+
+    def resolve_many(self, drug_names, cutoff: float = 0.8) -> list[int | None]:
+        """Resolve a medication list to drug numbers; see `resolve`."""
+        return [self.resolve(drug_name, cutoff) for drug_name in drug_names]
+
+    def name(self, drug: int) -> str:
+        return self.drugs["name"].iat[drug]
+
+    def standardized_name(self, drug: int) -> str:
+        return self.drugs["standardized_name"].iat[drug]
+
+    def drug_categories(self, drug: int) -> list[str]:
+        """Return the DDInter categories a drug appears in."""
+        mask = int(self._category_masks[drug])
+        return [name for code, name in enumerate(self.category_names) if mask >> code & 1]
+
+    def partner_count(self, drug: int) -> int:
+        """Return the number of distinct drugs a drug interacts with."""
+        return int(self.drugs["partners"].iat[drug])
+
+    def category_mask(self, names) -> int:
+        """Return the bitmask of the given category names."""
+        return sum(1 << self.category_names.index(name) for name in names if name in self.category_names)
+
+    def _pair_slice(self, drug_a: int, drug_b: int) -> slice:
+        start, stop = int(self.indptr[drug_a]), int(self.indptr[drug_a + 1])
+        partners = self.indices[start:stop]
+        left = int(np.searchsorted(partners, drug_b, side="left"))
+        right = int(np.searchsorted(partners, drug_b, side="right"))
+        return slice(start + left, start + right)
+
+    def interactions(self, drug_a: int, drug_b: int) -> list[dict]:
+        """Return the recorded interactions between two drugs as ``{"level", "category"}`` dicts."""
+        pair = self._pair_slice(drug_a, drug_b)
+        return [
+            {"level": self.level_names[level], "category": self.category_names[category]}
+            for level, category in zip(self.levels[pair], self.categories[pair], strict=True)
+        ]
+
+    def partners(self, drug: int):
+        """Return (partner, level code, category code) arrays for every interaction of a drug."""
+        start, stop = int(self.indptr[drug]), int(self.indptr[drug + 1])
+        return self.indices[start:stop], self.levels[start:stop], self.categories[start:stop]
+
+    def _gather(self, drugs):
+        """Concatenate the CSR rows of several drugs.
+
+        Returns:
+            (row, partner, level code, category code) arrays, where row is the position in drugs
+        """
+        drugs = np.asarray(drugs, dtype=np.int64)
+        starts, stops = self.indptr[drugs], self.indptr[drugs + 1]
+        lengths = stops - starts
+        row = np.repeat(np.arange(len(drugs)), lengths)
+        # Index of every entry: its row's start plus its offset within the row
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        entries = starts[row] + offsets
+        return row, self.indices[entries], self.levels[entries], self.categories[entries]
+
+    def _level_codes(self, levels) -> np.ndarray:
+        return np.array([self.level_names.index(level) for level in levels if level in self.level_names], dtype=np.int8)
+
+    def interacting_pairs(self, drugs, levels=None, categories=None):
+        """List every recorded interaction between the drugs of a medication list.
+
+        Args:
+            drugs: Drug numbers; duplicates are ignored
+            levels: Keep only these severity levels (e.g. ["Major", "Moderate"])
+            categories: Keep only these DDInter categories
+
+        Returns:
+            pandas.DataFrame with one row per interaction: drug_a, drug_b (drug numbers, drug_a listed
+            before drug_b), level and category, ordered by pair as in the list
+
+        """
+        import pandas as pd
+
+        drugs = pd.unique(np.asarray(drugs, dtype=np.int64))
+        position = np.full(len(self), -1, dtype=np.int64)
+        position[drugs] = np.arange(len(drugs))
+        row, partner, level, category = self._gather(drugs)
+        column = position[partner]
+        keep = column > row
+        if levels is not None:
+            keep &= np.isin(level, self._level_codes(levels))
+        if categories is not None:
+            keep &= np.isin(category, [self.category_names.index(c) for c in categories if c in self.category_names])
+        row, column, level, category = row[keep], column[keep], level[keep], category[keep]
+        order = np.lexsort((category, column, row))
+        row, column, level, category = row[order], column[order], level[order], category[order]
+        return pd.DataFrame(
+            {
+                "drug_a": drugs[row],
+                "drug_b": drugs[column],
+                "level": pd.Categorical.from_codes(level, self.level_names),
+                "category": pd.Categorical.from_codes(category, self.category_names),
+            }
+        )
+
+    def alternatives(self, category_mask: int, avoid, exclude_levels=("Major",), exclude=()):
+        """Rank the drugs of some categories by how little they interact with a set of drugs to avoid.
+
+        Args:
+            category_mask: Bitmask of the categories candidates must share at least one of (see
+                `category_mask`)
+            avoid: Drug numbers the alternative will be combined with
+            exclude_levels: Drop candidates with an interaction of these levels against any avoided drug
+            exclude: Drug numbers never to propose, e.g. the drug being replaced
+
+        Returns:
+            pandas.DataFrame with drug, name, interaction_count (interactions with the avoided drugs) and
+            total_interactions (distinct partners), fewest interactions first
+
+        """
+        import pandas as pd
+
+        candidates = (self._category_masks & category_mask) != 0
+        candidates[np.asarray(list(exclude), dtype=np.int64)] = False
+
+        _, partner, level, _ = self._gather(pd.unique(np.asarray(list(avoid), dtype=np.int64)))
+        interaction_counts = np.bincount(partner, minlength=len(self))
+        candidates[partner[np.isin(level, self._level_codes(exclude_levels))]] = False
+
+        drugs = np.flatnonzero(candidates)
+        drugs = drugs[np.argsort(interaction_counts[drugs], kind="stable")]
+        return pd.DataFrame(
+            {
+                "drug": drugs,
+                "name": self.drugs["name"].to_numpy(dtype=object)[drugs],
+                "interaction_count": interaction_counts[drugs],
+                "total_interactions": self.drugs["partners"].to_numpy()[drugs],
+            }
+        )
+
+
+@functools.lru_cache(maxsize=4)
+def _open_store(store_dir: str, mtime: float) -> DDInterStore:
+    return DDInterStore(store_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the DDInter CSV files into the interaction store")
+    parser.add_argument("--path", default="./data/biomni_data/data_lake", help="Data lake directory")
+    args = parser.parse_args(argv)
+    build_ddinter_store(args.path, os.path.join(args.path, DDINTER_DIR))
+
+
+if __name__ == "__main__":
+    main()
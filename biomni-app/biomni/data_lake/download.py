@@ -0,0 +1,409 @@
+"""Parallel, resumable, checksum-verified downloads of the Biomni data lake and benchmark.
+
+Files are fetched concurrently into ``<name>.part`` files, resumed with HTTP range requests when a
+partial copy exists, checked against a manifest of sizes and SHA-256 hashes, and only renamed to
+their final name once complete, so an interrupted download is never mistaken for a present file.
+
+Run ``python -m biomni.data_lake.download --path ./data`` to provision a node, or add ``--verify``
+to re-hash the local copy against the manifest.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin
+
+import requests
+import tqdm
+
+S3_BUCKET_URL = "https://biomni-release.s3.amazonaws.com"
+MANIFEST_NAME = ".manifest.json"
+PART_SUFFIX = ".part"
+
+
+def hash_file(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def load_manifest(directory: str) -> dict[str, dict]:
+    """Load the local manifest of a download directory, or an empty one if none exists."""
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path) as f:
+        return json.load(f).get("files", {})
+
+
+def save_manifest(directory: str, entries: dict[str, dict]) -> None:
+    """Atomically write the local manifest of a download directory."""
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    # Unique temp name: several processes may finish downloads into the same directory at once
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=MANIFEST_NAME, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump({"files": entries}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def update_manifest(directory: str, entries: dict[str, dict]) -> dict[str, dict]:
+    """Merge entries into the local manifest of a download directory and return the merged manifest.
+
+    The read, merge and write happen under a lock, so processes finishing downloads into the same
+    directory at once never drop each other's entries.
+    """
+    from biomni.data_lake.catalog import single_flight
+
+    with single_flight(directory, MANIFEST_NAME):
+        merged = {**load_manifest(directory), **entries}
+        save_manifest(directory, merged)
+    return merged
+
+
+def build_manifest(directory: str, filenames: list[str] | None = None, workers: int = 8) -> dict[str, dict]:
+    """Hash files in a directory into manifest entries.
+
+    This is how the published ``manifest.json`` next to the bucket folder is produced.
+
+    Args:
+        directory: Directory holding the files
+        filenames: Files to include; defaults to every regular file in the directory
+        workers: Number of files hashed concurrently
+
+    Returns:
+        Dictionary mapping file names to ``{"size": ..., "sha256": ...}``
+
+    """
+    if filenames is None:
+        filenames = sorted(
+            name
+            for name in os.listdir(directory)
+            if os.path.isfile(os.path.join(directory, name)) and not name.startswith(".")
+        )
+
+    def entry(name):
+        path = os.path.join(directory, name)
+        return name, {"size": os.path.getsize(path), "sha256": hash_file(path)}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(entry, filenames))
+
+
+class DownloadManager:
+    """Download files from the Biomni release bucket concurrently, with resume and integrity checks."""
+
+    def __init__(
+        self,
+        base_url: str = S3_BUCKET_URL,
+        workers: int = 8,
+        chunk_size: int = 1 << 20,
+        timeout: int = 60,
+        retries: int = 2,
+    ):
+        """Initialize the download manager.
+
+        Args:
+            base_url: Base URL of the bucket
+            workers: Number of concurrent transfers
+            chunk_size: Bytes read from the network per write
+            timeout: Connect/read timeout in seconds for each request
+            retries: Extra attempts per file after a failed transfer
+
+        """
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retries = retries
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        # requests.Session is not thread-safe; keep one per worker thread to reuse connections
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def url_for(self, folder: str, filename: str) -> str:
+        return urljoin(self.base_url + "/" + folder + "/", filename)
+
+    def fetch_manifest(self, folder: str) -> dict[str, dict]:
+        """Fetch the published manifest for a bucket folder.
+
+        Returns an empty dict if the bucket has none; sizes then come from HEAD requests and hashes
+        are recorded locally on first download.
+        """
+        try:
+            response = self._session().get(self.url_for(folder, "manifest.json"), timeout=self.timeout)
+            if response.status_code != 200:
+                return {}
+            return response.json().get("files", {})
+        except (requests.RequestException, ValueError):
+            return {}
+
+    def remote_size(self, url: str) -> int | None:
+        """Return the Content-Length reported for a URL, or None if unavailable."""
+        try:
+            response = self._session().head(url, timeout=self.timeout, allow_redirects=True)
+            response.raise_for_status()
+            size = response.headers.get("content-length")
+            return int(size) if size is not None else None
+        except (requests.RequestException, ValueError):
+            return None
+
+    def download_file(
+        self,
+        url: str,
+        file_path: str,
+        expected: dict | None = None,
+        progress: tqdm.tqdm | None = None,
+    ) -> dict | None:
+        """Download one file, resuming a previous partial download if possible.
+
+        Args:
+            url: Source URL
+            file_path: Final destination path
+            expected: Optional manifest entry with "size" and/or "sha256" to verify against
+            progress: Optional shared progress bar updated with downloaded bytes
+
+        Returns:
+            The manifest entry of the completed file, or None on failure
+
+        """
+        expected = expected or {}
+        part_path = file_path + PART_SUFFIX
+        hasher = hashlib.sha256()
+
+        try:
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            expected_size = expected.get("size")
+            if expected_size is not None and offset > expected_size:
+                os.remove(part_path)
+                offset = 0
+
+            if offset:
+                # Hash what we already have so the final digest covers the whole file
+                with open(part_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                        hasher.update(chunk)
+
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            with self._session().get(url, stream=True, headers=headers, timeout=self.timeout) as response:
+                if response.status_code == 416 and offset:
+                    # Range not satisfiable: the partial file already holds every byte
+                    pass
+                else:
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        # Server ignored the range request; start over
+                        offset = 0
+                        hasher = hashlib.sha256()
+
+                    with open(part_path, "ab" if offset else "wb") as f:
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            if chunk:
+                                f.write(chunk)
+                                hasher.update(chunk)
+                                if progress is not None:
+                                    progress.update(len(chunk))
+
+            size = os.path.getsize(part_path)
+            digest = hasher.hexdigest()
+            if expected_size is not None and size != expected_size:
+                print(f"✗ Size mismatch for {os.path.basename(file_path)}: {size} != {expected_size}")
+                return None
+            if expected.get("sha256") and digest != expected["sha256"]:
+                print(f"✗ Checksum mismatch for {os.path.basename(file_path)}; discarding partial download")
+                os.remove(part_path)
+                return None
+
+            os.replace(part_path, file_path)
+            return {"size": size, "sha256": digest}
+        except Exception as e:
+            # Keep the .part file so the next attempt can resume from it
+            print(f"✗ Failed to download {os.path.basename(file_path)}: {e}")
+            return None
+
+    def download_files(self, folder: str, dest_dir: str, filenames: list[str]) -> dict[str, bool]:
+        """Download the missing or incomplete files of a bucket folder concurrently.
+
+        A file counts as present only if it exists under its final name and, when the manifest
+        knows its size, has that size.
+
+        Args:
+            folder: Bucket folder, e.g. "data_lake"
+            dest_dir: Local destination directory
+            filenames: File names expected in the folder
+
+        Returns:
+            Dictionary mapping file names to download success status
+
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+        remote_manifest = self.fetch_manifest(folder)
+        local_manifest = load_manifest(dest_dir)
+        results = {}
+        completed = {}
+        pending = []
+
+        for filename in filenames:
+            file_path = os.path.join(dest_dir, filename)
+            expected = remote_manifest.get(filename) or local_manifest.get(filename) or {}
+            if os.path.exists(file_path) and expected.get("size") in (None, os.path.getsize(file_path)):
+                results[filename] = True
+            else:
+                pending.append(filename)
+
+        if not pending:
+            return results
+
+        print(f"Downloading {len(pending)} file(s) from {folder} with {self.workers} concurrent transfers...")
+
+        def fetch(filename):
+            url = self.url_for(folder, filename)
+            expected = dict(remote_manifest.get(filename) or {})
+            if "size" not in expected:
+                size = self.remote_size(url)
+                if size is not None:
+                    expected["size"] = size
+            entry = None
+            for _ in range(self.retries + 1):
+                # Each retry resumes from the .part file left by the previous attempt
+                entry = self.download_file(url, os.path.join(dest_dir, filename), expected, progress)
+                if entry is not None:
+                    break
+            return filename, entry
+
+        with (
+            tqdm.tqdm(unit="B", unit_scale=True, desc=folder, ncols=80) as progress,
+            ThreadPoolExecutor(max_workers=self.workers) as pool,
+        ):
+            futures = [pool.submit(fetch, filename) for filename in pending]
+            for future in as_completed(futures):
+                filename, entry = future.result()
+                results[filename] = entry is not None
+                if entry is not None:
+                    completed[filename] = entry
+                    print(f"✓ Successfully downloaded: {filename}")
+
+        if completed:
+            update_manifest(dest_dir, completed)
+        return results
+
+    def download_archive(self, folder: str, dest_dir: str) -> bool:
+        """Download ``<folder>.zip`` (resumable) and extract it into dest_dir in parallel."""
+        os.makedirs(dest_dir, exist_ok=True)
+        zip_path = os.path.join(dest_dir, folder + ".zip")
+        url = urljoin(self.base_url + "/", folder + ".zip")
+        expected = {}
+        size = self.remote_size(url)
+        if size is not None:
+            expected["size"] = size
+
+        with tqdm.tqdm(unit="B", unit_scale=True, desc=f"{folder}.zip", ncols=80) as progress:
+            if self.download_file(url, zip_path, expected, progress) is None:
+                return False
+
+        print(f"Extracting {folder}.zip...")
+        try:
+            extract_zip(zip_path, dest_dir, workers=self.workers)
+        except Exception as e:
+            print(f"✗ Error extracting {folder}.zip: {e}")
+            return False
+        os.remove(zip_path)
+        print(f"✓ Successfully downloaded and extracted {folder} folder")
+        return True
+
+    def verify(self, folder: str, dest_dir: str, filenames: list[str] | None = None) -> dict[str, str]:
+        """Re-hash local files and compare them with the manifest.
+
+        Args:
+            folder: Bucket folder the files came from
+            dest_dir: Local directory holding the files
+            filenames: Files to check; defaults to every manifest entry
+
+        Returns:
+            Dictionary mapping file names to "ok", "missing", "size mismatch", "checksum mismatch"
+            or "unverified" (no reference hash known)
+
+        """
+        manifest = {**load_manifest(dest_dir), **self.fetch_manifest(folder)}
+        if filenames is None:
+            filenames = sorted(manifest)
+
+        def check(filename):
+            file_path = os.path.join(dest_dir, filename)
+            expected = manifest.get(filename, {})
+            if not os.path.exists(file_path):
+                return filename, "missing"
+            if expected.get("size") is not None and os.path.getsize(file_path) != expected["size"]:
+                return filename, "size mismatch"
+            if not expected.get("sha256"):
+                return filename, "unverified"
+            return filename, "ok" if hash_file(file_path) == expected["sha256"] else "checksum mismatch"
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return dict(pool.map(check, filenames))
+
+
+def extract_zip(zip_path: str, dest_dir: str, workers: int = 8) -> None:
+    """Extract a zip archive using several threads, each with its own file handle."""
+    with zipfile.ZipFile(zip_path) as zf:
+        members = zf.infolist()
+        # Create every folder up front in this thread: ZipFile.extract checks for a member's parent folder and
+        # then creates it, which races between threads. Paths are sanitized the way ZipFile.extract does
+        for member in members:
+            parts = [part for part in member.filename.split("/") if part not in ("", ".", "..")]
+            parts = parts if member.is_dir() else parts[:-1]
+            if parts:
+                os.makedirs(os.path.join(dest_dir, *parts), exist_ok=True)
+    shards = [members[i::workers] for i in range(workers)]
+
+    def extract(shard):
+        with zipfile.ZipFile(zip_path) as zf:
+            for member in shard:
+                zf.extract(member, dest_dir)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # list() re-raises the first extraction error, if any
+        list(pool.map(extract, shards))
+
+
+def main(argv=None):
+    from biomni.env_desc import data_lake_dict
+
+    parser = argparse.ArgumentParser(description="Provision or verify the Biomni data lake and benchmark.")
+    parser.add_argument("--path", default="./data", help="Data path passed to A1 (default: ./data)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent transfers (default: 8)")
+    parser.add_argument("--verify", action="store_true", help="Re-hash local files against the manifest")
+    parser.add_argument("--skip-benchmark", action="store_true", help="Only provision the data lake")
+    args = parser.parse_args(argv)
+
+    data_lake_dir = os.path.join(args.path, "biomni_data", "data_lake")
+    benchmark_dir = os.path.join(args.path, "biomni_data", "benchmark")
+    manager = DownloadManager(workers=args.workers)
+
+    if args.verify:
+        status = manager.verify("data_lake", data_lake_dir, list(data_lake_dict.keys()))
+        problems = {name: state for name, state in status.items() if state not in ("ok", "unverified")}
+        for name, state in sorted(problems.items()):
+            print(f"✗ {name}: {state}")
+        print(f"Verified {len(status)} files: {len(status) - len(problems)} ok, {len(problems)} with problems")
+        return 1 if problems else 0
+
+    results = manager.download_files("data_lake", data_lake_dir, list(data_lake_dict.keys()))
+    ok = all(results.values())
+    if not args.skip_benchmark and not os.path.isdir(os.path.join(benchmark_dir, "hle")):
+        ok = manager.download_archive("benchmark", benchmark_dir) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
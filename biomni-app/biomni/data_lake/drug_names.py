@@ -0,0 +1,237 @@
+"""Fast fuzzy drug-name resolution.
+
+Drug names from DDInter and the Broad Drug Repurposing Hub (names and synonyms) are normalized and
+indexed by character trigrams. A query only scores the names that share a trigram with it, then
+re-scores the best few with difflib's ratio, so a misspelt name resolves in microseconds instead of an
+edit-distance scan over every known name.
+
+    resolver = load_drug_name_resolver(data_lake_path)
+    resolver.candidates("asprin")         # [("aspirin", 0.92...), ...]
+    resolver.resolve_many(["Tylenol", "metformin HCl"])
+"""
+
+import functools
+import os
+import re
+
+import numpy as np
+
+DDINTER_DRUGS = os.path.join(".ddinter", "drugs.parquet")
+REPURPOSING_HUB_FILES = [
+    "broad_repurposing_hub_phase_moa_target_info.parquet",
+    "broad_repurposing_hub_molecule_with_smiles.parquet",
+]
+# Salt and ester forms dropped from the end of a name, e.g. "metformin hydrochloride" -> "metformin"
+SALT_FORMS = [
+    "hydrochloride",
+    "hcl",
+    "sulfate",
+    "sodium",
+    "potassium",
+    "calcium",
+    "magnesium",
+    "phosphate",
+    "acetate",
+    "citrate",
+]
+
+# Name columns and synonym columns of the repurposing hub tables, matched on lower-cased names
+_NAME_COLUMN = re.compile(r"^(pert_iname|name|drug_name|compound_name)$")
+_SYNONYM_COLUMN = re.compile(r"synonym")
+_SALT_SUFFIX = re.compile(r"(?:\s+(?:" + "|".join(SALT_FORMS) + r"))+$")
+_LIST_SEPARATOR = re.compile(r"\s*[|;]\s*")
+# Trigram candidates re-scored with difflib per query
+_RESCORE = 20
+
+
+def normalize_name(name) -> str:
+    """Normalize a name for matching: lower-cased, whitespace collapsed."""
+    if name is None or name != name:  # None or NaN
+        return ""
+    return " ".join(str(name).lower().split())
+
+
+def normalize_drug_name(name) -> str:
+    """Normalize a drug name for matching: lower-cased, whitespace collapsed, trailing salt forms dropped."""
+    name = normalize_name(name)
+    return _SALT_SUFFIX.sub("", name) or name
+
+
+def _trigrams(name: str) -> set[str]:
+    padded = f"  {name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyNameIndex:
+    """Trigram index from names (and synonyms) to canonical names."""
+
+    # Applied to indexed names, labels and queries alike
+    normalize = staticmethod(normalize_name)
+
+    def __init__(self, names, labels=None):
+        """Build the index.
+
+        Args:
+            names: Names or synonyms to index
+            labels: Canonical name each entry resolves to; defaults to the normalized name itself. When a
+                name appears more than once, its first label wins
+
+        """
+        if labels is None:
+            labels = names
+        self._label_of: dict[str, str] = {}
+        for name, label in zip(names, labels, strict=True):
+            key = self.normalize(name)
+            if key and key not in self._label_of:
+                self._label_of[key] = self.normalize(label) or key
+        self._keys = list(self._label_of)
+
+        # CSR postings: trigram -> ids of the keys containing it
+        grams: dict[str, int] = {}
+        gram_ids, key_ids = [], []
+        self._gram_counts = np.zeros(len(self._keys), dtype=np.int32)
+        for key_id, key in enumerate(self._keys):
+            key_grams = _trigrams(key)
+            self._gram_counts[key_id] = len(key_grams)
+            for gram in key_grams:
+                gram_ids.append(grams.setdefault(gram, len(grams)))
+                key_ids.append(key_id)
+        self._grams = grams
+        gram_ids = np.asarray(gram_ids, dtype=np.int64)
+        order = np.argsort(gram_ids, kind="stable")
+        self._postings = np.asarray(key_ids, dtype=np.int32)[order]
+        self._indptr = np.zeros(len(grams) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(gram_ids, minlength=len(grams)), out=self._indptr[1:])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name) -> bool:
+        return self.normalize(name) in self._label_of
+
+    def candidates(self, name, k: int = 5, cutoff: float = 0.0, labels=None) -> list[tuple[str, float]]:
+        """Return the k best matching canonical names for a name, with similarity scores.
+
+        Args:
+            name: Name to look up
+            k: Maximum number of candidates
+            cutoff: Minimum score in [0, 1]; scores are difflib ratios, 1.0 for an exact match
+            labels: Only return these canonical names (any container), e.g. the drugs a store knows; an exact
+                match outside them falls through to the fuzzy matches
+
+        Returns:
+            List of (canonical name, score), best first
+
+        """
+        from difflib import SequenceMatcher
+
+        query = self.normalize(name)
+        if not query:
+            return []
+        if query in self._label_of and (labels is None or self._label_of[query] in labels):
+            return [(self._label_of[query], 1.0)]
+
+        query_grams = _trigrams(query)
+        gram_ids = [self._grams[gram] for gram in query_grams if gram in self._grams]
+        if not gram_ids:
+            return []
+        postings = np.concatenate([self._postings[self._indptr[g] : self._indptr[g + 1]] for g in gram_ids])
+        key_ids, shared = np.unique(postings, return_counts=True)
+        if labels is not None:
+            # Before shortlisting, so names outside the labels never take the shortlist's places
+            keep = np.fromiter((self._label_of[self._keys[key_id]] in labels for key_id in key_ids), bool, len(key_ids))
+            key_ids, shared = key_ids[keep], shared[keep]
+        # Dice coefficient over trigram sets, to shortlist the keys worth a difflib comparison
+        dice = 2 * shared / (self._gram_counts[key_ids] + len(query_grams))
+        if len(key_ids) > _RESCORE:
+            top = np.argpartition(-dice, _RESCORE)[:_RESCORE]
+            key_ids = key_ids[top]
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        best: dict[str, float] = {}
+        for key_id in key_ids:
+            key = self._keys[key_id]
+            matcher.set_seq1(key)
+            if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                continue
+            score = matcher.ratio()
+            label = self._label_of[key]
+            if score >= cutoff and score > best.get(label, -1.0):
+                best[label] = score
+        return sorted(best.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    def resolve(self, name, cutoff: float = 0.8) -> str | None:
+        """Return the canonical name of the best match scoring at least cutoff, or None."""
+        matches = self.candidates(name, k=1, cutoff=cutoff)
+        return matches[0][0] if matches else None
+
+    def resolve_many(self, names, cutoff: float = 0.8) -> list[str | None]:
+        """Resolve a list of names; see `resolve`."""
+        return [self.resolve(name, cutoff) for name in names]
+
+
+class DrugNameResolver(FuzzyNameIndex):
+    """Trigram index from drug names (and synonyms) to canonical drug names, ignoring salt forms."""
+
+    normalize = staticmethod(normalize_drug_name)
+
+
+def drug_name_sources(data_lake_path: str) -> list[str]:
+    """Return the local files a data lake's drug-name resolver is built from."""
+    names = [DDINTER_DRUGS] + REPURPOSING_HUB_FILES
+    return [os.path.join(data_lake_path, name) for name in names if os.path.exists(os.path.join(data_lake_path, name))]
+
+
+def _read_drug_names(path: str):
+    """Return (names, labels) from a compiled DDInter drug table or a repurposing hub table."""
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    if path.endswith(DDINTER_DRUGS):
+        drugs = pd.read_parquet(path, columns=["name", "standardized_name"])
+        names = drugs["name"].tolist() + drugs["standardized_name"].tolist()
+        return names, names
+
+    columns = pq.read_schema(path).names
+    name_column = next((column for column in columns if _NAME_COLUMN.match(column.lower())), None)
+    if name_column is None:
+        return [], []
+    synonym_columns = [column for column in columns if _SYNONYM_COLUMN.search(column.lower())]
+    table = pd.read_parquet(path, columns=[name_column] + synonym_columns).dropna(subset=[name_column])
+    names = table[name_column].astype(str).tolist()
+    labels = list(names)
+    for column in synonym_columns:
+        synonyms = table[column].dropna()
+        if synonyms.map(lambda value: isinstance(value, str)).all():
+            synonyms = synonyms.str.split(_LIST_SEPARATOR)
+        synonyms = synonyms.explode().dropna()
+        names += synonyms.astype(str).tolist()
+        labels += table[name_column].loc[synonyms.index].astype(str).tolist()
+    return names, labels
+
+
+@functools.lru_cache(maxsize=4)
+def _load_drug_name_resolver_cached(sources):
+    names, labels = [], []
+    # DDInter first, so a DDInter name is never re-labelled by a repurposing hub synonym
+    for path, _ in sources:
+        source_names, source_labels = _read_drug_names(path)
+        names += source_names
+        labels += source_labels
+    return DrugNameResolver(names, labels)
+
+
+def load_drug_name_resolver(data_lake_path: str) -> DrugNameResolver:
+    """Return the drug-name resolver of a data lake, built once per process from its local drug tables.
+
+    Args:
+        data_lake_path: Path to the data lake directory
+
+    Returns:
+        DrugNameResolver over the DDInter drug names (once the DDInter store is compiled) and the
+        repurposing hub names and synonyms
+
+    """
+    sources = tuple((path, os.path.getmtime(path)) for path in drug_name_sources(os.path.abspath(data_lake_path)))
+    return _load_drug_name_resolver_cached(sources)
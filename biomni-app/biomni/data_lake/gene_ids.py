@@ -0,0 +1,285 @@
+"""Offline gene identifier normalization.
+
+Symbols, aliases, previous symbols, HGNC ids, Entrez ids and Ensembl ids are mapped to one record per
+gene (symbol, HGNC id, Entrez id, Ensembl id) through a hash index over every known key. The gene
+dictionary is built from an HGNC snapshot (``hgnc_complete_set.txt``) when one is in the data lake and
+from ``gene_info.parquet`` otherwise, so nothing goes over the network.
+
+    normalize_genes(["p53", "7157", "ENSG00000141510.17", "KRAS2"])
+"""
+
+import functools
+import os
+import re
+
+import numpy as np
+
+GENE_INFO_FILE = "gene_info.parquet"
+# HGNC complete set as downloaded from genenames.org; preferred over gene_info when present
+HGNC_FILES = ["hgnc_complete_set.txt", "hgnc_complete_set.tsv"]
+
+# Matched against lower-cased column names with non-word runs replaced by "_", first match wins
+KEY_PATTERNS = {
+    "hgnc": re.compile(r"^hgnc(_gene)?_?id$"),
+    "ensembl": re.compile(r"^ensembl(_gene)?(_id)?(_interactor)?(_?[ab12])?$"),
+    "entrez": re.compile(r"^(entrez|ncbi)(_gene)?(_id)?(_interactor)?(_?[ab12])?$|^gene_?id(_?[ab12])?$"),
+    "previous": re.compile(r"^(prev|previous|old)_?symbols?$"),
+    "alias": re.compile(r"^(alias|synonym)(_symbol)?s?$|^(gene_)?(aliases|synonyms)$"),
+    "symbol": re.compile(
+        r"^(official_|approved_|hgnc_|hugo_)?(gene_?symbol|gene_?name|gene|symbol|marker)s?(_interactor)?(_?[ab12])?$"
+    ),
+}
+# Key-to-gene precedence: a symbol is never shadowed by another gene's alias
+KEY_PRIORITY = {"symbol": 0, "hgnc": 1, "entrez": 1, "ensembl": 1, "previous": 2, "alias": 3}
+ID_COLUMNS = ["symbol", "hgnc_id", "entrez", "ensembl"]
+
+_LIST_SEPARATOR = r"[|;,]"
+_ENSEMBL_VERSION = r"^(ENS[A-Z]*G\d+)\.\d+$"
+
+
+def key_columns(columns: list[str]) -> dict[str, str]:
+    """Map the gene columns of a table to their kind: symbol, hgnc, entrez, ensembl, previous or alias."""
+    kinds = {}
+    for column in columns:
+        normalized = re.sub(r"\W+", "_", str(column).strip().lower()).strip("_")
+        for kind, pattern in KEY_PATTERNS.items():
+            if pattern.search(normalized):
+                kinds[column] = kind
+                break
+    return kinds
+
+
+def normalize_keys(values):
+    """Normalize gene identifiers for lookup: upper-cased, stripped, Ensembl versions dropped."""
+    import pandas as pd
+
+    values = pd.Series(values)
+    if pd.api.types.is_float_dtype(values):
+        values = values.round().astype("Int64")
+    values = values.astype("string").str.strip().str.upper()
+    return values.str.replace(_ENSEMBL_VERSION, r"\1", regex=True)
+
+
+def normalize_key(value) -> str:
+    """Normalize one gene identifier the way `normalize_keys` does."""
+    return re.sub(_ENSEMBL_VERSION, r"\1", str(value).strip().upper())
+
+
+def column_keys(table, column):
+    """Return (row, key) pairs for a gene column of a pyarrow Table.
+
+    List columns and delimited strings (e.g. ``"P53|LFS1"``) yield one pair per element.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    array = table.column(column).combine_chunks()
+    if pa.types.is_list(array.type) or pa.types.is_large_list(array.type):
+        rows = pc.list_parent_indices(array).to_numpy()
+        array = pc.list_flatten(array)
+    else:
+        rows = np.arange(len(array))
+    keys = normalize_keys(array.to_pandas()).set_axis(rows)
+    if keys.str.contains(_LIST_SEPARATOR, regex=True).any():
+        keys = keys.str.split(_LIST_SEPARATOR).explode().str.strip()
+    keys = keys[keys.notna() & (keys != "") & (keys != "-")]
+    return keys.index.to_numpy(np.int64), keys.to_numpy(dtype=object)
+
+
+def gene_dictionary(table):
+    """Build the gene records and the key-to-gene map from a gene_info or HGNC table.
+
+    Args:
+        table: pyarrow Table with a symbol column and optionally HGNC, Entrez, Ensembl, previous symbol and
+            alias columns, or None for an empty dictionary
+
+    Returns:
+        (genes, keys): genes has one row per symbol with the ID_COLUMNS; keys maps every distinct key to a
+        gene number and the kind of key it is
+
+    """
+    import pandas as pd
+
+    genes = pd.DataFrame({column: pd.Series(dtype=object) for column in ID_COLUMNS})
+    keys = pd.DataFrame({"key": pd.Series(dtype=object), "gene": pd.Series(dtype=np.int64), "kind": ""})
+    if table is None:
+        return genes, keys
+
+    kinds = key_columns(table.column_names)
+    symbols = [column for column, kind in kinds.items() if kind == "symbol"]
+    if not symbols:
+        raise ValueError("The gene table has no gene symbol column")
+    # "symbol" columns hold official symbols; "gene_name" may be a description
+    symbol_column = min(symbols, key=lambda column: "symbol" not in column.lower())
+    codes, uniques = pd.factorize(normalize_keys(table.column(symbol_column).to_pandas()))
+
+    genes = pd.DataFrame({"symbol": np.asarray(uniques, dtype=object)})
+    first = np.unique(codes[codes >= 0], return_index=True)[1]
+    rows = np.flatnonzero(codes >= 0)[first]
+    for kind, column_name in (("hgnc", "hgnc_id"), ("entrez", "entrez"), ("ensembl", "ensembl")):
+        column = next((column for column, k in kinds.items() if k == kind), None)
+        values = normalize_keys(table.column(column).to_pandas()).to_numpy(dtype=object)[rows] if column else None
+        genes[column_name] = values
+
+    parts = []
+    for column, kind in kinds.items():
+        if kind == "symbol" and column != symbol_column:
+            continue
+        rows, values = column_keys(table, column)
+        parts.append(pd.DataFrame({"key": values, "gene": codes[rows], "kind": kind}))
+    keys = pd.concat(parts, ignore_index=True)
+    keys = keys[keys["gene"] >= 0]
+    priority = keys["kind"].map(KEY_PRIORITY)
+    keys = keys.iloc[np.argsort(priority.to_numpy(), kind="stable")].drop_duplicates("key")
+    return genes, keys.reset_index(drop=True)
+
+
+def read_gene_table(path: str):
+    """Read a gene_info Parquet file or an HGNC TSV snapshot as a pyarrow Table."""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith(".parquet"):
+        return pq.read_table(path)
+    return pa.Table.from_pandas(pd.read_csv(path, sep="\t", dtype=str), preserve_index=False)
+
+
+class GeneNormalizer:
+    """Batch mapping of gene identifiers to symbol, HGNC, Entrez and Ensembl ids."""
+
+    def __init__(self, genes, keys):
+        """Initialize from the output of `gene_dictionary`.
+
+        Args:
+            genes: One row per gene with the ID_COLUMNS
+            keys: Distinct keys with their gene number and kind
+
+        """
+        import pandas as pd
+
+        # A trailing empty record, so unknown identifiers (gene -1) pick it up in one vectorized take
+        self._records = pd.concat(
+            [genes[ID_COLUMNS], pd.DataFrame({column: [None] for column in ID_COLUMNS})], ignore_index=True
+        )
+        self._keys = pd.Index(keys["key"].to_numpy(dtype=object))
+        self._key_genes = keys["gene"].to_numpy(np.int64)
+        self._key_kinds = keys["kind"].to_numpy(dtype=object)
+
+    def __len__(self) -> int:
+        return len(self._records) - 1
+
+    @classmethod
+    def from_file(cls, path: str) -> "GeneNormalizer":
+        """Build a normalizer from a gene_info Parquet file or an HGNC TSV snapshot."""
+        return cls(*gene_dictionary(read_gene_table(path)))
+
+    def _lookup(self, identifiers):
+        if isinstance(identifiers, str | int | np.integer):
+            identifiers = [identifiers]
+        identifiers = list(identifiers)
+        if len(identifiers) < 64:
+            keys = [normalize_key(identifier) for identifier in identifiers]
+        else:
+            keys = normalize_keys([str(identifier) for identifier in identifiers]).to_numpy(dtype=object)
+        position = self._keys.get_indexer(keys)
+        return identifiers, position
+
+    def normalize(self, identifiers):
+        """Map gene identifiers to their gene records.
+
+        Args:
+            identifiers: A symbol, alias, previous symbol, HGNC, Entrez or Ensembl id, or a list of them;
+                matching ignores case and Ensembl versions
+
+        Returns:
+            pandas.DataFrame with one row per identifier: query, symbol, hgnc_id, entrez, ensembl and
+            matched_as (symbol, alias, previous, hgnc, entrez or ensembl; None if unknown)
+
+        """
+        import pandas as pd
+
+        identifiers, position = self._lookup(identifiers)
+        found = position >= 0
+        gene = np.where(found, self._key_genes[position], -1)
+        frame = self._records.iloc[gene].reset_index(drop=True)
+        frame.insert(0, "query", identifiers)
+        # An object Series, so unknown identifiers hold None rather than a string dtype's NaN
+        frame["matched_as"] = pd.Series(self._key_kinds[position], dtype=object).where(found, None)
+        return frame
+
+    def symbols(self, identifiers, keep_unknown: bool = False) -> list:
+        """Map gene identifiers to official symbols.
+
+        Args:
+            identifiers: Identifiers as accepted by `normalize`
+            keep_unknown: Return unknown identifiers unchanged instead of None
+
+        Returns:
+            List of symbols in input order
+
+        """
+        identifiers, position = self._lookup(identifiers)
+        symbols = self._records["symbol"].to_numpy(dtype=object)[np.where(position >= 0, self._key_genes[position], -1)]
+        if keep_unknown:
+            return [symbol if symbol is not None else query for symbol, query in zip(symbols, identifiers, strict=True)]
+        return list(symbols)
+
+    def map(self, identifiers, to: str = "entrez") -> list:
+        """Map gene identifiers to one kind of id: "symbol", "hgnc_id", "entrez" or "ensembl"."""
+        if to not in ID_COLUMNS:
+            raise ValueError(f"Unsupported target '{to}'; use one of {', '.join(ID_COLUMNS)}")
+        return self.normalize(identifiers)[to].tolist()
+
+
+def gene_table_path(data_lake_path: str, fetch: bool = True) -> str:
+    """Return the gene table a normalizer is built from: a local HGNC snapshot, else gene_info.parquet.
+
+    With fetch=False a missing gene_info.parquet is not downloaded, and the returned path does not exist.
+    """
+    from biomni.data_lake.catalog import data_lake_file
+
+    for name in HGNC_FILES:
+        path = os.path.join(data_lake_path, name)
+        if os.path.exists(path):
+            return path
+    if not fetch:
+        return os.path.join(data_lake_path, GENE_INFO_FILE)
+    return data_lake_file(data_lake_path, GENE_INFO_FILE)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_gene_normalizer_cached(path, mtime):
+    return GeneNormalizer.from_file(path)
+
+
+def load_gene_normalizer(data_lake_path: str, fetch: bool = True) -> GeneNormalizer:
+    """Return the gene normalizer of a data lake, building it only once per process.
+
+    Args:
+        data_lake_path: Path to the data lake directory
+        fetch: Download gene_info.parquet in lazy mode if it is not local yet
+
+    Returns:
+        GeneNormalizer
+
+    Raises:
+        FileNotFoundError: If there is no gene table (with fetch=False: no local one)
+
+    """
+    path = os.path.abspath(gene_table_path(data_lake_path, fetch))
+    return _load_gene_normalizer_cached(path, os.path.getmtime(path))
+
+
+def normalize_genes(identifiers, data_lake_path: str):
+    """Map gene identifiers to symbol, HGNC, Entrez and Ensembl ids offline; see `GeneNormalizer.normalize`.
+
+    Args:
+        identifiers: A symbol, alias, previous symbol, HGNC, Entrez or Ensembl id, or a list of them
+        data_lake_path: Path to the data lake directory
+
+    Returns:
+        pandas.DataFrame with one row per identifier
+
+    """
+    return load_gene_normalizer(data_lake_path).normalize(identifiers)
@@ -0,0 +1,397 @@
+"""Gene-centric index over the gene-keyed data lake tables.
+
+The local gene tables (gene_info, DisGeNET, OMIM, GTEx, cell type markers, variants, the BioGRID-style
+interaction tables and the MSigDB gene sets) are compiled once into ``<data_lake>/.gene_index/``:
+
+- ``genes.parquet``: one row per gene (symbol, HGNC, Entrez and Ensembl ids), from ``gene_info.parquet``
+  plus any symbol that only appears in another table
+- ``keys.parquet``: every symbol, alias, previous symbol, Entrez id and Ensembl id mapped to its gene
+- ``indptr.npy`` / ``tables.npy`` / ``rows.npy``: CSR postings from each gene to the rows that mention
+  it, grouped by table
+- ``tables/<file>.arrow``: uncompressed Arrow IPC copies of the indexed tables
+- ``meta.json``: the indexed tables, their gene columns and the size and mtime of each source
+
+The postings and the Arrow copies are memory-mapped, so a profile is a hash lookup plus a ``take`` of
+a few rows per table instead of a scan of every table.
+
+    python -m biomni.data_lake.gene_index --path ./data/biomni_data/data_lake
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import time
+
+import numpy as np
+
+from biomni.data_lake.gene_ids import GENE_INFO_FILE, column_keys, gene_dictionary, key_columns, normalize_key
+
+GENE_INDEX_DIR = ".gene_index"
+
+# Data lake tables keyed by gene
+GENE_TABLE_PATTERNS = [
+    GENE_INFO_FILE,
+    "DisGeNET.parquet",
+    "omim.parquet",
+    "gtex_tissue_gene_tpm.parquet",
+    "marker_celltype.parquet",
+    "variant_table.parquet",
+    "affinity_capture-*.parquet",
+    "co-fractionation.parquet",
+    "proximity_label-ms.parquet",
+    "reconstituted_complex.parquet",
+    "two-hybrid.parquet",
+    "genetic_interaction.parquet",
+    "synthetic_*.parquet",
+    "dosage_growth_defect.parquet",
+    "msigdb_human_*.parquet",
+]
+
+
+def gene_tables(names: list[str]) -> list[str]:
+    """Pick the gene-keyed tables out of a list of data lake file names."""
+    return sorted(name for name in names if any(fnmatch.fnmatch(name, pattern) for pattern in GENE_TABLE_PATTERNS))
+
+
+def _is_list_column(table, column) -> bool:
+    import pyarrow as pa
+
+    column_type = table.schema.field(column).type
+    return pa.types.is_list(column_type) or pa.types.is_large_list(column_type)
+
+
+def build_gene_index(data_lake_dir: str, out_dir: str, names: list[str], paths: dict[str, str] | None = None) -> dict:
+    """Compile gene-keyed data lake tables into the memory-mapped gene index.
+
+    Args:
+        data_lake_dir: Data lake directory
+        out_dir: Directory to write the index into
+        names: Data lake files to index; gene_info.parquet, if present, defines the genes and their aliases
+        paths: Optional file to read for each name, e.g. an optimized copy; defaults to the data lake file
+
+    Returns:
+        The index metadata
+
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    start = time.perf_counter()
+    paths = paths or {}
+    sources = {name: os.path.join(data_lake_dir, name) for name in names}
+    tables = {name: pq.read_table(paths.get(name, source)) for name, source in sources.items()}
+
+    genes, keys = gene_dictionary(tables.get(GENE_INFO_FILE))
+    key_index = pd.Index(keys["key"].to_numpy(dtype=object))
+    key_genes = keys["gene"].to_numpy(np.int64)
+    new_symbols: list[np.ndarray] = []
+
+    postings_genes, postings_tables, postings_rows = [], [], []
+    table_meta = {}
+    for code, (name, table) in enumerate(tables.items()):
+        kinds = key_columns(table.column_names)
+        for column, kind in kinds.items():
+            rows, values = column_keys(table, column)
+            position = key_index.get_indexer(values)
+            found = position >= 0
+            if kind == "symbol":
+                # Symbols missing from gene_info become genes of their own
+                unknown = pd.unique(values[~found])
+                if len(unknown):
+                    first_gene = len(genes) + sum(len(symbols) for symbols in new_symbols)
+                    new_symbols.append(unknown)
+                    key_index = key_index.append(pd.Index(unknown))
+                    key_genes = np.concatenate([key_genes, np.arange(first_gene, first_gene + len(unknown))])
+                    position = key_index.get_indexer(values)
+                    found = position >= 0
+            postings_genes.append(key_genes[position[found]])
+            postings_tables.append(np.full(int(found.sum()), code, dtype=np.int16))
+            postings_rows.append(rows[found])
+        table_meta[name] = {
+            "code": code,
+            "rows": table.num_rows,
+            "key_columns": kinds,
+            "list_columns": [column for column in kinds if _is_list_column(table, column)],
+            **_source_stat(sources[name]),
+        }
+
+    if new_symbols:
+        added = pd.DataFrame({"symbol": np.concatenate(new_symbols)})
+        genes = pd.concat([genes, added], ignore_index=True)
+    genes.insert(0, "gene", np.arange(len(genes)))
+
+    gene = np.concatenate(postings_genes) if postings_genes else np.empty(0, dtype=np.int64)
+    table_code = np.concatenate(postings_tables) if postings_tables else np.empty(0, dtype=np.int16)
+    row = np.concatenate(postings_rows) if postings_rows else np.empty(0, dtype=np.int64)
+    order = np.lexsort((row, table_code, gene))
+    gene, table_code, row = gene[order], table_code[order], row[order]
+    # A row can name the same gene twice, e.g. by symbol and by Entrez id
+    keep = np.ones(len(gene), dtype=bool)
+    keep[1:] = (gene[1:] != gene[:-1]) | (table_code[1:] != table_code[:-1]) | (row[1:] != row[:-1])
+    gene, table_code, row = gene[keep], table_code[keep], row[keep]
+    indptr = np.zeros(len(genes) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(gene, minlength=len(genes)), out=indptr[1:])
+
+    os.makedirs(os.path.join(out_dir, "tables"), exist_ok=True)
+
+    def replace(name, write, mode="wb"):
+        # Write beside and rename, so processes that have the old files mapped keep a valid copy
+        tmp_path = os.path.join(out_dir, f"{name}.{os.getpid()}.tmp")
+        with open(tmp_path, mode) as f:
+            write(f)
+        os.replace(tmp_path, os.path.join(out_dir, name))
+
+    def write_arrow(f, table):
+        with pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+
+    for name, table in tables.items():
+        replace(os.path.join("tables", name + ".arrow"), lambda f, table=table: write_arrow(f, table))
+    replace("genes.parquet", lambda f: genes.to_parquet(f, index=False))
+    keys_frame = pd.DataFrame({"key": np.asarray(key_index, dtype=object), "gene": key_genes})
+    replace("keys.parquet", lambda f: keys_frame.to_parquet(f, index=False))
+    for name, array in (("indptr.npy", indptr), ("tables.npy", table_code), ("rows.npy", row)):
+        replace(name, lambda f, array=array: np.save(f, array))
+
+    meta = {"genes": len(genes), "keys": len(keys_frame), "postings": len(row), "tables": table_meta}
+    # Written last: an index is only considered current once everything else is in place
+    replace("meta.json", lambda f: json.dump(meta, f, indent=2), mode="w")
+    print(
+        f"✓ Compiled gene index: {meta['genes']} genes, {len(tables)} tables, {meta['postings']} postings "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    return meta
+
+
+def _source_stat(path: str) -> dict:
+    stat = os.stat(path)
+    return {"source_size": stat.st_size, "source_mtime": stat.st_mtime}
+
+
+class GeneIndex:
+    """Gene profiles assembled from the compiled gene index."""
+
+    def __init__(self, store_dir: str):
+        """Open a compiled index.
+
+        Args:
+            store_dir: Directory written by `build_gene_index`
+
+        """
+        import pandas as pd
+
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.table_names = sorted(self.meta["tables"], key=lambda name: self.meta["tables"][name]["code"])
+        self.genes = pd.read_parquet(os.path.join(store_dir, "genes.parquet"))
+        keys = pd.read_parquet(os.path.join(store_dir, "keys.parquet"))
+        self._keys = pd.Index(keys["key"].to_numpy(dtype=object))
+        self._key_genes = keys["gene"].to_numpy(np.int64)
+        self.indptr = np.load(os.path.join(store_dir, "indptr.npy"), mmap_mode="r")
+        self.table_codes = np.load(os.path.join(store_dir, "tables.npy"), mmap_mode="r")
+        self.rows = np.load(os.path.join(store_dir, "rows.npy"), mmap_mode="r")
+        self._tables: dict[str, object] = {}
+
+    @classmethod
+    def open(cls, data_lake_dir: str, catalog=None) -> "GeneIndex":
+        """Open the gene index of a data lake, compiling it first if a gene table changed.
+
+        Only tables already in the local data lake are indexed; in lazy mode, download the tables you
+        want covered first.
+
+        Args:
+            data_lake_dir: Data lake directory
+            catalog: Optional `DataLakeCatalog` used to list the local files and prefer Parquet copies
+
+        Returns:
+            GeneIndex
+
+        """
+        store_dir = os.path.join(data_lake_dir, GENE_INDEX_DIR)
+        if catalog is not None:
+            local = catalog.local_names()
+        else:
+            local = sorted(os.listdir(data_lake_dir)) if os.path.isdir(data_lake_dir) else []
+        names = gene_tables(local)
+        if not names:
+            raise FileNotFoundError(f"No gene tables in {data_lake_dir}; expected files like {GENE_INFO_FILE}")
+
+        if not cls._is_current(store_dir, data_lake_dir, names):
+            from biomni.data_lake.catalog import single_flight
+
+            with single_flight(data_lake_dir, GENE_INDEX_DIR):
+                # Another process may have compiled it while we waited
+                if not cls._is_current(store_dir, data_lake_dir, names):
+                    paths = {}
+                    if catalog is not None:
+                        paths = {name: catalog.optimized_path(name) for name in names}
+                        paths = {name: path for name, path in paths.items() if path}
+                    build_gene_index(data_lake_dir, store_dir, names, paths)
+        return cls(store_dir)
+
+    @staticmethod
+    def _is_current(store_dir: str, data_lake_dir: str, names: list[str]) -> bool:
+        meta_path = os.path.join(store_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path) as f:
+            tables = json.load(f)["tables"]
+        if set(tables) != set(names):
+            return False
+        for name in names:
+            stat = _source_stat(os.path.join(data_lake_dir, name))
+            if (tables[name]["source_size"], tables[name]["source_mtime"]) != tuple(stat.values()):
+                return False
+        return True
+
+    def _batches(self, name: str):
+        """Return the memory-mapped record batches of a table and the first row of each."""
+        if name not in self._tables:
+            import pyarrow as pa
+
+            path = os.path.join(self.store_dir, "tables", name + ".arrow")
+            reader = pa.ipc.open_file(pa.memory_map(path, "r"))
+            batches = [reader.get_batch(i) for i in range(reader.num_record_batches)]
+            starts = np.cumsum([0] + [batch.num_rows for batch in batches])
+            self._tables[name] = (reader.schema, batches, starts)
+        return self._tables[name]
+
+    def resolve(self, genes) -> np.ndarray:
+        """Map symbols, aliases, previous symbols, Entrez ids or Ensembl ids to gene numbers.
+
+        Args:
+            genes: An identifier or a list of them; matching ignores case and Ensembl versions
+
+        Returns:
+            Array of gene numbers, -1 where an identifier is unknown
+
+        """
+        if isinstance(genes, str | int | np.integer):
+            genes = [genes]
+        position = self._keys.get_indexer([normalize_key(gene) for gene in genes])
+        return np.where(position >= 0, self._key_genes[position], -1)
+
+    def _postings(self, gene: int, tables=None) -> dict[str, np.ndarray]:
+        start, stop = self.indptr[gene], self.indptr[gene + 1]
+        codes = np.asarray(self.table_codes[start:stop])
+        rows = np.asarray(self.rows[start:stop])
+        wanted = None if tables is None else {tables} if isinstance(tables, str) else set(tables)
+        postings = {}
+        # Postings are sorted by table code, so each table is one contiguous run
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        for run_codes, run_rows in zip(np.split(codes, bounds), np.split(rows, bounds), strict=False):
+            if len(run_codes):
+                name = self.table_names[run_codes[0]]
+                if wanted is None or name in wanted:
+                    postings[name] = run_rows
+        return postings
+
+    def _rows(self, name: str, rows):
+        import pyarrow as pa
+
+        schema, batches, starts = self._batches(name)
+        # Take from each record batch separately; a take across all chunks of a big table is far slower
+        owner = np.searchsorted(starts, rows, side="right") - 1
+        taken = [batches[b].take(rows[owner == b] - starts[b]) for b in np.unique(owner)]
+        table = pa.Table.from_batches(taken, schema=schema)
+        # Drop gene-list columns (gene set members), which would repeat hundreds of symbols per row
+        return table.drop_columns(self.meta["tables"][name]["list_columns"]).to_pandas()
+
+    def gene_profile(self, gene, tables=None, max_rows: int | None = None) -> dict:
+        """Collect everything the data lake records about one gene.
+
+        Args:
+            gene: Symbol, alias, previous symbol, Entrez id or Ensembl id
+            tables: Data lake files to include; defaults to every indexed table
+            max_rows: Keep at most this many rows per table
+
+        Returns:
+            Dictionary with the gene's symbol, HGNC, Entrez and Ensembl ids, and under "tables" a DataFrame of
+            matching rows per data lake file
+
+        Raises:
+            KeyError: If the identifier is not in the index
+
+        """
+        number = int(self.resolve(gene)[0])
+        if number < 0:
+            raise KeyError(f"'{gene}' is not a known gene symbol, alias or identifier in the data lake")
+        record = self.genes.iloc[number]
+        profile = {
+            "query": gene,
+            "symbol": record["symbol"],
+            "hgnc_id": record["hgnc_id"],
+            "entrez": record["entrez"],
+            "ensembl": record["ensembl"],
+            "tables": {},
+        }
+        for name, rows in self._postings(number, tables).items():
+            profile["tables"][name] = self._rows(name, rows[:max_rows] if max_rows else rows)
+        return profile
+
+    def gene_rows(self, genes, table: str):
+        """Return the rows of one table that mention any of the given genes.
+
+        Args:
+            genes: Identifiers as accepted by `gene_profile`
+            table: Data lake file, e.g. "DisGeNET.parquet"
+
+        Returns:
+            pandas.DataFrame with a leading "gene" column holding the resolved symbol
+
+        """
+        import pandas as pd
+
+        if table not in self.meta["tables"]:
+            raise KeyError(f"'{table}' is not in the gene index; indexed tables: {', '.join(self.table_names)}")
+        frames = []
+        for number in np.unique(self.resolve(genes)):
+            if number < 0:
+                continue
+            rows = self._postings(int(number), table).get(table)
+            if rows is not None:
+                frame = self._rows(table, rows)
+                frame.insert(0, "gene", self.genes["symbol"].iat[number])
+                frames.append(frame)
+        if not frames:
+            frame = self._rows(table, np.empty(0, dtype=np.int64))
+            frame.insert(0, "gene", pd.Series(dtype=object))
+            return frame
+        return pd.concat(frames, ignore_index=True)
+
+
+class LazyGeneIndex:
+    """Opens (and if needed compiles) the gene index on first use, for injection into the REPL."""
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+        self._index = None
+
+    def _open(self) -> GeneIndex:
+        if self._index is None:
+            self._index = GeneIndex.open(self._catalog.data_lake_dir, self._catalog)
+        return self._index
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._open(), name)
+
+    def gene_profile(self, gene, tables=None, max_rows: int | None = None) -> dict:
+        """Collect everything the data lake records about one gene; see `GeneIndex.gene_profile`."""
+        return self._open().gene_profile(gene, tables, max_rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the gene-keyed data lake tables into the gene index")
+    parser.add_argument("--path", default="./data/biomni_data/data_lake", help="Data lake directory")
+    args = parser.parse_args(argv)
+    names = gene_tables(sorted(os.listdir(args.path)))
+    build_gene_index(args.path, os.path.join(args.path, GENE_INDEX_DIR), names)
+
+
+if __name__ == "__main__":
+    main()
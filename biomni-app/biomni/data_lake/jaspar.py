@@ -0,0 +1,241 @@
+"""Offline JASPAR motif store.
+
+Position frequency matrices are read from JASPAR-format files in the motif cache (``~/.cache/biomni/jaspar``,
+or ``BIOMNI_JASPAR_CACHE_DIR``): the CORE non-redundant bundle, downloaded once on first use, and any
+matrix the bundle lacks, fetched once from the JASPAR REST API and appended to ``fetched.jaspar``. Other
+JASPAR-format files (``*.jaspar``) dropped into the cache are loaded as well. Matrices are indexed by matrix
+ID (with or without version) and by TF name, so lookups stay local once the bundle is cached.
+
+    motifs = load_jaspar_motifs()
+    motifs.get("GATA1")       # JasparMatrix(matrix_id="MA0035.4", name="Gata1", counts=<length x ACGT array>)
+    jaspar_matrix("MA0035")   # the latest version, fetched from the REST API if not cached
+
+    python -m biomni.data_lake.jaspar
+"""
+
+import argparse
+import functools
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+
+JASPAR_CACHE_DIR = os.getenv("BIOMNI_JASPAR_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "biomni", "jaspar"
+)
+JASPAR_RELEASE = "2024"
+JASPAR_BUNDLE_URL = os.getenv("BIOMNI_JASPAR_BUNDLE_URL") or (
+    f"https://jaspar.genereg.net/download/data/{JASPAR_RELEASE}/CORE/"
+    f"JASPAR{JASPAR_RELEASE}_CORE_non-redundant_pfms_jaspar.txt"
+)
+JASPAR_API_URL = "https://jaspar.genereg.net/api/v1/matrix/"
+BUNDLE_FILE = "core.jaspar"
+FETCHED_FILE = "fetched.jaspar"
+
+# counts: float64 array of shape (length, 4), columns A, C, G, T
+JasparMatrix = namedtuple("JasparMatrix", ["matrix_id", "name", "counts"])
+
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+# JASPAR matrix IDs: a collection prefix and a 4-digit base ID, then an optional version
+_MATRIX_ID = re.compile(r"^((?:MA|PB|PF|PH|PL|CN|UN|CF|POL)\d{4})(?:\.(\d+))?$", re.IGNORECASE)
+
+
+def parse_jaspar(text: str) -> list[JasparMatrix]:
+    """Parse JASPAR-format count matrices (``>ID NAME`` then one row per base, with or without brackets)."""
+    matrices = []
+    for block in re.split(r"^>", text, flags=re.MULTILINE)[1:]:
+        header, *rows = block.strip().splitlines()
+        fields = header.split(None, 1)
+        rows = [row.strip() for row in rows if row.strip()]
+        if not fields or len(rows) != 4:
+            continue
+        counts = {}
+        for default, row in zip("ACGT", rows, strict=True):
+            base = row[0].upper() if row[0].upper() in "ACGT" else default
+            counts[base] = [float(value) for value in _NUMBER.findall(row[1:] if base == row[0].upper() else row)]
+        columns = {len(values) for values in counts.values()}
+        if len(counts) != 4 or len(columns) != 1 or 0 in columns:
+            continue
+        matrix_id = fields[0]
+        name = fields[1].strip() if len(fields) > 1 else matrix_id
+        matrices.append(JasparMatrix(matrix_id, name, np.array([counts[base] for base in "ACGT"]).T))
+    return matrices
+
+
+def format_jaspar(matrix: JasparMatrix) -> str:
+    """Format a matrix the way `parse_jaspar` reads it."""
+    rows = [f">{matrix.matrix_id}\t{matrix.name}"]
+    for base, values in zip("ACGT", matrix.counts.T, strict=True):
+        rows.append(f"{base}  [ " + " ".join(f"{value:g}" for value in values) + " ]")
+    return "\n".join(rows) + "\n"
+
+
+class JasparMotifs:
+    """JASPAR count matrices indexed by matrix ID and TF name (case-insensitive)."""
+
+    def __init__(self, matrices: list[JasparMatrix]):
+        """Index the matrices; when a name or ID appears more than once, the first matrix wins.
+
+        Args:
+            matrices: Count matrices, e.g. from `parse_jaspar`
+
+        """
+        self.matrices = list(matrices)
+        self._keys: dict[str, int] = {}
+        latest: dict[str, tuple[int, int]] = {}
+        for i, matrix in enumerate(self.matrices):
+            self._keys.setdefault(matrix.matrix_id.upper(), i)
+            match = _MATRIX_ID.match(matrix.matrix_id)
+            if match:
+                version = int(match.group(2) or 0)
+                base_id = match.group(1).upper()
+                if base_id not in latest or version > latest[base_id][0]:
+                    latest[base_id] = (version, i)
+        for base_id, (_, i) in latest.items():
+            self._keys.setdefault(base_id, i)
+        for i, matrix in enumerate(self.matrices):
+            self._keys.setdefault(matrix.name.upper(), i)
+
+    def __len__(self) -> int:
+        return len(self.matrices)
+
+    def __contains__(self, key) -> bool:
+        return str(key).strip().upper() in self._keys
+
+    def get(self, key: str) -> JasparMatrix | None:
+        """Return the matrix of a matrix ID (an unversioned ID gives the latest version) or TF name, or None."""
+        i = self._keys.get(str(key).strip().upper())
+        return self.matrices[i] if i is not None else None
+
+
+def _jaspar_files(cache_dir: str) -> list[str]:
+    if not os.path.isdir(cache_dir):
+        return []
+    # The bundle first, so its matrices win over fetched and added ones
+    names = sorted((name for name in os.listdir(cache_dir) if name.endswith(".jaspar")), key=lambda n: n != BUNDLE_FILE)
+    return [os.path.join(cache_dir, name) for name in names]
+
+
+def download_jaspar_bundle(cache_dir: str = JASPAR_CACHE_DIR, url: str = JASPAR_BUNDLE_URL) -> int:
+    """Download the JASPAR CORE bundle into the motif cache.
+
+    Args:
+        cache_dir: Motif cache directory
+        url: URL of a JASPAR-format bundle
+
+    Returns:
+        Number of matrices in the bundle
+
+    """
+    import requests
+
+    from biomni.data_lake.catalog import single_flight
+
+    response = requests.get(url, timeout=120)
+    response.raise_for_status()
+    count = len(parse_jaspar(response.text))
+    if not count:
+        raise ValueError(f"No JASPAR matrices found at {url}")
+    os.makedirs(cache_dir, exist_ok=True)
+    with single_flight(cache_dir, BUNDLE_FILE):
+        tmp_path = os.path.join(cache_dir, f".{BUNDLE_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(response.text)
+        os.replace(tmp_path, os.path.join(cache_dir, BUNDLE_FILE))
+    print(f"✓ Downloaded {count} JASPAR matrices to {cache_dir}")
+    return count
+
+
+@functools.lru_cache(maxsize=4)
+def _load_jaspar_motifs_cached(sources):
+    matrices = []
+    for path, _ in sources:
+        with open(path) as f:
+            matrices += parse_jaspar(f.read())
+    return JasparMotifs(matrices)
+
+
+def load_jaspar_motifs(cache_dir: str = JASPAR_CACHE_DIR, fetch: bool = True) -> JasparMotifs:
+    """Return the cached JASPAR matrices, parsed once per process (and again when a cache file changes).
+
+    Args:
+        cache_dir: Motif cache directory
+        fetch: Download the CORE bundle if it is not cached yet
+
+    Returns:
+        JasparMotifs
+
+    """
+    cache_dir = os.path.abspath(cache_dir)
+    if fetch and not os.path.exists(os.path.join(cache_dir, BUNDLE_FILE)):
+        download_jaspar_bundle(cache_dir)
+    sources = tuple((path, os.path.getmtime(path)) for path in _jaspar_files(cache_dir))
+    return _load_jaspar_motifs_cached(sources)
+
+
+def _fetch_jaspar_matrix(key: str, cache_dir: str) -> JasparMatrix | None:
+    """Fetch a matrix by ID or TF name from the JASPAR REST API and append it to the cache."""
+    import requests
+
+    from biomni.data_lake.catalog import single_flight
+
+    match = _MATRIX_ID.match(key)
+    if match and match.group(2):
+        matrix_id = key.upper()
+    else:
+        # An unversioned ID gives its latest version, a TF name its first match
+        url = f"{JASPAR_API_URL}{match.group(1).upper()}/versions/" if match else JASPAR_API_URL
+        params = {"format": "json"} if match else {"name": key, "format": "json"}
+        response = requests.get(url, params=params, timeout=30)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        results = response.json().get("results") or []
+        if not results:
+            return None
+        if match:
+            results = sorted(results, key=lambda result: int(result["matrix_id"].rsplit(".", 1)[-1]), reverse=True)
+        matrix_id = results[0]["matrix_id"]
+    response = requests.get(f"{JASPAR_API_URL}{matrix_id}/", params={"format": "json"}, timeout=30)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    data = response.json()
+    counts = np.array([data["pfm"][base] for base in "ACGT"], dtype=np.float64).T
+    matrix = JasparMatrix(data["matrix_id"], data.get("name") or data["matrix_id"], counts)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with single_flight(cache_dir, FETCHED_FILE), open(os.path.join(cache_dir, FETCHED_FILE), "a") as f:
+        f.write(format_jaspar(matrix))
+    return matrix
+
+
+def jaspar_matrix(key: str, cache_dir: str = JASPAR_CACHE_DIR, fetch: bool = True) -> JasparMatrix | None:
+    """Look up a JASPAR matrix by matrix ID or TF name in the motif cache, fetching it once if it is missing.
+
+    Args:
+        key: Matrix ID (e.g. "MA0035.4", or "MA0035" for the latest version) or TF name (e.g. "GATA1")
+        cache_dir: Motif cache directory
+        fetch: Download the bundle and query the JASPAR REST API when the matrix is not cached
+
+    Returns:
+        JasparMatrix, or None if JASPAR has no such matrix
+
+    """
+    matrix = load_jaspar_motifs(cache_dir, fetch).get(key)
+    if matrix is None and fetch:
+        matrix = _fetch_jaspar_matrix(str(key).strip(), os.path.abspath(cache_dir))
+    return matrix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download the JASPAR CORE bundle into the motif cache")
+    parser.add_argument("--cache-dir", default=JASPAR_CACHE_DIR, help="Motif cache directory")
+    parser.add_argument("--url", default=JASPAR_BUNDLE_URL, help="URL of a JASPAR-format bundle")
+    args = parser.parse_args(argv)
+    download_jaspar_bundle(args.cache_dir, args.url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""Compiled store for the ``kg.csv`` precision-medicine knowledge graph.
+
+The CSV is compiled once into ``<data_lake>/.kg/``:
+
+- ``nodes.parquet``: the integer node dictionary (type, id, name, source per node)
+- ``indptr.npy`` / ``indices.npy`` / ``relations.npy``: CSR adjacency, with each node's edges sorted
+  by relation code and then by target
+- ``meta.json``: relation names and the size and mtime of the source file
+
+The arrays are memory-mapped, so opening the graph is instant and processes on one host share the
+pages. Neighbour, k-hop, meta-path and shortest-path queries run as vectorized frontier expansions
+over the CSR arrays instead of pandas filters over millions of rows.
+
+    python -m biomni.data_lake.knowledge_graph --path ./data/biomni_data/data_lake
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+KG_FILE = "kg.csv"
+KG_DIR = ".kg"
+
+
+def _expand(indptr, frontier):
+    """Return (position in frontier, edge index) for every edge leaving the frontier nodes."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    owner = np.repeat(np.arange(len(frontier)), counts)
+    # Offset of each edge within its node's slice, added to that slice's start
+    edge = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+    return owner, edge
+
+
+def _source_stat(path: str) -> dict:
+    stat = os.stat(path)
+    return {"source_size": stat.st_size, "source_mtime": stat.st_mtime}
+
+
+def build_knowledge_graph(source: str, out_dir: str, symmetrize: bool = False, stat_source: str | None = None) -> dict:
+    """Compile a knowledge graph edge list into the memory-mapped CSR store.
+
+    Args:
+        source: Edge list in the kg.csv layout (relation, x_*, y_* columns), as CSV or Parquet
+        out_dir: Directory to write the store into
+        symmetrize: Also add the reverse of every edge; kg.csv already lists both directions
+        stat_source: File whose size and mtime mark the store as current; defaults to ``source``
+
+    Returns:
+        The store's metadata
+
+    """
+    import pandas as pd
+
+    start = time.perf_counter()
+    side_columns = ["id", "type", "name", "source"]
+    columns = ["relation"] + [f"{side}_{c}" for side in ("x", "y") for c in side_columns]
+    if source.endswith(".parquet"):
+        edges = pd.read_parquet(source, columns=columns)
+    else:
+        edges = pd.read_csv(source, usecols=columns, dtype=str, low_memory=False)
+
+    # Integer node dictionary keyed on (type, id); names are not unique across types
+    x_keys = edges["x_type"].astype(str) + "\x1f" + edges["x_id"].astype(str)
+    y_keys = edges["y_type"].astype(str) + "\x1f" + edges["y_id"].astype(str)
+    codes, uniques = pd.factorize(pd.concat([x_keys, y_keys], ignore_index=True))
+    src = codes[: len(edges)].astype(np.int64)
+    dst = codes[len(edges) :].astype(np.int64)
+    rel_codes, relation_names = pd.factorize(edges["relation"])
+    rel = rel_codes.astype(np.int32)
+
+    first = np.unique(np.concatenate([src, dst]), return_index=True)[1]
+    both = pd.concat(
+        [
+            edges[[f"x_{c}" for c in side_columns]].set_axis(side_columns, axis=1),
+            edges[[f"y_{c}" for c in side_columns]].set_axis(side_columns, axis=1),
+        ],
+        ignore_index=True,
+    )
+    nodes = both.iloc[first].reset_index(drop=True)
+    nodes.insert(0, "node", np.arange(len(uniques)))
+
+    if symmetrize:
+        src, dst, rel = np.concatenate([src, dst]), np.concatenate([dst, src]), np.concatenate([rel, rel])
+
+    order = np.lexsort((dst, rel, src))
+    src, dst, rel = src[order], dst[order], rel[order]
+    indptr = np.zeros(len(uniques) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=len(uniques)), out=indptr[1:])
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    def replace(name, write, mode="wb"):
+        # Write beside and rename, so processes that have the old arrays mapped keep a valid file
+        tmp_path = os.path.join(out_dir, f".{name}.{os.getpid()}.tmp")
+        with open(tmp_path, mode) as f:
+            write(f)
+        os.replace(tmp_path, os.path.join(out_dir, name))
+
+    replace("nodes.parquet", lambda f: nodes.to_parquet(f, index=False))
+    for name, array in (
+        ("indptr.npy", indptr),
+        ("indices.npy", dst.astype(np.int32)),
+        ("relations.npy", rel.astype(np.int16 if len(relation_names) < 2**15 else np.int32)),
+    ):
+        replace(name, lambda f, array=array: np.save(f, array))
+
+    meta = {
+        "relations": [str(name) for name in relation_names],
+        "nodes": len(uniques),
+        "edges": len(dst),
+        **_source_stat(stat_source or source),
+    }
+    # Written last: a store is only considered current once all arrays are in place
+    replace("meta.json", lambda f: json.dump(meta, f, indent=2), mode="w")
+    print(
+        f"✓ Compiled knowledge graph: {meta['nodes']} nodes, {meta['edges']} edges in {time.perf_counter() - start:.1f}s"
+    )
+    return meta
+
+
+class KnowledgeGraph:
+    """Read-only queries over the compiled knowledge graph."""
+
+    def __init__(self, store_dir: str):
+        """Open a compiled store.
+
+        Args:
+            store_dir: Directory written by `build_knowledge_graph`
+
+        """
+        import pandas as pd
+
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.relation_names = self.meta["relations"]
+        self._relation_codes = {name: code for code, name in enumerate(self.relation_names)}
+        self.indptr = np.load(os.path.join(store_dir, "indptr.npy"), mmap_mode="r")
+        self.indices = np.load(os.path.join(store_dir, "indices.npy"), mmap_mode="r")
+        self.relations = np.load(os.path.join(store_dir, "relations.npy"), mmap_mode="r")
+        self.nodes = pd.read_parquet(os.path.join(store_dir, "nodes.parquet"))
+        self._types = self.nodes["type"].to_numpy()
+        self._by_name: dict[str, list[int]] | None = None
+        self._by_id: dict[str, list[int]] | None = None
+
+    @classmethod
+    def open(cls, data_lake_dir: str, catalog=None) -> "KnowledgeGraph":
+        """Open the graph of a data lake, compiling it from kg.csv first if needed.
+
+        Args:
+            data_lake_dir: Data lake directory
+            catalog: Optional `DataLakeCatalog` used to fetch kg.csv and prefer its Parquet copy
+
+        Returns:
+            KnowledgeGraph
+
+        """
+        store_dir = os.path.join(data_lake_dir, KG_DIR)
+        if catalog is not None:
+            source = catalog.path(KG_FILE)
+            optimized = catalog.optimized_path(KG_FILE)
+        else:
+            source, optimized = os.path.join(data_lake_dir, KG_FILE), None
+
+        if not cls._is_current(store_dir, source):
+            from biomni.data_lake.catalog import single_flight
+
+            with single_flight(data_lake_dir, KG_DIR):
+                # Another process may have compiled it while we waited
+                if not cls._is_current(store_dir, source):
+                    build_knowledge_graph(optimized or source, store_dir, stat_source=source)
+        return cls(store_dir)
+
+    @staticmethod
+    def _is_current(store_dir: str, source: str) -> bool:
+        meta_path = os.path.join(store_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path) as f:
+            meta = json.load(f)
+        stat = _source_stat(source)
+        return meta.get("source_size") == stat["source_size"] and meta.get("source_mtime") == stat["source_mtime"]
+
+    def _index(self):
+        if self._by_name is None:
+            by_name: dict[str, list[int]] = {}
+            by_id: dict[str, list[int]] = {}
+            for node, name, node_id in zip(self.nodes["node"], self.nodes["name"], self.nodes["id"], strict=False):
+                by_name.setdefault(str(name).lower(), []).append(int(node))
+                by_id.setdefault(str(node_id), []).append(int(node))
+            self._by_name, self._by_id = by_name, by_id
+
+    def resolve(self, nodes, node_type: str | None = None) -> np.ndarray:
+        """Map node names, source ids or integer node ids to integer node ids.
+
+        Args:
+            nodes: A name/id or a list of them; names are matched case-insensitively
+            node_type: Keep only nodes of this type, e.g. "gene/protein" or "disease"
+
+        Returns:
+            Array of integer node ids (unknown names are dropped)
+
+        """
+        if isinstance(nodes, str | int | np.integer):
+            nodes = [nodes]
+        self._index()
+        found = []
+        for node in nodes:
+            if isinstance(node, int | np.integer):
+                found.append(int(node))
+            else:
+                found.extend(self._by_name.get(str(node).lower(), []) or self._by_id.get(str(node), []))
+        ids = np.unique(np.asarray(found, dtype=np.int64))
+        if node_type is not None:
+            ids = ids[self._types[ids] == node_type]
+        return ids
+
+    def _relation_mask(self, edge, relations):
+        if relations is None:
+            return np.ones(len(edge), dtype=bool)
+        if isinstance(relations, str):
+            relations = [relations]
+        codes = [self._relation_codes[r] for r in relations if r in self._relation_codes]
+        return np.isin(self.relations[edge], codes)
+
+    def _frame(self, ids, **columns):
+        import pandas as pd
+
+        frame = self.nodes.iloc[ids][["node", "name", "type", "id"]].reset_index(drop=True)
+        for name, values in columns.items():
+            frame[name] = values
+        return frame if len(frame) else pd.DataFrame(columns=["node", "name", "type", "id", *columns])
+
+    def neighbors(self, node, relations=None, node_type: str | None = None):
+        """Return the direct neighbours of one or more nodes.
+
+        Args:
+            node: Node name, id, or list of them
+            relations: Relation name or list to follow; defaults to all
+            node_type: Keep only neighbours of this type
+
+        Returns:
+            pandas.DataFrame with the neighbour nodes and the relation of each edge
+
+        """
+        frontier = self.resolve(node)
+        owner, edge = _expand(self.indptr, frontier)
+        keep = self._relation_mask(edge, relations)
+        owner, edge = owner[keep], edge[keep]
+        targets = np.asarray(self.indices[edge], dtype=np.int64)
+        if node_type is not None:
+            keep = self._types[targets] == node_type
+            owner, edge, targets = owner[keep], edge[keep], targets[keep]
+        names = self.nodes["name"].to_numpy()
+        return self._frame(
+            targets,
+            relation=[self.relation_names[r] for r in self.relations[edge]],
+            neighbor_of=names[frontier[owner]],
+        )
+
+    def k_hop(self, nodes, k: int = 2, relations=None, node_types=None, max_nodes: int | None = None):
+        """Expand a node set k hops out.
+
+        Args:
+            nodes: Seed node names or ids
+            k: Number of hops
+            relations: Relation names to follow; defaults to all
+            node_types: Node types allowed along the way; defaults to all
+            max_nodes: Stop expanding once this many nodes have been reached
+
+        Returns:
+            pandas.DataFrame of the reached nodes with their hop distance from the seeds
+
+        """
+        seeds = self.resolve(nodes)
+        distance = np.full(len(self.nodes), -1, dtype=np.int16)
+        distance[seeds] = 0
+        frontier = seeds
+        allowed_types = None if node_types is None else np.isin(self._types, list(node_types))
+        for hop in range(1, k + 1):
+            _, edge = _expand(self.indptr, frontier)
+            edge = edge[self._relation_mask(edge, relations)]
+            reached = np.unique(np.asarray(self.indices[edge], dtype=np.int64))
+            reached = reached[distance[reached] < 0]
+            if allowed_types is not None:
+                reached = reached[allowed_types[reached]]
+            if len(reached) == 0:
+                break
+            distance[reached] = hop
+            frontier = reached
+            if max_nodes is not None and int((distance >= 0).sum()) >= max_nodes:
+                break
+        ids = np.flatnonzero(distance >= 0)
+        return self._frame(ids, hops=distance[ids]).sort_values(["hops", "name"], ignore_index=True)
+
+    def meta_path(self, start, path: list[str], top_k: int | None = None):
+        """Follow a typed meta-path and count the walks reaching each end node.
+
+        Args:
+            start: Start node names or ids
+            path: Relation names to follow in order, e.g. ["disease_protein", "protein_protein"]
+            top_k: Return only the end nodes reached by the most walks
+
+        Returns:
+            pandas.DataFrame of end nodes with the number of distinct walks reaching them
+
+        """
+        frontier = self.resolve(start)
+        counts = np.ones(len(frontier), dtype=np.int64)
+        for relation in path:
+            owner, edge = _expand(self.indptr, frontier)
+            keep = self._relation_mask(edge, relation)
+            targets = np.asarray(self.indices[edge[keep]], dtype=np.int64)
+            weights = counts[owner[keep]]
+            if len(targets) == 0:
+                return self._frame(np.empty(0, dtype=np.int64), walks=[])
+            frontier, inverse = np.unique(targets, return_inverse=True)
+            counts = np.bincount(inverse, weights=weights).astype(np.int64)
+        order = np.argsort(-counts, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        return self._frame(frontier[order], walks=counts[order])
+
+    def shortest_paths(self, sources, targets, max_depth: int = 4, relations=None):
+        """Find a shortest path from a node set (e.g. patient phenotypes) to each candidate node.
+
+        Args:
+            sources: Source node names or ids, e.g. HPO phenotype names
+            targets: Candidate node names or ids, e.g. genes
+            max_depth: Longest path to search
+            relations: Relation names to follow; defaults to all
+
+        Returns:
+            pandas.DataFrame with one row per reachable target: its distance and the path of node names
+
+        """
+        import pandas as pd
+
+        sources = self.resolve(sources)
+        targets = self.resolve(targets)
+        parent = np.full(len(self.nodes), -1, dtype=np.int64)
+        distance = np.full(len(self.nodes), -1, dtype=np.int16)
+        distance[sources] = 0
+        frontier = sources
+        remaining = set(targets.tolist()) - set(sources.tolist())
+        for depth in range(1, max_depth + 1):
+            if not remaining or len(frontier) == 0:
+                break
+            owner, edge = _expand(self.indptr, frontier)
+            keep = self._relation_mask(edge, relations)
+            reached = np.asarray(self.indices[edge[keep]], dtype=np.int64)
+            via = frontier[owner[keep]]
+            new = distance[reached] < 0
+            reached, via = reached[new], via[new]
+            reached, first = np.unique(reached, return_index=True)
+            distance[reached] = depth
+            parent[reached] = via[first]
+            frontier = reached
+            remaining -= set(reached.tolist())
+
+        names = self.nodes["name"].to_numpy()
+        rows = []
+        for target in targets:
+            if distance[target] < 0:
+                continue
+            path = [int(target)]
+            while parent[path[-1]] >= 0:
+                path.append(int(parent[path[-1]]))
+            path.reverse()
+            rows.append(
+                {
+                    "target": names[target],
+                    "distance": int(distance[target]),
+                    "source": names[path[0]],
+                    "path": [names[n] for n in path],
+                }
+            )
+        return pd.DataFrame(rows, columns=["target", "distance", "source", "path"]).sort_values(
+            "distance", ignore_index=True
+        )
+
+
+class LazyKnowledgeGraph:
+    """Opens (and if needed compiles) the knowledge graph on first use, for injection into the REPL."""
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+        self._graph = None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._graph is None:
+            self._graph = KnowledgeGraph.open(self._catalog.data_lake_dir, self._catalog)
+        return getattr(self._graph, name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile kg.csv into the memory-mapped knowledge graph store")
+    parser.add_argument("--path", default="./data/biomni_data/data_lake", help="Data lake directory")
+    parser.add_argument("--symmetrize", action="store_true", help="Add the reverse of every edge")
+    args = parser.parse_args(argv)
+    build_knowledge_graph(os.path.join(args.path, KG_FILE), os.path.join(args.path, KG_DIR), args.symmetrize)
+
+
+if __name__ == "__main__":
+    main()
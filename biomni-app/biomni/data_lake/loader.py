@@ -0,0 +1,230 @@
+"""Session-level loading of data lake files into pandas with an LRU cache.
+
+Agent code tends to re-read the same file in every ``<execute>`` step. `DataLakeLoader` parses each
+file once per session and keeps the frames in a least-recently-used cache bounded by a memory budget.
+Column and row selections are pushed into the Parquet reader, and a request that a cached full frame
+can answer is served from it without touching the file.
+"""
+
+import difflib
+import os
+import threading
+from collections import OrderedDict
+
+from biomni.data_lake.catalog import DataLakeCatalog
+from biomni.data_lake.query import table_name, tabular_format
+from biomni.data_lake.shared_cache import SharedTableCache, pandas_copy_on_write
+
+DEFAULT_BUDGET_BYTES = 4 << 30
+
+_OPERATORS = {
+    "==": lambda column, value: column == value,
+    "=": lambda column, value: column == value,
+    "!=": lambda column, value: column != value,
+    "<": lambda column, value: column < value,
+    "<=": lambda column, value: column <= value,
+    ">": lambda column, value: column > value,
+    ">=": lambda column, value: column >= value,
+    "in": lambda column, value: column.isin(value),
+    "not in": lambda column, value: ~column.isin(value),
+}
+
+
+def _normalize_filters(filters) -> list[list[tuple]] | None:
+    """Return filters in disjunctive normal form: a list of AND-groups that are OR-ed together."""
+    if not filters:
+        return None
+    if isinstance(filters[0], tuple):
+        filters = [filters]
+    groups = []
+    for group in filters:
+        normalized = []
+        for column, op, value in group:
+            if op not in _OPERATORS:
+                raise ValueError(f"Unsupported filter operator '{op}'; use one of {', '.join(_OPERATORS)}")
+            if op in ("in", "not in"):
+                value = list(value)
+            normalized.append((column, op, value))
+        groups.append(normalized)
+    return groups
+
+
+def apply_filters(df, filters):
+    """Filter a DataFrame with pyarrow-style filters, e.g. ``[("gene", "in", ["TP53"]), ("score", ">", 0.5)]``."""
+    groups = _normalize_filters(filters)
+    if groups is None:
+        return df
+    mask = None
+    for group in groups:
+        group_mask = None
+        for column, op, value in group:
+            condition = _OPERATORS[op](df[column], value)
+            group_mask = condition if group_mask is None else group_mask & condition
+        mask = group_mask if mask is None else mask | group_mask
+    return df[mask]
+
+
+def _frame_bytes(df) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+class DataLakeLoader:
+    """Load data lake files as DataFrames, parsing each file at most once per session."""
+
+    def __init__(
+        self,
+        catalog: DataLakeCatalog,
+        budget_bytes: int | None = None,
+        shared_tables: SharedTableCache | None = None,
+    ):
+        """Initialize the loader.
+
+        Args:
+            catalog: Data lake catalogue used to resolve and fetch files
+            budget_bytes: Memory budget of the cache; defaults to BIOMNI_SESSION_CACHE_BYTES or 4 GiB
+            shared_tables: Host-wide table cache; tables already in it are attached instead of parsed
+
+        """
+        self.catalog = catalog
+        self.budget_bytes = budget_bytes or int(os.getenv("BIOMNI_SESSION_CACHE_BYTES", DEFAULT_BUDGET_BYTES))
+        self.shared_tables = shared_tables
+        self._frames: OrderedDict[tuple, tuple] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, name: str) -> str:
+        """Resolve a file name, table name or case-insensitive variant to a data lake file name.
+
+        Raises:
+            KeyError: If nothing matches, with the closest names as suggestions
+
+        """
+        names = list(dict.fromkeys(self.catalog.names() + self.catalog.local_names()))
+        if name in names:
+            return name
+        lowered = name.lower()
+        for candidate in names:
+            if candidate.lower() == lowered or (table_name(candidate) or "").lower() == lowered:
+                return candidate
+        suggestions = difflib.get_close_matches(name, names, n=3)
+        hint = f" Did you mean {', '.join(suggestions)}?" if suggestions else ""
+        raise KeyError(f"'{name}' is not in the data lake.{hint}")
+
+    def __call__(self, name: str, columns: list[str] | None = None, filters=None):
+        """Load a data lake file as a pandas DataFrame.
+
+        Args:
+            name: Data lake file name, e.g. "DisGeNET.parquet" (the extension may be omitted)
+            columns: Columns to load; defaults to all
+            filters: Row filters as ``(column, op, value)`` tuples that are AND-ed, or a list of such lists
+                that are OR-ed. Supported ops: ==, !=, <, <=, >, >=, in, not in
+
+        Returns:
+            pandas.DataFrame. Each call returns a copy, so edits never reach the session cache.
+
+        """
+        name = self.resolve(name)
+        columns = list(columns) if columns else None
+        key = (name, tuple(columns) if columns else None, repr(_normalize_filters(filters)))
+
+        with self._lock:
+            cached = self._lookup(key, name, columns, filters)
+        if cached is not None:
+            return cached
+
+        df = self._read(name, columns, filters)
+        with self._lock:
+            self.misses += 1
+            self._store(key, df)
+        return self._hand_out(df)
+
+    def _lookup(self, key, name, columns, filters):
+        if key in self._frames:
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return self._hand_out(self._frames[key][0])
+        full_key = (name, None, repr(None))
+        if full_key in self._frames:
+            # Answer a narrower request from the cached full frame
+            self._frames.move_to_end(full_key)
+            self.hits += 1
+            df = apply_filters(self._frames[full_key][0], filters)
+            return self._hand_out(df[columns] if columns else df)
+        return None
+
+    def _read(self, name: str, columns, filters):
+        import pandas as pd
+
+        if self.shared_tables is not None and name in self.shared_tables:
+            df = apply_filters(self.shared_tables.to_pandas(self.shared_tables.get(name)), filters)
+            return df[columns] if columns else df
+
+        optimized = self.catalog.optimized_path(name)
+        path = self.catalog.path(name)
+        if optimized:
+            file_format = "parquet"
+        elif table_name(name):
+            file_format = tabular_format(name)
+        else:
+            raise ValueError(f"'{name}' is not a table; use data_lake.path('{name}') to read it directly")
+
+        if file_format == "parquet":
+            # pyarrow skips row groups whose min/max statistics rule the filters out
+            return pd.read_parquet(optimized or path, columns=columns, filters=filters)
+        if file_format == "pickle":
+            df = pd.read_pickle(path)
+            if not isinstance(df, pd.DataFrame):
+                # e.g. the TxGNN pickles hold nested dicts
+                raise ValueError(
+                    f"'{name}' holds a {type(df).__name__}, not a table; use data_lake.path('{name}') to read it directly"
+                )
+        else:
+            # Parse only the requested columns plus the ones the filters need
+            usecols = None
+            if columns:
+                groups = _normalize_filters(filters) or []
+                usecols = list(dict.fromkeys(columns + [column for group in groups for column, _, _ in group]))
+            if name.endswith(".txt"):
+                df = pd.read_csv(path, sep=None, engine="python", usecols=usecols)
+            else:
+                df = pd.read_csv(path, sep="\t" if file_format == "tsv" else ",", usecols=usecols)
+        df = apply_filters(df, filters)
+        return df[columns] if columns else df
+
+    def _store(self, key, df):
+        size = _frame_bytes(df)
+        if size > self.budget_bytes:
+            return
+        if key in self._frames:
+            self._bytes -= self._frames.pop(key)[1]
+        self._frames[key] = (df, size)
+        self._bytes += size
+        while self._bytes > self.budget_bytes:
+            _, (_, evicted_size) = self._frames.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def _hand_out(self, df):
+        # With copy-on-write a shallow copy is enough to keep edits from reaching the cache
+        return df.copy(deep=not pandas_copy_on_write())
+
+    def cache_info(self) -> dict:
+        """Report the cached frames, their memory use and the hit/miss counts."""
+        with self._lock:
+            entries = [
+                {"name": key[0], "columns": key[1], "filters": key[2], "bytes": size}
+                for key, (_, size) in self._frames.items()
+            ]
+            return {
+                "entries": entries,
+                "bytes": self._bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
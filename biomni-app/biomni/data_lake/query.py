@@ -0,0 +1,198 @@
+"""SQL over the data lake with DuckDB.
+
+Every tabular file in the catalogue (parquet, csv, tsv, and their gzipped variants, plus pickles that
+have been converted to Parquet) is exposed as a view named after the file without its extension, e.g.
+``DisGeNET.parquet`` becomes ``DisGeNET``. DuckDB scans the files in place and pushes filters and
+column selections into the scan, so a gene lookup reads a few row groups instead of loading the whole
+table into pandas.
+
+    query_data_lake("SELECT * FROM gene_info WHERE symbol = ?", ["TP53"])
+
+Views are registered the first time a query names them, which in lazy mode is also when the file is
+downloaded.
+"""
+
+import os
+import re
+import threading
+
+from biomni.data_lake.catalog import DataLakeCatalog
+
+TABULAR_SUFFIXES = {
+    ".parquet": "parquet",
+    ".csv": "csv",
+    ".csv.gz": "csv",
+    ".tsv": "tsv",
+    ".tsv.gz": "tsv",
+    ".txt": "csv",
+    # Queryable only through the Parquet copy written by biomni.data_lake.convert
+    ".pkl": "pickle",
+}
+
+
+def table_name(file_name: str) -> str | None:
+    """Return the SQL table name of a data lake file, or None if the file is not tabular."""
+    for suffix in sorted(TABULAR_SUFFIXES, key=len, reverse=True):
+        if file_name.endswith(suffix):
+            name = re.sub(r"\W", "_", file_name[: -len(suffix)])
+            return f"t_{name}" if name[:1].isdigit() else name
+    return None
+
+
+def tabular_format(file_name: str) -> str:
+    """Return the reader format of a data lake file: parquet, csv, tsv or pickle."""
+    for suffix in sorted(TABULAR_SUFFIXES, key=len, reverse=True):
+        if file_name.endswith(suffix):
+            return TABULAR_SUFFIXES[suffix]
+    raise ValueError(f"'{file_name}' is not a tabular data lake file")
+
+
+def quote_literal(value: str) -> str:
+    """Quote a string as a SQL literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def scan_expression(path: str, file_name: str) -> str:
+    """Return the DuckDB table function that scans a data lake file.
+
+    Args:
+        path: Local path of the file
+        file_name: Data lake file name, used to pick the reader
+
+    Returns:
+        SQL expression usable in a FROM clause
+
+    """
+    file_format = tabular_format(file_name)
+    if file_format == "pickle":
+        raise ValueError(f"'{file_name}' must be converted to Parquet before it can be queried")
+    if file_format == "parquet":
+        return f"read_parquet({quote_literal(path)})"
+    if file_format == "tsv":
+        return f"read_csv({quote_literal(path)}, delim='\\t', header=true)"
+    return f"read_csv_auto({quote_literal(path)})"
+
+
+class DataLakeQuery:
+    """DuckDB views over the data lake files."""
+
+    def __init__(self, catalog: DataLakeCatalog, memory_limit: str | None = None, threads: int | None = None):
+        """Initialize the query engine. The DuckDB connection is opened on the first query.
+
+        Args:
+            catalog: Data lake catalogue used to locate (and in lazy mode download) files
+            memory_limit: DuckDB memory limit, e.g. "2GB"; defaults to BIOMNI_DUCKDB_MEMORY_LIMIT
+            threads: DuckDB worker threads; defaults to DuckDB's own choice
+
+        """
+        self.catalog = catalog
+        self.memory_limit = memory_limit or os.getenv("BIOMNI_DUCKDB_MEMORY_LIMIT")
+        self.threads = threads
+        self._con = None
+        self._registered: set[str] = set()
+        self._lock = threading.Lock()
+
+    def tables(self) -> dict[str, str]:
+        """Map every queryable table name to its data lake file."""
+        names = set(self.catalog.names()) | set(self.catalog.local_names())
+        tables = {}
+        for file_name in sorted(names):
+            name = table_name(file_name)
+            if name is None:
+                continue
+            if tabular_format(file_name) == "pickle" and not self.catalog.optimized_path(file_name):
+                continue
+            tables[name] = file_name
+        return tables
+
+    def _connection(self):
+        # Opened lazily so a pre-fork master never hands a live DuckDB connection to its workers
+        if self._con is None:
+            import duckdb
+
+            config = {}
+            if self.memory_limit:
+                config["memory_limit"] = self.memory_limit
+            if self.threads:
+                config["threads"] = self.threads
+            self._con = duckdb.connect(database=":memory:", config=config)
+        return self._con
+
+    def _source(self, file_name: str) -> str:
+        """Return the FROM expression of a data lake file, downloading it first in lazy mode."""
+        path = self.catalog.path(file_name)
+        # Prefer the sorted Parquet copy from biomni.data_lake.convert when it is up to date
+        optimized = self.catalog.optimized_path(file_name)
+        return f"read_parquet({quote_literal(optimized)})" if optimized else scan_expression(path, file_name)
+
+    def _register_referenced(self, query: str):
+        """Register a view for every table the query mentions."""
+        tables = self.tables()
+        words = set(re.findall(r"\w+", query))
+        with self._lock:
+            pending = {
+                name: file_name for name, file_name in tables.items() if name in words and name not in self._registered
+            }
+        # Files are resolved (and in lazy mode downloaded) outside the lock, so a large download in one
+        # session never holds up queries of other sessions on tables that are already local
+        sources = {name: self._source(file_name) for name, file_name in pending.items()}
+        with self._lock:
+            for name, source in sources.items():
+                if name not in self._registered:
+                    self._connection().execute(f'CREATE OR REPLACE VIEW "{name}" AS SELECT * FROM {source}')
+                    self._registered.add(name)
+
+    def _cursor(self, query: str):
+        self._register_referenced(query)
+        with self._lock:
+            # A cursor per query so concurrent sessions do not share one connection's state
+            return self._connection().cursor()
+
+    def sql(self, query: str, params: list | None = None):
+        """Run a SQL query over the data lake and return a pandas DataFrame.
+
+        Args:
+            query: SQL text; tables are named after their data lake files without extension
+            params: Values for ``?`` placeholders in the query
+
+        Returns:
+            pandas.DataFrame with the result
+
+        """
+        cursor = self._cursor(query)
+        try:
+            return cursor.execute(query, params or []).df()
+        finally:
+            cursor.close()
+
+    def arrow(self, query: str, params: list | None = None):
+        """Run a SQL query over the data lake and return a pyarrow Table."""
+        cursor = self._cursor(query)
+        try:
+            return cursor.execute(query, params or []).fetch_arrow_table()
+        finally:
+            cursor.close()
+
+    def columns(self, table: str):
+        """Return the column names and types of a table without reading its rows."""
+        return self.sql(f'DESCRIBE SELECT * FROM "{table}"')
+
+    def lookup(self, table: str, column: str, values, columns: list[str] | None = None):
+        """Return the rows of a table whose column matches any of the given values.
+
+        Args:
+            table: Table name
+            column: Column to filter on
+            values: A value or list of values to match
+            columns: Columns to return; defaults to all
+
+        Returns:
+            pandas.DataFrame with the matching rows
+
+        """
+        if isinstance(values, str) or not hasattr(values, "__iter__"):
+            values = [values]
+        values = list(values)
+        selected = ", ".join(f'"{c}"' for c in columns) if columns else "*"
+        condition = f'"{column}" IN ({", ".join("?" for _ in values)})' if values else "false"
+        return self.sql(f'SELECT {selected} FROM "{table}" WHERE {condition}', values)
@@ -0,0 +1,208 @@
+"""Host-wide shared cache of data lake tables as memory-mapped Arrow IPC files.
+
+The first process to ask for a table decodes it once into an uncompressed Arrow IPC file in the cache
+directory (``/dev/shm`` by default, so the file lives in RAM). Every process then memory-maps that
+file and gets a zero-copy `pyarrow.Table`, so N workers share the page cache instead of holding N
+private copies.
+
+Each attached table holds a shared ``flock`` on a reference file next to it. Eviction takes an
+exclusive non-blocking lock, so a table that any process still uses is never evicted, and locks held
+by a process that dies are released by the kernel. When the cache grows past its byte budget, the
+least recently attached unused tables are evicted first.
+"""
+
+import hashlib
+import os
+import threading
+
+from biomni.data_lake.catalog import DataLakeCatalog, single_flight
+
+try:
+    import fcntl
+except ImportError:  # Windows: only references held by this process protect a table from eviction
+    fcntl = None
+
+ARROW_SUFFIX = ".arrow"
+REF_SUFFIX = ".ref"
+DEFAULT_BUDGET_BYTES = 8 << 30
+
+
+def default_cache_dir() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "biomni_tables")
+
+
+def pandas_copy_on_write() -> bool:
+    """Whether pandas copies on write, so frames may safely share read-only or cached buffers."""
+    import pandas as pd
+
+    return int(pd.__version__.split(".")[0]) >= 3 or bool(pd.options.mode.copy_on_write)
+
+
+class SharedTableCache:
+    """Data lake tables shared across processes through memory-mapped Arrow IPC files."""
+
+    def __init__(self, catalog: DataLakeCatalog, cache_dir: str | None = None, budget_bytes: int | None = None):
+        """Initialize the cache.
+
+        Args:
+            catalog: Data lake catalogue the tables are read from
+            cache_dir: Directory for the Arrow files; defaults to BIOMNI_SHARED_CACHE_DIR or /dev/shm/biomni_tables
+            budget_bytes: Host-wide size budget; defaults to BIOMNI_SHARED_CACHE_BYTES or 8 GiB
+
+        """
+        self.catalog = catalog
+        self.cache_dir = cache_dir or os.getenv("BIOMNI_SHARED_CACHE_DIR") or default_cache_dir()
+        self.budget_bytes = budget_bytes or int(os.getenv("BIOMNI_SHARED_CACHE_BYTES", DEFAULT_BUDGET_BYTES))
+        # key -> (table, open reference file) for the tables this process has attached
+        self._attached: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, name: str) -> str:
+        """Cache key of a file: changes whenever the source (or its optimized copy) changes."""
+        source = self.catalog.optimized_path(name) or self.catalog.path(name)
+        stat = os.stat(source)
+        digest = hashlib.sha256(f"{source}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+        return f"{name}-{digest}"
+
+    def _arrow_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ARROW_SUFFIX)
+
+    def _read_source(self, name: str):
+        """Decode a data lake file into a pyarrow Table."""
+        import pyarrow.parquet as pq
+
+        from biomni.data_lake.query import DataLakeQuery, table_name, tabular_format
+
+        optimized = self.catalog.optimized_path(name)
+        if optimized:
+            return pq.read_table(optimized)
+        if tabular_format(name) == "parquet":
+            return pq.read_table(self.catalog.path(name))
+        return DataLakeQuery(self.catalog).arrow(f'SELECT * FROM "{table_name(name)}"')
+
+    def _write(self, key: str, name: str):
+        import pyarrow as pa
+
+        table = self._read_source(name)
+        path = self._arrow_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        # Uncompressed so readers can map the buffers directly
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def __contains__(self, name: str) -> bool:
+        """Whether a current copy of the table is already in the cache, attached or not."""
+        if not self.catalog.is_local(name):
+            return False
+        try:
+            return os.path.exists(self._arrow_path(self._key(name)))
+        except OSError:
+            return False
+
+    def get(self, name: str):
+        """Attach a data lake table, decoding it into the shared cache on first use.
+
+        Args:
+            name: Data lake file name
+
+        Returns:
+            A read-only, zero-copy pyarrow Table
+
+        """
+        import pyarrow as pa
+
+        key = self._key(name)
+        with self._lock:
+            if key in self._attached:
+                return self._attached[key][0]
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._arrow_path(key)
+        with single_flight(self.cache_dir, key):
+            written = not os.path.exists(path)
+            if written:
+                self._write(key, name)
+            # Take our reference before anything can evict the file
+            ref = open(os.path.join(self.cache_dir, key + REF_SUFFIX), "a")
+            if fcntl is not None:
+                fcntl.flock(ref, fcntl.LOCK_SH)
+            os.utime(path)
+            table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+        with self._lock:
+            self._attached[key] = (table, ref)
+        if written:
+            self.evict()
+        return table
+
+    def release(self, name: str) -> None:
+        """Drop this process's reference to a table so it can be evicted."""
+        with self._lock:
+            for key in [key for key in self._attached if key.rsplit("-", 1)[0] == name]:
+                _, ref = self._attached.pop(key)
+                ref.close()
+
+    def entries(self) -> list[dict]:
+        """List the cached tables with their size and last access time."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(ARROW_SUFFIX):
+                stat = os.stat(os.path.join(self.cache_dir, file_name))
+                entries.append(
+                    {"key": file_name[: -len(ARROW_SUFFIX)], "size": stat.st_size, "last_used": stat.st_mtime}
+                )
+        return sorted(entries, key=lambda entry: entry["last_used"])
+
+    def evict(self, budget_bytes: int | None = None) -> list[str]:
+        """Evict least recently used tables that no process holds until the cache fits the budget.
+
+        Returns:
+            Keys of the evicted tables
+
+        """
+        budget = self.budget_bytes if budget_bytes is None else budget_bytes
+        entries = self.entries()
+        total = sum(entry["size"] for entry in entries)
+        evicted = []
+        for entry in entries:
+            if total <= budget:
+                break
+            key = entry["key"]
+            with self._lock:
+                if key in self._attached:
+                    continue
+            if self._try_remove(key):
+                total -= entry["size"]
+                evicted.append(key)
+        return evicted
+
+    def _try_remove(self, key: str) -> bool:
+        ref_path = os.path.join(self.cache_dir, key + REF_SUFFIX)
+        # Serialized with get() so no process is between finding the file and taking its reference
+        with single_flight(self.cache_dir, key):
+            if not os.path.exists(self._arrow_path(key)):
+                return False
+            with open(ref_path, "a") as ref:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(ref, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        return False  # still attached somewhere
+                os.remove(self._arrow_path(key))
+                os.remove(ref_path)
+        print(f"Evicted {key} from the shared table cache")
+        return True
+
+    def to_pandas(self, table):
+        """Convert an attached table to pandas, sharing numeric buffers when pandas copy-on-write is on.
+
+        Without copy-on-write a frame over read-only shared memory would fail on in-place edits, so the
+        data is copied instead.
+        """
+        if pandas_copy_on_write():
+            return table.to_pandas(split_blocks=True)
+        return table.to_pandas()
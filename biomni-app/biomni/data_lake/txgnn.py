@@ -0,0 +1,225 @@
+"""Compiled store for the TxGNN drug repurposing predictions.
+
+``txgnn_prediction.pkl`` (disease -> drug id -> raw score) and ``txgnn_name_mapping.pkl`` are compiled
+once into ``<data_lake>/.txgnn/``:
+
+- ``scores.npy``: dense disease x drug float32 matrix of raw scores, -inf where TxGNN has no score
+- ``diseases.parquet`` / ``drugs.parquet``: row and column labels (disease name; drug id and name)
+- ``meta.json``: the size and mtime of both source pickles
+
+The matrix is memory-mapped and the store is opened once per process; a query selects its top k with
+``argpartition`` over one row instead of unpickling and sorting every prediction.
+
+    python -m biomni.data_lake.txgnn --path ./data/biomni_data/data_lake
+"""
+
+import argparse
+import functools
+import json
+import os
+import time
+
+import numpy as np
+
+TXGNN_DIR = ".txgnn"
+PREDICTION_FILE = "txgnn_prediction.pkl"
+NAME_MAPPING_FILE = "txgnn_name_mapping.pkl"
+
+
+def _source_stat(path: str) -> dict:
+    stat = os.stat(path)
+    return {"source_size": stat.st_size, "source_mtime": stat.st_mtime}
+
+
+def build_txgnn_store(data_lake_dir: str, out_dir: str) -> dict:
+    """Compile the TxGNN prediction pickles into the memory-mapped score matrix.
+
+    Args:
+        data_lake_dir: Data lake directory holding the TxGNN pickles
+        out_dir: Directory to write the store into
+
+    Returns:
+        The store's metadata
+
+    """
+    import pickle
+
+    import pandas as pd
+
+    start = time.perf_counter()
+    sources = {}
+    with open(os.path.join(data_lake_dir, PREDICTION_FILE), "rb") as f:
+        predictions = pickle.load(f)
+    with open(os.path.join(data_lake_dir, NAME_MAPPING_FILE), "rb") as f:
+        mapping = pickle.load(f)
+    for name in (PREDICTION_FILE, NAME_MAPPING_FILE):
+        sources[name] = _source_stat(os.path.join(data_lake_dir, name))
+
+    diseases = list(predictions)
+    # Drug columns in first-seen order; diseases normally all score the same drugs in the same order
+    columns: dict = {}
+    for scores in predictions.values():
+        for drug_id in scores:
+            columns.setdefault(drug_id, len(columns))
+    drug_ids = list(columns)
+    id2name = mapping.get("id2name_drug", {})
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    def replace(name, write, mode="wb"):
+        # Write beside and rename, so processes that have the old arrays mapped keep a valid file
+        tmp_path = os.path.join(out_dir, f".{name}.{os.getpid()}.tmp")
+        with open(tmp_path, mode) as f:
+            write(f)
+        os.replace(tmp_path, os.path.join(out_dir, name))
+
+    # Filled row by row straight into the file, so the build never holds the pickle and the matrix twice
+    tmp_path = os.path.join(out_dir, f".scores.npy.{os.getpid()}.tmp")
+    matrix = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(len(diseases), len(drug_ids)))
+    matrix[:] = -np.inf
+    for row, scores in enumerate(predictions.values()):
+        values = np.fromiter(scores.values(), dtype=np.float32, count=len(scores))
+        if list(scores) == drug_ids:
+            matrix[row] = values
+        else:
+            matrix[row, [columns[drug_id] for drug_id in scores]] = values
+    matrix.flush()
+    del matrix
+    os.replace(tmp_path, os.path.join(out_dir, "scores.npy"))
+
+    disease_table = pd.DataFrame({"disease": diseases})
+    drug_table = pd.DataFrame(
+        {
+            "drug_id": [str(drug_id) for drug_id in drug_ids],
+            "name": [id2name.get(drug_id, "Unknown Drug") for drug_id in drug_ids],
+        }
+    )
+    replace("diseases.parquet", lambda f: disease_table.to_parquet(f, index=False))
+    replace("drugs.parquet", lambda f: drug_table.to_parquet(f, index=False))
+
+    meta = {"diseases": len(diseases), "drugs": len(drug_ids), "sources": sources}
+    # Written last: a store is only considered current once all arrays are in place
+    replace("meta.json", lambda f: json.dump(meta, f, indent=2), mode="w")
+    print(
+        f"✓ Compiled TxGNN predictions: {meta['diseases']} diseases x {meta['drugs']} drugs "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    return meta
+
+
+class TxGNNPredictions:
+    """Top-k drug lookups over the compiled TxGNN score matrix."""
+
+    def __init__(self, store_dir: str):
+        """Open a compiled store.
+
+        Args:
+            store_dir: Directory written by `build_txgnn_store`
+
+        """
+        import pandas as pd
+
+        from biomni.data_lake.drug_names import FuzzyNameIndex
+
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.scores = np.load(os.path.join(store_dir, "scores.npy"), mmap_mode="r")
+        self.diseases = pd.read_parquet(os.path.join(store_dir, "diseases.parquet"))["disease"].tolist()
+        drugs = pd.read_parquet(os.path.join(store_dir, "drugs.parquet"))
+        self.drug_ids = drugs["drug_id"].to_numpy(dtype=object)
+        self.drug_names = drugs["name"].to_numpy(dtype=object)
+        self._rows = {disease: row for row, disease in enumerate(self.diseases)}
+        self._disease_index = FuzzyNameIndex(self.diseases)
+        # The index resolves to normalized names; map those back to rows
+        self._normalized_rows = {}
+        for row, disease in enumerate(self.diseases):
+            self._normalized_rows.setdefault(FuzzyNameIndex.normalize(disease), row)
+
+    def __len__(self) -> int:
+        return len(self.diseases)
+
+    @classmethod
+    def open(cls, data_lake_dir: str) -> "TxGNNPredictions":
+        """Open the TxGNN store of a data lake, compiling it from the pickles first if needed.
+
+        Stores are cached per process, so repeated calls return the same memory-mapped instance.
+        """
+        from biomni.data_lake.catalog import data_lake_file, single_flight
+
+        store_dir = os.path.join(data_lake_dir, TXGNN_DIR)
+        if not cls._is_current(store_dir, data_lake_dir):
+            for name in (PREDICTION_FILE, NAME_MAPPING_FILE):
+                data_lake_file(data_lake_dir, name)
+            with single_flight(data_lake_dir, TXGNN_DIR):
+                # Another process may have compiled it while we waited
+                if not cls._is_current(store_dir, data_lake_dir):
+                    build_txgnn_store(data_lake_dir, store_dir)
+        store_dir = os.path.abspath(store_dir)
+        return _open_store(store_dir, os.path.getmtime(os.path.join(store_dir, "meta.json")))
+
+    @staticmethod
+    def _is_current(store_dir: str, data_lake_dir: str) -> bool:
+        meta_path = os.path.join(store_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path) as f:
+            sources = json.load(f)["sources"]
+        for name, stat in sources.items():
+            path = os.path.join(data_lake_dir, name)
+            # A store whose sources were removed stays usable
+            if os.path.exists(path) and _source_stat(path) != stat:
+                return False
+        return True
+
+    def match_disease(self, disease_name: str, cutoff: float = 0.6) -> str | None:
+        """Return the disease best matching a name (exact, else fuzzy), or None."""
+        if disease_name in self._rows:
+            return disease_name
+        match = self._disease_index.resolve(disease_name, cutoff=cutoff)
+        return self.diseases[self._normalized_rows[match]] if match is not None else None
+
+    def top_drugs(self, diseases, k: int = 5) -> dict:
+        """Return the k highest scoring drugs of each disease.
+
+        Args:
+            diseases: Disease names exactly as in the store (see `match_disease`)
+            k: Number of drugs per disease
+
+        Returns:
+            Dict of disease -> list of (drug id, drug name, sigmoid score), best first
+
+        """
+        rows = np.asarray([self._rows[disease] for disease in diseases], dtype=np.int64)
+        scores = np.asarray(self.scores[rows])
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            return {disease: [] for disease in diseases}
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top, top_scores = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+        probabilities = 1 / (1 + np.exp(-top_scores.astype(np.float64)))
+        return {
+            disease: [
+                (self.drug_ids[column], self.drug_names[column], float(probability))
+                for column, score, probability in zip(top[i], top_scores[i], probabilities[i], strict=True)
+                if np.isfinite(score)
+            ]
+            for i, disease in enumerate(diseases)
+        }
+
+
+@functools.lru_cache(maxsize=2)
+def _open_store(store_dir: str, mtime: float) -> TxGNNPredictions:
+    return TxGNNPredictions(store_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the TxGNN prediction pickles into the score matrix")
+    parser.add_argument("--path", default="./data/biomni_data/data_lake", help="Data lake directory")
+    args = parser.parse_args(argv)
+    build_txgnn_store(args.path, os.path.join(args.path, TXGNN_DIR))
+
+
+if __name__ == "__main__":
+    main()
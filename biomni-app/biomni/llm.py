@@ -1,14 +1,11 @@
 import os
-from typing import Literal, Optional
-
-import openai
-from langchain_anthropic import ChatAnthropic
+from typing import Literal
 
 # from langchain_aws import ChatBedrock
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_ollama import ChatOllama
-from langchain_openai import AzureChatOpenAI, ChatOpenAI
+
+# Provider packages are imported inside get_llm: each one pulls in its own SDK and HTTP stack, and a
+# process only ever talks to one or two of them.
 
 SourceType = Literal["OpenAI", "AzureOpenAI", "Anthropic", "Ollama", "Gemini", "Bedrock", "Groq", "Custom"]
 ALLOWED_SOURCES: set[str] = set(SourceType.__args__)
@@ -65,6 +62,9 @@ def get_llm(
                 raise ValueError("Unable to determine model source. Please specify 'source' parameter.")
 
     # Create appropriate model based on source
+    if source in ("OpenAI", "AzureOpenAI", "Gemini", "Groq", "Custom"):
+        from langchain_openai import AzureChatOpenAI, ChatOpenAI
+
     if source == "OpenAI":
         return ChatOpenAI(model=model, temperature=temperature)
     elif source == "AzureOpenAI":
@@ -78,6 +78,8 @@ def get_llm(
             temperature=temperature,
         )
     elif source == "Anthropic":
+        from langchain_anthropic import ChatAnthropic
+
         return ChatAnthropic(
             model=model,
             temperature=temperature,
@@ -107,6 +109,8 @@ def get_llm(
             stop_sequences=stop_sequences,
         )
     elif source == "Ollama":
+        from langchain_ollama import ChatOllama
+
         return ChatOllama(
             model=model,
             temperature=temperature,
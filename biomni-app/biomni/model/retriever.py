@@ -2,7 +2,6 @@ import contextlib
 import re
 
 from langchain_core.messages import HumanMessage
-from langchain_openai import ChatOpenAI
 
 
 class ToolRetriever:
@@ -24,8 +23,40 @@ class ToolRetriever:
             A dictionary with the same keys, but containing only the most relevant resources
 
         """
-        # Create a prompt for the LLM to select relevant resources
-        prompt = f"""
+        prompt = self._build_retrieval_prompt(query, resources)
+
+        # Use the provided LLM or create a new one
+        if llm is None:
+            from langchain_openai import ChatOpenAI
+
+            llm = ChatOpenAI(model="gpt-4o")
+
+        # Invoke the LLM
+        if hasattr(llm, "invoke"):
+            # For LangChain-style LLMs
+            response = llm.invoke([HumanMessage(content=prompt)])
+            response_content = response.content
+        else:
+            # For other LLM interfaces
+            response_content = str(llm(prompt))
+
+        return self._select_resources(resources, response_content)
+
+    async def aprompt_based_retrieval(self, query: str, resources: dict, llm=None) -> dict:
+        """Async variant of `prompt_based_retrieval` that awaits the LLM instead of blocking on it."""
+        prompt = self._build_retrieval_prompt(query, resources)
+
+        if llm is None:
+            from langchain_openai import ChatOpenAI
+
+            llm = ChatOpenAI(model="gpt-4o")
+
+        response = await llm.ainvoke([HumanMessage(content=prompt)])
+        return self._select_resources(resources, response.content)
+
+    def _build_retrieval_prompt(self, query: str, resources: dict) -> str:
+        """Create a prompt for the LLM to select relevant resources."""
+        return f"""
 You are an expert biomedical research assistant. Your task is to select the relevant resources to help answer a user's query.
 
 USER QUERY: {query}
@@ -66,19 +97,8 @@ IMPORTANT GUIDELINES:
 8. When in doubt about a database tool or molecular biology tool, include it rather than exclude it
 """
 
-        # Use the provided LLM or create a new one
-        if llm is None:
-            llm = ChatOpenAI(model="gpt-4o")
-
-        # Invoke the LLM
-        if hasattr(llm, "invoke"):
-            # For LangChain-style LLMs
-            response = llm.invoke([HumanMessage(content=prompt)])
-            response_content = response.content
-        else:
-            # For other LLM interfaces
-            response_content = str(llm(prompt))
-
+    def _select_resources(self, resources: dict, response_content: str) -> dict:
+        """Map the indices in the LLM response back to the resources they refer to."""
         # Parse the response to extract the selected indices
         selected_indices = self._parse_llm_response(response_content)
 
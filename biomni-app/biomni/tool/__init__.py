@@ -1 +1,11 @@
-from biomni.utils import get_tool_decorated_functions
+# Resolved lazily (PEP 562): importing biomni.tool.<module> or a tool_description module should not
+# pay for biomni.utils and its pandas/langchain imports.
+__all__ = ["get_tool_decorated_functions"]
+
+
+def __getattr__(name):
+    if name == "get_tool_decorated_functions":
+        from biomni.utils import get_tool_decorated_functions
+
+        return get_tool_decorated_functions
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,8 +9,9 @@ from Bio.Blast import NCBIWWW, NCBIXML
 from Bio.Seq import Seq
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from biomni.data_lake.catalog import data_lake_file
 from biomni.llm import get_llm
-from biomni.utils import parse_hpo_obo
+from biomni.utils import load_hpo_obo
 
 
 # Function to map HPO terms to names
@@ -24,7 +25,7 @@ def get_hpo_names(hpo_terms: list[str], data_lake_path: str) -> list[str]:
         List[str]: A list of corresponding HPO term names.
 
     """
-    hp_dict = parse_hpo_obo(data_lake_path + "/hp.obo")
+    hp_dict = load_hpo_obo(data_lake_file(data_lake_path, "hp.obo"))
 
     hpo_names = []
     for term in hpo_terms:
@@ -68,13 +68,12 @@ def liftover_coordinates(
         return "\n".join(steps)
 
 
+import functools
 import os
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
-import torch
-from torch import nn, optim
 
 
 def bayesian_finemapping_with_deep_vi(
@@ -129,6 +128,8 @@ def bayesian_finemapping_with_deep_vi(
     """
     import matplotlib.pyplot as plt
     import pandas as pd
+    import torch
+    from torch import nn, optim
 
     # Initialize the research log
     log = []
@@ -846,6 +847,205 @@ def simulate_demographic_history(
     return "\n".join(log)
 
 
+# Base codes for motif scanning: A, C, G, T (either case) -> 0..3, anything else -> 4
+_MOTIF_BASE_CODES = np.full(256, 4, dtype=np.int64)
+for _code, _bases in enumerate((b"Aa", b"Cc", b"Gg", b"Tt")):
+    _MOTIF_BASE_CODES[np.frombuffer(_bases, dtype=np.uint8)] = _code
+_MOTIF_COMPLEMENT = np.frombuffer(bytes.maketrans(b"ACGT", b"TGCA"), dtype=np.uint8)
+# Motif columns scored per table lookup (tables of 4**k scores)
+_MOTIF_KMER = 4
+# Resolution, in bits, of the score distributions used for p-values
+_MOTIF_SCORE_STEP = 0.01
+
+
+@functools.lru_cache(maxsize=8)
+def _kmer_digits(k: int) -> np.ndarray:
+    """Return the bases (0..3) of every k-mer code, first base most significant, as a (4**k, k) array."""
+    return (np.arange(4**k)[:, None] >> (2 * np.arange(k - 1, -1, -1))) & 3
+
+
+def _kmer_codes(codes: np.ndarray, k: int) -> np.ndarray:
+    """Return the k-mer code starting at each position, or 4**k where the window leaves ACGT or the data."""
+    m = len(codes) - k + 1
+    kmers = np.full(len(codes), 4**k, dtype=np.int64)
+    if m <= 0:
+        return kmers
+    packed = np.zeros(m, dtype=np.int64)
+    valid = np.ones(m, dtype=bool)
+    for j in range(k):
+        window = codes[j : j + m]
+        valid &= window < 4
+        packed = packed * 4 + (window & 3)
+    kmers[:m] = np.where(valid, packed, 4**k)
+    return kmers
+
+
+class _MotifScorer:
+    """A count matrix compiled for scanning: log-odds tables for both strands and its score distribution."""
+
+    def __init__(self, counts: np.ndarray):
+        background = np.full(4, 0.25)
+        # JASPAR's pseudocounts: the square root of the number of sites, spread by background
+        pseudocounts = np.sqrt(counts.sum(axis=1).mean()) * background
+        frequencies = (counts + pseudocounts) / (counts.sum(axis=1, keepdims=True) + pseudocounts.sum())
+        self.pssm = np.log2(frequencies / background)
+        self.length = len(self.pssm)
+        self.min_score = float(self.pssm.min(axis=1).sum())
+        self.max_score = float(self.pssm.max(axis=1).sum())
+        self.strands = {"+": self._tables(self.pssm), "-": self._tables(self.pssm[::-1, ::-1])}
+
+        # Exact distribution of the (rounded) score of a random background sequence, column by column
+        scaled = np.round(self.pssm / _MOTIF_SCORE_STEP).astype(np.int64)
+        low = scaled.min(axis=1)
+        distribution = np.ones(1)
+        for column in scaled - low[:, None]:
+            convolved = np.zeros(len(distribution) + column.max())
+            for shift, probability in zip(column.tolist(), background, strict=True):
+                convolved[shift : shift + len(distribution)] += probability * distribution
+            distribution = convolved
+        self._grid_start = int(low.sum())
+        # survival[i]: probability of a score of at least (grid_start + i) steps
+        self._survival = np.minimum(np.cumsum(distribution[::-1])[::-1], 1.0)
+
+    @staticmethod
+    def _tables(pssm: np.ndarray):
+        """Split a PSSM into k-column score tables; returns (k, [(offset, table)], best score after each)."""
+        k = min(_MOTIF_KMER, len(pssm))
+        offsets = list(range(0, len(pssm) - k + 1, k))
+        if offsets[-1] + k < len(pssm):
+            offsets.append(len(pssm) - k)
+        chunks, covered = [], 0
+        for offset in offsets:
+            weights = pssm[offset : offset + k].copy()
+            # The last window may overlap the one before; its shared columns are already scored
+            weights[: max(0, covered - offset)] = 0
+            covered = offset + k
+            # A final entry for windows with other bases, which never match
+            chunks.append((offset, np.append(weights[np.arange(k), _kmer_digits(k)].sum(axis=1), -np.inf)))
+        # Most selective tables first, so hopeless windows are dropped early
+        chunks.sort(key=lambda chunk: chunk[1][:-1].min() - chunk[1][:-1].max())
+        best = np.array([table[:-1].max() for _, table in chunks])
+        remaining = np.append(np.cumsum(best[::-1])[::-1][1:], 0.0)
+        return k, chunks, remaining
+
+    def threshold(self, pvalue: float) -> float:
+        """Return the lowest score whose p-value under a uniform background is at most pvalue."""
+        passing = np.flatnonzero(self._survival <= pvalue)
+        if not len(passing):
+            return np.inf
+        return (self._grid_start + passing[0] - 0.5) * _MOTIF_SCORE_STEP
+
+    def p_values(self, scores: np.ndarray) -> np.ndarray:
+        """Return the p-values of scores under a uniform background."""
+        index = np.round(np.asarray(scores) / _MOTIF_SCORE_STEP).astype(np.int64) - self._grid_start
+        return self._survival[np.clip(index, 0, len(self._survival) - 1)]
+
+
+@functools.lru_cache(maxsize=4096)
+def _compiled_motif(matrix_id: str, counts: bytes, length: int) -> _MotifScorer:
+    return _MotifScorer(np.frombuffer(counts, dtype=np.float64).reshape(length, 4))
+
+
+def _motif_scorer(matrix) -> _MotifScorer:
+    """Return the compiled scorer of a JASPAR matrix, built once per process."""
+    counts = np.ascontiguousarray(matrix.counts, dtype=np.float64)
+    return _compiled_motif(matrix.matrix_id, counts.tobytes(), len(counts))
+
+
+def _scan_motifs(records, motifs, thresholds, both_strands=True) -> pd.DataFrame:
+    """Score many motifs against many sequences on one or both strands.
+
+    The sequences are concatenated and coded as 4-mers once. A motif is scored four columns per table
+    lookup, most selective tables first, and windows that can no longer reach its threshold are dropped
+    after each lookup, so most of the work is one vectorized lookup per motif and strand.
+
+    Args:
+        records: List of (name, sequence) pairs
+        motifs: List of JASPAR matrices (see `biomni.data_lake.jaspar`)
+        thresholds: Minimum log-odds score of each motif
+        both_strands: Also scan the reverse complement
+
+    Returns:
+        pandas.DataFrame with one row per site: sequence, matrix_id, tf, start and end (0-based, on the forward
+        strand for both strands), strand, score, relative_score, p_value and site (the matched bases, reverse
+        complemented on the "-" strand)
+
+    """
+    scorers = [_motif_scorer(motif) for motif in motifs]
+    sequences = [str(sequence) for _, sequence in records]
+    pad = max((scorer.length for scorer in scorers), default=1)
+    data = ("N".join(sequences) + "N" * pad).encode("ascii", "replace")
+    codes = _MOTIF_BASE_CODES[np.frombuffer(data, dtype=np.uint8)]
+    record_starts = np.cumsum([0] + [len(sequence) + 1 for sequence in sequences[:-1]])
+    kmers = {}
+
+    hits = []
+    for motif_index, (scorer, threshold) in enumerate(zip(scorers, thresholds, strict=True)):
+        n = len(data) - scorer.length + 1
+        for strand in ("+", "-") if both_strands else ("+",):
+            k, chunks, remaining = scorer.strands[strand]
+            if k not in kmers:
+                kmers[k] = _kmer_codes(codes, k)
+            offset, table = chunks[0]
+            score = table[kmers[k][offset : offset + n]]
+            position = np.flatnonzero(score >= threshold - remaining[0])
+            score = score[position]
+            for (offset, table), best_rest in zip(chunks[1:], remaining[1:], strict=True):
+                score += table[kmers[k][position + offset]]
+                keep = score >= threshold - best_rest
+                position, score = position[keep], score[keep]
+            if len(position):
+                hits.append((motif_index, strand, position, score))
+
+    columns = ["sequence", "matrix_id", "tf", "start", "end", "strand", "score", "relative_score", "p_value", "site"]
+    if not hits:
+        return pd.DataFrame(columns=columns)
+    motif_of = np.concatenate([np.full(len(position), index) for index, _, position, _ in hits])
+    minus = np.concatenate([np.full(len(position), strand == "-") for _, strand, position, _ in hits])
+    position = np.concatenate([position for _, _, position, _ in hits])
+    score = np.concatenate([score for _, _, _, score in hits])
+    p_value = np.concatenate([scorers[index].p_values(score) for index, _, _, score in hits])
+    record = np.searchsorted(record_starts, position, side="right") - 1
+    # Sites by sequence, start, strand and motif
+    order = np.lexsort((motif_of, minus, position, record))
+    motif_of, minus, position, score, p_value, record = (
+        values[order] for values in (motif_of, minus, position, score, p_value, record)
+    )
+    start = position - record_starts[record]
+    length = np.array([scorer.length for scorer in scorers])[motif_of]
+    minimum = np.array([scorer.min_score for scorer in scorers])[motif_of]
+    span = np.array([scorer.max_score - scorer.min_score for scorer in scorers])[motif_of]
+
+    # Matched bases, gathered per motif length as fixed-width byte strings
+    upper = np.frombuffer(data.upper(), dtype=np.uint8)
+    sites = np.empty(len(position), dtype=object)
+    for size in np.unique(length).tolist():
+        selected = np.flatnonzero(length == size)
+        windows = upper[position[selected, None] + np.arange(size)]
+        reverse = minus[selected]
+        windows[reverse] = _MOTIF_COMPLEMENT[windows[reverse, ::-1]]
+        sites[selected] = np.ascontiguousarray(windows).view(f"S{size}").ravel().astype(str)
+
+    # Label columns are categorical: a few names repeated over many sites
+    sequence_codes, sequence_names = pd.factorize(np.array([name for name, _ in records], dtype=object))
+    motif_codes, matrix_ids = pd.factorize(np.array([motif.matrix_id for motif in motifs], dtype=object))
+    tf_codes, tf_names = pd.factorize(np.array([motif.name for motif in motifs], dtype=object))
+    return pd.DataFrame(
+        {
+            "sequence": pd.Categorical.from_codes(sequence_codes[record], sequence_names),
+            "matrix_id": pd.Categorical.from_codes(motif_codes[motif_of], matrix_ids),
+            "tf": pd.Categorical.from_codes(tf_codes[motif_of], tf_names),
+            "start": start,
+            "end": start + length,
+            "strand": pd.Categorical.from_codes(minus.astype(np.int8), ["+", "-"]),
+            "score": score,
+            "relative_score": (score - minimum) / span,
+            "p_value": p_value,
+            "site": sites,
+        }
+    )
+
+
 def identify_transcription_factor_binding_sites(sequence, tf_name, threshold=0.8, output_file=None):
     """Identifies binding sites for a specific transcription factor in a genomic sequence.
 
@@ -867,72 +1067,43 @@ def identify_transcription_factor_binding_sites(sequence, tf_name, threshold=0.8
 
     """
     import datetime
-    import io
 
-    import requests
-    from Bio import motifs
-    from Bio.Seq import Seq
+    from biomni.data_lake.jaspar import jaspar_matrix
 
     log = f"# Transcription Factor Binding Site Analysis: {tf_name}\n"
     log += f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
 
-    # Step 1: Get the PWM for the transcription factor from JASPAR database
+    # Step 1: Get the PWM for the transcription factor from the local JASPAR motif cache
     log += "## Step 1: Retrieving transcription factor PWM\n"
 
     try:
-        # Search for the TF in JASPAR database
-        jaspar_url = f"https://jaspar.genereg.net/api/v1/matrix/?name={tf_name}"
-        response = requests.get(jaspar_url)
-        tf_data = response.json()
-
-        if not tf_data["results"] or len(tf_data["results"]) == 0:
+        matrix = jaspar_matrix(tf_name)
+        if matrix is None:
             log += f"No PWM found for {tf_name} in JASPAR database.\n"
             return log
 
-        # Get the first match's ID
-        matrix_id = tf_data["results"][0]["matrix_id"]
-        log += f"Found PWM with ID: {matrix_id}\n"
-
-        # Retrieve the PWM
-        pwm_url = f"https://jaspar.genereg.net/api/v1/matrix/{matrix_id}.pfm"
-        pwm_response = requests.get(pwm_url)
-
-        # Parse the PWM
-        handle = io.StringIO(pwm_response.text)
-        motif = motifs.read(handle, "jaspar")
+        log += f"Found PWM with ID: {matrix.matrix_id}\n"
         log += f"Successfully retrieved PWM for {tf_name}\n"
 
-        # Calculate position-specific scoring matrix (PSSM)
-        pssm = motif.pssm
-
         # Step 2: Scan the sequence for binding sites
         log += "\n## Step 2: Scanning sequence for binding sites\n"
         log += f"Sequence length: {len(sequence)} bp\n"
         log += f"Using score threshold: {threshold}\n\n"
 
-        # Find binding sites
-        binding_sites = []
-        max_score = pssm.max
-        min_score = pssm.min
-
-        for position, score in pssm.search(Seq(sequence), threshold=threshold):
-            relative_score = (score - min_score) / (max_score - min_score)
-            if position >= 0:
-                strand = "+"
-                site_seq = sequence[position : position + len(pssm)]
-            else:
-                strand = "-"
-                site_seq = sequence[len(sequence) + position - len(pssm) : len(sequence) + position]
-
-            binding_sites.append(
-                {
-                    "position": abs(position),
-                    "strand": strand,
-                    "score": score,
-                    "relative_score": relative_score,
-                    "sequence": site_seq,
-                }
-            )
+        # The threshold is relative to the motif's score range
+        scorer = _motif_scorer(matrix)
+        min_score = scorer.min_score + threshold * (scorer.max_score - scorer.min_score)
+        sites = _scan_motifs([("sequence", sequence)], [matrix], [min_score])
+        binding_sites = [
+            {
+                "position": int(site.start),
+                "strand": site.strand,
+                "score": float(site.score),
+                "relative_score": float(site.relative_score),
+                "sequence": site.site,
+            }
+            for site in sites.itertuples(index=False)
+        ]
 
         # Step 3: Summarize results
         log += f"## Step 3: Results - Found {len(binding_sites)} potential binding sites\n\n"
@@ -970,6 +1141,118 @@ def identify_transcription_factor_binding_sites(sequence, tf_name, threshold=0.8
     return log
 
 
+def scan_transcription_factor_binding_sites(
+    sequences, tf_names=None, threshold=0.8, pvalue=None, both_strands=True, output_file=None
+):
+    """Scans many sequences for the binding sites of many transcription factors at once.
+
+    Motifs come from the local JASPAR motif cache (see `biomni.data_lake.jaspar`), so promoter-wide scans of
+    hundreds of TFs run offline once the JASPAR CORE bundle has been downloaded.
+
+    Parameters
+    ----------
+    sequences : str, list or dict
+        A DNA sequence, a list of sequences, a dict of name to sequence, or a path to a FASTA or GenBank file
+    tf_names : str or list, optional
+        TF names or JASPAR matrix IDs (e.g. 'GATA1', 'MA0139'); default: every motif in the cache
+    threshold : float, optional
+        Minimum relative score of a site (0.0-1.0, default: 0.8); ignored when pvalue is given
+    pvalue : float, optional
+        Maximum p-value of a site (e.g. 1e-4), turned into a score threshold once per motif
+    both_strands : bool, optional
+        Scan the reverse complement as well (default: True)
+    output_file : str, optional
+        Path to save all sites as a tab-separated table (default: None, results only in log)
+
+    Returns
+    -------
+    str
+        Research log summarizing the binding sites found per transcription factor and sequence
+
+    """
+    from biomni.data_lake.jaspar import jaspar_matrix, load_jaspar_motifs
+
+    log = "# Transcription Factor Binding Site Scan\n"
+    log += f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+
+    try:
+        if isinstance(sequences, dict):
+            records = [(str(name), str(sequence)) for name, sequence in sequences.items()]
+        elif isinstance(sequences, str) and len(sequences) < 4096 and os.path.isfile(sequences):
+            from Bio import SeqIO
+
+            extension = os.path.splitext(sequences)[1].lower()
+            file_format = "genbank" if extension in (".gb", ".gbk", ".genbank") else "fasta"
+            records = [(record.id, str(record.seq)) for record in SeqIO.parse(sequences, file_format)]
+        elif isinstance(sequences, str):
+            records = [("sequence_1", sequences)]
+        else:
+            records = [(f"sequence_{i + 1}", str(sequence)) for i, sequence in enumerate(sequences)]
+
+        # Step 1: Look up the motifs
+        log += "## Step 1: Retrieving transcription factor PWMs\n"
+        if tf_names is None:
+            motifs = list(load_jaspar_motifs().matrices)
+        else:
+            motifs, missing = [], []
+            for tf_name in [tf_names] if isinstance(tf_names, str) else tf_names:
+                matrix = jaspar_matrix(tf_name)
+                if matrix is None:
+                    missing.append(str(tf_name))
+                elif all(matrix.matrix_id != motif.matrix_id for motif in motifs):
+                    motifs.append(matrix)
+            if missing:
+                log += f"No PWM found in JASPAR for: {', '.join(missing)}\n"
+        log += f"Scanning with {len(motifs)} JASPAR motifs\n"
+        if not motifs:
+            return log + "\n## Analysis complete\n"
+
+        # Step 2: Scan
+        log += "\n## Step 2: Scanning sequences for binding sites\n"
+        log += f"Sequences: {len(records)} ({sum(len(sequence) for _, sequence in records)} bp)\n"
+        log += f"Strands: {'both' if both_strands else 'forward only'}\n"
+        scorers = [_motif_scorer(motif) for motif in motifs]
+        if pvalue is not None:
+            log += f"Using p-value threshold: {pvalue}\n\n"
+            thresholds = [scorer.threshold(pvalue) for scorer in scorers]
+        else:
+            log += f"Using relative score threshold: {threshold}\n\n"
+            thresholds = [s.min_score + threshold * (s.max_score - s.min_score) for s in scorers]
+        sites = _scan_motifs(records, motifs, thresholds, both_strands)
+
+        # Step 3: Summarize
+        log += f"## Step 3: Results - Found {len(sites)} potential binding sites\n\n"
+        if len(sites):
+            counts = sites.groupby(["matrix_id", "tf"]).size().sort_values(ascending=False)
+            log += "| Matrix ID | TF | Sites |\n"
+            log += "|-----------|----|-------|\n"
+            for (matrix_id, tf), count in counts.head(30).items():
+                log += f"| {matrix_id} | {tf} | {count} |\n"
+            if len(counts) > 30:
+                log += f"... and {len(counts) - 30} more TFs with sites\n"
+
+            log += "\nTop sites by p-value:\n\n"
+            log += "| Sequence | TF | Start | End | Strand | Site | Score | Relative Score | P-value |\n"
+            log += "|----------|----|-------|-----|--------|------|-------|----------------|---------|\n"
+            for site in sites.nsmallest(20, "p_value").itertuples(index=False):
+                log += (
+                    f"| {site.sequence} | {site.tf} | {site.start} | {site.end} | {site.strand} | {site.site} | "
+                    f"{site.score:.2f} | {site.relative_score:.2f} | {site.p_value:.2e} |\n"
+                )
+        else:
+            log += "No binding sites found meeting the threshold criteria.\n"
+
+        if output_file:
+            sites.to_csv(output_file, sep="\t", index=False)
+            log += f"\nResults saved to file: {output_file}\n"
+
+    except Exception as e:
+        log += f"\n## Error occurred during analysis: {str(e)}\n"
+
+    log += "\n## Analysis complete\n"
+    return log
+
+
 def fit_genomic_prediction_model(
     genotypes,
     phenotypes,
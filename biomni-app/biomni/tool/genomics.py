@@ -1,11 +1,9 @@
 import os
 
-import gget
-import gseapy
 import numpy as np
 import pandas as pd
-import scanpy as sc
 
+from biomni.data_lake.catalog import data_lake_file
 from biomni.llm import get_llm
 
 
@@ -34,6 +32,7 @@ def annotate_celltype_scRNA(
     - str: Steps performed and file paths where results were saved
 
     """
+    import scanpy as sc
 
     def _cluster_info(cluster_id, marker_genes, composition_df=None):
         """Format cluster information for LLM prompt."""
@@ -71,7 +70,7 @@ def annotate_celltype_scRNA(
         markers[i] = list(np.array(gene_names)[np.array(gene_scores) > 0])
 
     # TODO: this can be optimized
-    czi_celltype_path = data_lake_path + "/czi_census_datasets_v4.parquet"
+    czi_celltype_path = data_lake_file(data_lake_path, "czi_census_datasets_v4.parquet")
     df = pd.read_parquet(czi_celltype_path)
     czi_celltype_set = {cell_type.strip() for cell_types in df["cell_type"] for cell_type in str(cell_types).split(";")}
     czi_celltype = ", ".join(sorted(czi_celltype_set))
@@ -185,6 +184,8 @@ def annotate_celltype_with_panhumanpy(
     import sys
     import tempfile
 
+    import scanpy as sc
+
     def conda_env_exists(env_name):
         try:
             result = subprocess.run(["conda", "env", "list"], capture_output=True, text=True, check=True)
@@ -347,6 +348,8 @@ except Exception as e:
 
 def create_scvi_embeddings_scRNA(adata_filename, batch_key, label_key, data_dir):
     # Import scvi-tools correctly - the package name is still 'scvi' when installed
+    import scanpy as sc
+
     try:
         import scvi
     except ImportError:
@@ -388,6 +391,7 @@ def create_scvi_embeddings_scRNA(adata_filename, batch_key, label_key, data_dir)
 
 def create_harmony_embeddings_scRNA(adata_filename, batch_key, data_dir):
     # https://pypi.org/project/harmony-pytorch/
+    import scanpy as sc
     from harmony import harmonize
 
     steps = []
@@ -460,6 +464,7 @@ def get_uce_embeddings_scRNA(
 
 def map_to_ima_interpret_scRNA(adata_filename, data_dir, custom_args=None):
     """Map cell embeddings from the input dataset to the Integrated Megascale Atlas reference dataset using UCE embeddings."""
+    import scanpy as sc
     from sklearn.neighbors import NearestNeighbors
 
     steps = []
@@ -532,6 +537,8 @@ def get_rna_seq_archs4(gene_name: str, K: int = 10) -> str:
     - str: The steps performed and the result.
 
     """
+    import gget
+
     steps_log = f"Starting RNA-seq data fetch for gene: {gene_name} with K: {K}\n"
 
     try:
@@ -562,6 +569,8 @@ def get_rna_seq_archs4(gene_name: str, K: int = 10) -> str:
 
 
 def get_gene_set_enrichment_analysis_supported_database_list() -> list:
+    import gseapy
+
     return gseapy.get_library_name()
 
 
@@ -596,6 +605,8 @@ def gene_set_enrichment_analysis(
     - str: The steps performed and the top K enrichment results.
 
     """
+    import gget
+
     steps_log = (
         f"Starting enrichment analysis for genes: {', '.join(genes)} using {database} database and top_k: {top_k}\n"
     )
@@ -1509,13 +1520,241 @@ def find_enriched_motifs_with_homer(
     return log
 
 
+def _read_regions(regions, default_name: str = ".") -> pd.DataFrame:
+    """Read a region set into a chrom/start/end/name DataFrame.
+
+    Args:
+        regions: Path to a BED file, or a list of (chrom, start, end) or (chrom, start, end, name) tuples
+        default_name: Name of regions given without one
+
+    Returns:
+        pandas.DataFrame in input order
+
+    Raises:
+        ValueError: If a BED file has fewer than 3 columns or a region fewer than 3 fields
+
+    """
+    if isinstance(regions, str):
+        import io
+
+        with open(regions) as f:
+            # Skip comments and the header lines of genome browser tracks
+            lines = [line for line in f if line.strip() and not line.startswith(("#", "track", "browser"))]
+        table = (
+            pd.read_csv(io.StringIO("".join(lines)), sep="\t", header=None, dtype=str)
+            if lines
+            else pd.DataFrame(columns=[0, 1, 2], dtype=str)
+        )
+        if table.shape[1] < 3:
+            raise ValueError(
+                f"{regions} has {table.shape[1]} column(s); a BED file needs at least chrom, start and end"
+            )
+        names = table[3] if table.shape[1] > 3 else default_name
+        frame = pd.DataFrame({"chrom": table[0], "start": table[1], "end": table[2], "name": names})
+    else:
+        rows = list(regions)
+        short = next((region for region in rows if len(region) < 3), None)
+        if short is not None:
+            raise ValueError(f"region {short!r} has fewer than 3 fields (chrom, start, end)")
+        frame = pd.DataFrame(
+            {
+                "chrom": [str(region[0]) for region in rows],
+                "start": [region[1] for region in rows],
+                "end": [region[2] for region in rows],
+                "name": [region[3] if len(region) > 3 else default_name for region in rows],
+            }
+        )
+    frame["start"] = frame["start"].astype(np.int64)
+    frame["end"] = frame["end"].astype(np.int64)
+    return frame.reset_index(drop=True)
+
+
+def _expand_ranges(lo: np.ndarray, hi: np.ndarray):
+    """Expand ranges [lo, hi) into (range number, index) pairs."""
+    counts = np.maximum(hi - lo, 0)
+    owner = np.repeat(np.arange(len(lo)), counts)
+    index = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts - lo, counts)
+    return owner, index
+
+
+class _RegionSets:
+    """Several genomic region sets on one coordinate line, partitioned by chromosome.
+
+    Every chromosome seen in any set gets its own block of the line, so each set becomes one array of
+    starts and one of ends, sorted by start, and regions on different chromosomes can never overlap.
+    Overlaps, counts and nearest regions are then binary searches over these arrays (regions are half-open,
+    as in BED; empty regions are dropped), and the base-pair overlap of all sets is one sweep over their
+    merged boundaries. Nothing is written to disk and no subprocess is started.
+    """
+
+    def __init__(self, frames: list[pd.DataFrame]):
+        """Index region sets.
+
+        Args:
+            frames: One chrom/start/end/name DataFrame per set (see `_read_regions`)
+
+        """
+        self.frames = [frame[frame["end"] > frame["start"]].reset_index(drop=True) for frame in frames]
+        chrom_codes, chroms = pd.factorize(
+            pd.concat([pd.Series(dtype=str)] + [frame["chrom"].astype(str) for frame in self.frames])
+        )
+        bounds = np.cumsum([0] + [len(frame) for frame in self.frames])
+        codes = [chrom_codes[lo:hi].astype(np.int64) for lo, hi in zip(bounds[:-1], bounds[1:], strict=True)]
+        extent = np.zeros(len(chroms) + 1, dtype=np.int64)
+        for frame, code in zip(self.frames, codes, strict=True):
+            np.maximum.at(extent, code + 1, frame["end"].to_numpy() + 1)
+        offsets = np.cumsum(extent)[:-1]
+
+        self._sets = []
+        for frame, code in zip(self.frames, codes, strict=True):
+            start = offsets[code] + frame["start"].to_numpy()
+            end = offsets[code] + frame["end"].to_numpy()
+            order = np.argsort(start, kind="stable")
+            start, end, code = start[order], end[order], code[order]
+            # Running maximum of the ends, and the region attaining it, for nearest-region lookups
+            reach = np.maximum.accumulate(end) if len(end) else end
+            reach_index = np.maximum.accumulate(np.where(end == reach, np.arange(len(end)), 0)) if len(end) else end
+            self._sets.append(
+                {
+                    "start": start,
+                    "end": end,
+                    "chrom": code,
+                    "order": order,
+                    "sorted_end": np.sort(end),
+                    "reach": reach,
+                    "reach_index": reach_index,
+                }
+            )
+        self._merged = {}
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def merged(self, i: int):
+        """Return the union of set i as sorted, disjoint (start, end) arrays; book-ended regions are joined."""
+        if i not in self._merged:
+            regions = self._sets[i]
+            start, reach = regions["start"], regions["reach"]
+            first = np.ones(len(start), dtype=bool)
+            first[1:] = start[1:] > reach[:-1]
+            groups = np.flatnonzero(first)
+            self._merged[i] = (start[groups], np.maximum.reduceat(regions["end"], groups) if len(groups) else start)
+        return self._merged[i]
+
+    def counts(self, i: int, j: int) -> np.ndarray:
+        """Return the number of regions of set j that overlap each region of set i, in input order."""
+        a, b = self._sets[i], self._sets[j]
+        counts = np.searchsorted(b["start"], a["end"], side="left") - np.searchsorted(
+            b["sorted_end"], a["start"], side="right"
+        )
+        return self._input_order(i, counts)
+
+    def overlaps_any(self, i: int, j: int) -> np.ndarray:
+        """Return whether each region of set i (in input order) overlaps set j."""
+        a = self._sets[i]
+        start, end = self.merged(j)
+        k = np.searchsorted(start, a["end"], side="left")
+        hit = (k > 0) & (end[np.maximum(k - 1, 0)] > a["start"]) if len(start) else np.zeros(len(k), dtype=bool)
+        return self._input_order(i, hit)
+
+    def pairs(self, i: int, j: int):
+        """Return all overlapping pairs of sets i and j.
+
+        Returns:
+            (rows of set i, rows of set j, overlap in bp) arrays, rows in input order, sorted by the region of
+            set i and then the region of set j
+
+        """
+        a, b = self._sets[i], self._sets[j]
+        # Regions of j starting within a region of i, then regions of i starting strictly within one of j
+        owner_a, index_b = _expand_ranges(
+            np.searchsorted(b["start"], a["start"], side="left"), np.searchsorted(b["start"], a["end"], side="left")
+        )
+        owner_b, index_a = _expand_ranges(
+            np.searchsorted(a["start"], b["start"], side="right"), np.searchsorted(a["start"], b["end"], side="left")
+        )
+        sorted_a = np.concatenate([owner_a, index_a])
+        sorted_b = np.concatenate([index_b, owner_b])
+        bp = np.minimum(a["end"][sorted_a], b["end"][sorted_b]) - np.maximum(a["start"][sorted_a], b["start"][sorted_b])
+        row_a, row_b = a["order"][sorted_a], b["order"][sorted_b]
+        order = np.lexsort((row_b, row_a))
+        return row_a[order], row_b[order], bp[order]
+
+    def nearest(self, i: int, j: int):
+        """Return the nearest region of set j to each region of set i (in input order).
+
+        Returns:
+            (row of set j or -1 if none is on the same chromosome, distance in bp: 0 for overlapping or
+            book-ended regions, -1 if none) arrays; ties go to the upstream region
+
+        """
+        a, b = self._sets[i], self._sets[j]
+        if not len(b["start"]):
+            return np.full(len(a["start"]), -1), np.full(len(a["start"]), -1)
+        k = np.searchsorted(b["start"], a["end"], side="left")
+        # Upstream: of the regions starting before this one ends, the one reaching furthest
+        up = b["reach_index"][np.maximum(k - 1, 0)]
+        up_distance = np.where(
+            (k > 0) & (b["chrom"][up] == a["chrom"]), np.maximum(a["start"] - b["end"][up], 0), np.iinfo(np.int64).max
+        )
+        # Downstream: the first region starting at or after its end
+        down = np.minimum(k, len(b["start"]) - 1)
+        down_distance = np.where(
+            (k < len(b["start"])) & (b["chrom"][down] == a["chrom"]),
+            b["start"][down] - a["end"],
+            np.iinfo(np.int64).max,
+        )
+        nearest = np.where(down_distance < up_distance, down, up)
+        distance = np.minimum(up_distance, down_distance)
+        found = distance < np.iinfo(np.int64).max
+        return (
+            self._input_order(i, np.where(found, b["order"][nearest], -1)),
+            self._input_order(i, np.where(found, distance, -1)),
+        )
+
+    def overlap_matrices(self, block: int = 1 << 16):
+        """Return the N x N base-pair intersection and Jaccard matrices of all sets' unions, in one sweep.
+
+        The merged boundaries of all sets are sorted once; between consecutive boundaries each set is either
+        present or not, so the intersection of every pair is a weighted product of presence indicators.
+        The diagonal holds each set's own union size.
+        """
+        merged = [self.merged(i) for i in range(len(self))]
+        positions = np.sort(np.concatenate([np.concatenate(m) for m in merged] + [np.empty(0, dtype=np.int64)]))
+        positions = (
+            positions[np.concatenate([[True], positions[1:] != positions[:-1]])] if len(positions) else positions
+        )
+        # Boundaries of a merged set are distinct, so each set flips at most once per position
+        delta = np.zeros((len(self), len(positions)), dtype=np.int8)
+        for i, (start, end) in enumerate(merged):
+            delta[i, np.searchsorted(positions, start)] = 1
+            delta[i, np.searchsorted(positions, end)] = -1
+        present = np.cumsum(delta, axis=1, dtype=np.int8)[:, :-1]
+        lengths = np.diff(positions).astype(np.float64)
+
+        intersection = np.zeros((len(self), len(self)))
+        for offset in range(0, len(lengths), block):
+            chunk = present[:, offset : offset + block].astype(np.float64)
+            intersection += (chunk * lengths[offset : offset + block]) @ chunk.T
+        intersection = intersection.round().astype(np.int64)
+        size = np.diag(intersection)
+        union = size[:, None] + size[None, :] - intersection
+        jaccard = np.divide(intersection, union, out=np.zeros(intersection.shape), where=union > 0)
+        return intersection, jaccard
+
+    def _input_order(self, i: int, values: np.ndarray) -> np.ndarray:
+        out = np.empty_like(values)
+        out[self._sets[i]["order"]] = values
+        return out
+
+
 def analyze_genomic_region_overlap(region_sets, output_prefix="overlap_analysis"):
     """Analyze overlaps between two or more sets of genomic regions.
 
     Parameters
     ----------
-    region_sets : list
-        List of genomic region sets. Each item can be either:
+    region_sets : list or dict
+        List of genomic region sets, or a dict of set name to region set. Each set can be either:
         - A string path to a BED file
         - A list of tuples/lists with format (chrom, start, end) or (chrom, start, end, name)
     output_prefix : str, optional
@@ -1529,119 +1768,67 @@ def analyze_genomic_region_overlap(region_sets, output_prefix="overlap_analysis"
     """
     from datetime import datetime
 
-    import pandas as pd
-    import pybedtools
-
     # Start research log
     log = "# Genomic Region Overlap Analysis\n"
     log += f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
 
-    # Create BedTool objects from inputs
-    bedtools = []
-    set_names = []
+    if isinstance(region_sets, dict):
+        set_names, region_sets = [str(name) for name in region_sets], list(region_sets.values())
+    else:
+        set_names = [f"Region_Set_{i + 1}" for i in range(len(region_sets))]
 
     log += "## Input Processing\n"
-    for i, regions in enumerate(region_sets):
-        set_name = f"Region_Set_{i + 1}"
-        set_names.append(set_name)
-
-        if isinstance(regions, str) and os.path.exists(regions):
-            # Input is a file path
-            bedtool = pybedtools.BedTool(regions)
-            log += f"- Loaded {set_name} from file: {regions}\n"
-        else:
-            # Input is a list of coordinates
-            temp_bed_file = f"{output_prefix}_{set_name}.bed"
-            with open(temp_bed_file, "w") as f:
-                for region in regions:
-                    if len(region) >= 3:
-                        chrom, start, end = region[0], region[1], region[2]
-                        name = region[3] if len(region) > 3 else f"feature_{i}"
-                        f.write(f"{chrom}\t{start}\t{end}\t{name}\n")
-            bedtool = pybedtools.BedTool(temp_bed_file)
-            log += f"- Created {set_name} from {len(regions)} provided coordinates\n"
-
-        bedtools.append(bedtool)
+    frames = []
+    for i, (set_name, regions) in enumerate(zip(set_names, region_sets, strict=True)):
+        try:
+            if isinstance(regions, str):
+                # Input is a file path
+                frames.append(_read_regions(regions))
+                log += f"- Loaded {set_name} from file: {regions}\n"
+            else:
+                # Input is a list of coordinates
+                frames.append(_read_regions(regions, default_name=f"feature_{i}"))
+                log += f"- Created {set_name} from {len(regions)} provided coordinates\n"
+        except FileNotFoundError:
+            log += f"- Error: BED file for {set_name} not found: {regions}\n"
+        except (OSError, ValueError) as e:
+            log += f"- Error: could not read {set_name}: {str(e)}\n"
+    if len(frames) < len(region_sets):
+        log += "\nNo overlaps were computed; every region set must be readable.\n"
+        return log
+
+    index = _RegionSets(frames)
+    for set_name, frame, indexed in zip(set_names, frames, index.frames, strict=True):
+        if len(indexed) < len(frame):
+            log += f"- Skipped {len(frame) - len(indexed)} empty regions (end <= start) in {set_name}\n"
 
     log += "\n## Analysis Results\n"
 
     # Calculate basic statistics for each set
-    stats = []
-    for i, bt in enumerate(bedtools):
-        # Calculate total base pairs from start and end coordinates
-        total_bp = sum(int(feature.end) - int(feature.start) for feature in bt)
-        stats.append({"Set": set_names[i], "Regions": len(bt), "Total_BP": total_bp})
+    stats = [
+        {"Set": set_name, "Regions": len(frame), "Total_BP": int((frame["end"] - frame["start"]).sum())}
+        for set_name, frame in zip(set_names, index.frames, strict=True)
+    ]
+    overlap_bp_matrix, jaccard_matrix = index.overlap_matrices()
 
     # Create a results dataframe to store pairwise overlaps
     results = []
 
     # Perform pairwise overlaps
-    for i in range(len(bedtools)):
-        for j in range(i + 1, len(bedtools)):
-            # Find overlaps using a simpler approach - just get the overlap regions
+    for i in range(len(index)):
+        for j in range(i + 1, len(index)):
             try:
-                # Use intersect with -u option to get unique overlapping features
-                # and -wa option to get the original features from the first set
-                overlapping_regions_a = bedtools[i].intersect(bedtools[j], u=True)
-
-                # Get overlapping features from the second set
-                overlapping_regions_b = bedtools[j].intersect(bedtools[i], u=True)
-
-                # Calculate statistics
-                overlap_regions_count_a = len(overlapping_regions_a)
-                overlap_regions_count_b = len(overlapping_regions_b)
-
-                # Now find the actual overlap coordinates using intersect with -wo
-                # -wo outputs the original features plus the overlap length
-                overlap_with_bases = bedtools[i].intersect(bedtools[j], wo=True)
-
-                if len(overlap_with_bases) > 0:
-                    # Extract overlap base pairs from the last column of -wo output
-                    overlap_bp = 0
-                    unique_overlaps = set()
-
-                    for line in overlap_with_bases:
-                        # The last field in -wo output is the overlap size in bases
-                        # Convert all fields to strings first to handle different data types
-                        fields = [str(field) for field in line]
-
-                        # The actual overlap width is usually the last column with -wo
-                        try:
-                            # Get overlap width from last field
-                            overlap_width = int(fields[-1])
-                            overlap_bp += overlap_width
-
-                            # Create a unique identifier for this overlap
-                            # Using the coordinates from both sets
-                            chrom_a = fields[0]
-                            start_a = int(fields[1])
-                            end_a = int(fields[2])
-                            chrom_b = fields[len(fields) // 2]  # Middle field is typically the start of second feature
-                            identifier = f"{chrom_a}:{start_a}-{end_a}_{chrom_b}"
-                            unique_overlaps.add(identifier)
-                        except (ValueError, IndexError) as e:
-                            # If parsing fails, try an alternative approach
-                            log += f"  Warning: Couldn't parse overlap width, falling back to alternative method: {str(e)}\n"
-
-                            # Alternative: manually calculate overlap from coordinates
-                            try:
-                                midpoint = len(fields) // 2
-                                start_a = int(fields[1])
-                                end_a = int(fields[2])
-                                start_b = int(fields[midpoint + 1])
-                                end_b = int(fields[midpoint + 2])
-
-                                overlap_start = max(start_a, start_b)
-                                overlap_end = min(end_a, end_b)
-
-                                if overlap_end > overlap_start:
-                                    overlap_bp += overlap_end - overlap_start
-                            except (ValueError, IndexError):
-                                # If even this fails, log the issue and continue
-                                log += f"  Warning: Couldn't calculate overlap from: {fields}\n"
-
-                    # Number of unique overlapping regions
-                    overlap_regions = len(unique_overlaps)
+                rows_a, rows_b, widths = index.pairs(i, j)
+                if len(widths) > 0:
+                    # Number of regions of the other set overlapping each region
+                    counts_a, counts_b = index.counts(i, j), index.counts(j, i)
+                    overlap_regions_count_a = int((counts_a > 0).sum())
+                    overlap_regions_count_b = int((counts_b > 0).sum())
+                    overlap_bp = int(widths.sum())
+                    # Distinct regions (by coordinates) of the first set with an overlap
+                    overlap_regions = len(
+                        index.frames[i].iloc[np.unique(rows_a)].drop_duplicates(["chrom", "start", "end"])
+                    )
 
                     # Calculate percentages
                     pct_of_set1 = (overlap_bp / stats[i]["Total_BP"]) * 100 if stats[i]["Total_BP"] > 0 else 0
@@ -1655,20 +1842,31 @@ def analyze_genomic_region_overlap(region_sets, output_prefix="overlap_analysis"
                             "Overlap_BP": overlap_bp,
                             "Pct_of_Set1": pct_of_set1,
                             "Pct_of_Set2": pct_of_set2,
+                            "Jaccard": jaccard_matrix[i, j],
                         }
                     )
 
-                    # Save detailed overlaps to file
+                    # Save detailed overlaps to file: both regions and the overlap width, as bedtools -wo
                     overlap_file = f"{output_prefix}_{set_names[i]}_{set_names[j]}_overlaps.bed"
-                    overlap_with_bases.saveas(overlap_file)
+                    pd.concat(
+                        [
+                            index.frames[i].iloc[rows_a].reset_index(drop=True),
+                            index.frames[j].iloc[rows_b].reset_index(drop=True),
+                            pd.Series(widths),
+                        ],
+                        axis=1,
+                    ).to_csv(overlap_file, sep="\t", header=False, index=False)
 
                     log += f"- Between {set_names[i]} and {set_names[j]}:\n"
                     log += f"  * Overlapping regions from set 1: {overlap_regions_count_a}\n"
                     log += f"  * Overlapping regions from set 2: {overlap_regions_count_b}\n"
                     log += f"  * Unique overlaps: {overlap_regions}\n"
+                    log += f"  * Most {set_names[j]} regions overlapping one {set_names[i]} region: {counts_a.max()}\n"
+                    log += f"  * Most {set_names[i]} regions overlapping one {set_names[j]} region: {counts_b.max()}\n"
                     log += f"  * Total overlap size: {overlap_bp} bp\n"
                     log += f"  * Percentage of {set_names[i]}: {pct_of_set1:.2f}%\n"
                     log += f"  * Percentage of {set_names[j]}: {pct_of_set2:.2f}%\n"
+                    log += f"  * Jaccard index: {jaccard_matrix[i, j]:.4f}\n"
                     log += f"  * Detailed overlaps saved to: {overlap_file}\n\n"
                 else:
                     # No overlaps found
@@ -1680,6 +1878,7 @@ def analyze_genomic_region_overlap(region_sets, output_prefix="overlap_analysis"
                             "Overlap_BP": 0,
                             "Pct_of_Set1": 0,
                             "Pct_of_Set2": 0,
+                            "Jaccard": 0.0,
                         }
                     )
                     log += f"- No overlaps found between {set_names[i]} and {set_names[j]}\n\n"
@@ -1698,14 +1897,102 @@ def analyze_genomic_region_overlap(region_sets, output_prefix="overlap_analysis"
                     }
                 )
 
+    # Multi-set matrices: bp overlap and Jaccard index of the merged sets, and the fraction of each row
+    # set's regions overlapping the column set
+    region_fraction = np.array(
+        [
+            [index.overlaps_any(i, j).mean() if len(index.frames[i]) else 0.0 for j in range(len(index))]
+            for i in range(len(index))
+        ]
+    ).reshape(len(index), len(index))
+    matrix_files = {
+        "overlap_bp": f"{output_prefix}_overlap_bp_matrix.tsv",
+        "jaccard": f"{output_prefix}_jaccard_matrix.tsv",
+        "region_fraction": f"{output_prefix}_region_fraction_matrix.tsv",
+    }
+    for name, matrix in (
+        ("overlap_bp", overlap_bp_matrix),
+        ("jaccard", jaccard_matrix),
+        ("region_fraction", region_fraction),
+    ):
+        pd.DataFrame(matrix, index=set_names, columns=set_names).to_csv(matrix_files[name], sep="\t")
+
     # Save summary statistics to file
     summary_file = f"{output_prefix}_summary.tsv"
     summary_df = pd.DataFrame(results)
     summary_df.to_csv(summary_file, sep="\t", index=False)
 
     log += "## Summary\n"
-    log += f"- Total sets analyzed: {len(bedtools)}\n"
+    log += f"- Total sets analyzed: {len(index)}\n"
     log += f"- Pairwise comparisons: {len(results)}\n"
     log += f"- Summary statistics saved to: {summary_file}\n"
+    log += "- Overlap matrices (bp of merged sets, Jaccard index, fraction of regions) saved to: "
+    log += f"{', '.join(matrix_files.values())}\n"
+
+    return log
+
+
+def find_nearest_genomic_regions(query_regions, reference_regions, output_file="nearest_regions.tsv"):
+    """Find the nearest reference region to each query region, e.g. the closest gene or peak.
 
+    Parameters
+    ----------
+    query_regions : str or list
+        Path to a BED file, or a list of tuples/lists with format (chrom, start, end) or (chrom, start, end, name)
+    reference_regions : str or list
+        Reference regions, in the same formats
+    output_file : str, optional
+        Path to save the nearest region of every query region (default: "nearest_regions.tsv")
+
+    Returns
+    -------
+    str
+        Research log summarizing the distances to the nearest reference regions
+
+    """
+    from datetime import datetime
+
+    log = "# Nearest Genomic Region Analysis\n"
+    log += f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+
+    log += "## Input Processing\n"
+    frames = []
+    for label, regions in (("query", query_regions), ("reference", reference_regions)):
+        try:
+            frames.append(_read_regions(regions))
+        except FileNotFoundError:
+            log += f"- Error: {label} BED file not found: {regions}\n"
+        except (OSError, ValueError) as e:
+            log += f"- Error: could not read the {label} regions: {str(e)}\n"
+    if len(frames) < 2:
+        return log
+
+    index = _RegionSets(frames)
+    queries, references = index.frames
+    log += f"- Query regions: {len(queries)}\n"
+    log += f"- Reference regions: {len(references)}\n\n"
+
+    rows, distances = index.nearest(0, 1)
+    found = rows >= 0
+    # Row -1 (nothing on the same chromosome, or no reference regions at all) reindexes to an empty row
+    nearest = references.astype({"start": "Int64", "end": "Int64"}).reindex(rows).reset_index(drop=True)
+    table = pd.concat(
+        [
+            queries.add_prefix("query_"),
+            nearest.add_prefix("nearest_"),
+            pd.Series(distances, dtype="Int64", name="distance").where(found),
+        ],
+        axis=1,
+    )
+    table.to_csv(output_file, sep="\t", index=False)
+
+    log += "## Results\n"
+    log += f"- Query regions with a reference region on the same chromosome: {int(found.sum())}\n"
+    if found.any():
+        distance = distances[found]
+        log += f"- Overlapping or book-ended (distance 0): {int((distance == 0).sum())}\n"
+        log += f"- Within 1 kb: {int((distance <= 1000).sum())}\n"
+        log += f"- Within 10 kb: {int((distance <= 10000).sum())}\n"
+        log += f"- Median distance: {float(np.median(distance)):.0f} bp\n"
+    log += f"- Nearest regions saved to: {output_file}\n"
     return log
@@ -1,9 +1,12 @@
+import functools
 import os
+import string
 import subprocess
 import tempfile
 from collections import namedtuple
 from typing import Any
 
+import numpy as np
 import pandas as pd
 import requests
 from Bio import Entrez, Restriction, SeqIO
@@ -11,16 +14,180 @@ from Bio.Seq import Seq
 from Bio.SeqUtils import MeltingTemp as mt
 from bs4 import BeautifulSoup
 
+from biomni.data_lake.catalog import data_lake_file
 
-def annotate_open_reading_frames(sequence, min_length, search_reverse=False, filter_subsets=False):
-    """Find all Open Reading Frames (ORFs) in a DNA sequence using Biopython.
+_ORF_FIELDS = ["sequence", "aa_sequence", "start", "end", "strand", "frame"]
+
+
+@functools.lru_cache(maxsize=1)
+def _codon_table() -> np.ndarray:
+    """Amino acid byte of each codon index (16 * first + 4 * second + third base code); 64 is ambiguous."""
+    from Bio.Data import CodonTable
+
+    table = CodonTable.unambiguous_dna_by_id[1]
+    bases = "ACGT"
+    amino_acids = [table.forward_table.get(a + b + c, "*") for a in bases for b in bases for c in bases] + ["X"]
+    return np.frombuffer("".join(amino_acids).encode(), dtype=np.uint8)
+
+
+def _scan_orfs(strand_seq: str, codes: np.ndarray, min_length: int, strand: str, seq_length: int) -> dict:
+    """Find the ORFs of the three frames of one strand: every ATG paired with the next in-frame stop codon.
+
+    Args:
+        strand_seq: Upper-cased strand sequence (the reverse complement for the "-" strand)
+        codes: Base codes of strand_seq
+        min_length: Minimum ORF length in nucleotides, stop codon included
+        strand: "+" or "-"
+        seq_length: Length of the sequence, to map reverse strand positions back to the forward strand
+
+    Returns:
+        Columns start, end, strand, frame, aa_sequence and sequence, in frame order and then by stop and
+        start codon
+    """
+    columns = {"start": [], "end": [], "frame": [], "aa_sequence": [], "sequence": []}
+    codon_table = _codon_table()
+    for offset in range(3):
+        n = (len(codes) - offset) // 3
+        if n == 0:
+            continue
+        triplets = codes[offset : offset + 3 * n].reshape(n, 3).astype(np.int64)
+        codons = np.where((triplets > 3).any(axis=1), 64, triplets[:, 0] * 16 + triplets[:, 1] * 4 + triplets[:, 2])
+        amino_acids = codon_table[codons]
+        stops = np.flatnonzero(amino_acids == ord("*"))
+        starts = np.flatnonzero(codons == 14)  # ATG
+        # Each start codon closes at the first stop codon after it; starts after the last stop have none
+        next_stop = np.searchsorted(stops, starts)
+        has_stop = next_stop < len(stops)
+        starts, stops = starts[has_stop], stops[next_stop[has_stop]]
+        keep = (stops - starts + 1) * 3 >= min_length
+        starts, stops = starts[keep], stops[keep]
+
+        frame_aa = amino_acids.tobytes().decode()
+        nt_start, nt_end = starts * 3 + offset, stops * 3 + 3 + offset
+        for codon_start, codon_stop, orf_start, orf_end in zip(
+            starts.tolist(), stops.tolist(), nt_start.tolist(), nt_end.tolist(), strict=True
+        ):
+            orf_seq = strand_seq[orf_start:orf_end]
+            aa_seq = frame_aa[codon_start:codon_stop]
+            if "X" in aa_seq:
+                # Ambiguous codons translate as Biopython resolves them
+                aa_seq = str(Seq(orf_seq).translate(to_stop=True))
+            columns["sequence"].append(orf_seq)
+            columns["aa_sequence"].append(aa_seq)
+        if strand == "-":
+            nt_start, nt_end = seq_length - nt_end, seq_length - nt_start
+        columns["start"].append(nt_start)
+        columns["end"].append(nt_end)
+        columns["frame"].append(np.full(len(starts), offset + 1 if strand == "+" else -(offset + 1)))
+
+    for key in ("start", "end", "frame"):
+        columns[key] = np.concatenate(columns[key]) if columns[key] else np.empty(0, dtype=np.int64)
+    columns["strand"] = np.full(len(columns["start"]), strand, dtype=object)
+    return columns
+
+
+def _nested_orfs(start: np.ndarray, end: np.ndarray, strand: np.ndarray) -> np.ndarray:
+    """Mark the ORFs lying within another ORF on the same strand, in O(n log n)."""
+    nested = np.zeros(len(start), dtype=bool)
+    for value in ("+", "-"):
+        rows = np.flatnonzero(strand == value)
+        if len(rows) < 2:
+            continue
+        # By start, longest first: an ORF is nested when an earlier one reaches at least as far
+        order = rows[np.lexsort((-end[rows], start[rows]))]
+        reach = np.maximum.accumulate(end[order])
+        nested[order[1:]] = reach[:-1] >= end[order[1:]]
+    return nested
+
+
+def _find_orfs(sequence: str, min_length: int, search_reverse: bool = False, filter_subsets: bool = False):
+    """Return the ORFs of an upper-cased sequence as columns (see `_scan_orfs`), longest first."""
+    parts = [
+        _scan_orfs(
+            sequence,
+            _BASE_CODES[np.frombuffer(sequence.encode("ascii", "replace"), np.uint8)],
+            min_length,
+            "+",
+            len(sequence),
+        )
+    ]
+    if search_reverse:
+        rev_comp = str(Seq(sequence).reverse_complement())
+        parts.append(
+            _scan_orfs(
+                rev_comp,
+                _BASE_CODES[np.frombuffer(rev_comp.encode("ascii", "replace"), np.uint8)],
+                min_length,
+                "-",
+                len(sequence),
+            )
+        )
+    columns = {
+        key: np.concatenate(
+            [np.asarray(part[key], dtype=object if key in ("sequence", "aa_sequence") else None) for part in parts]
+        )
+        for key in _ORF_FIELDS
+    }
+    if filter_subsets:
+        keep = ~_nested_orfs(columns["start"], columns["end"], columns["strand"])
+        columns = {key: values[keep] for key, values in columns.items()}
+    order = np.argsort(columns["start"] - columns["end"], kind="stable")
+    return {key: values[order] for key, values in columns.items()}
+
+
+def _orf_table(columns: dict, record_id: str | None = None):
+    """Columnar ORF result: one row per ORF without the nucleotide sequence, which is a slice of the input."""
+    table = pd.DataFrame(
+        {
+            "start": columns["start"].astype(np.int64),
+            "end": columns["end"].astype(np.int64),
+            "strand": pd.Categorical(columns["strand"], categories=["+", "-"]),
+            "frame": columns["frame"].astype(np.int8),
+            "length": (columns["end"] - columns["start"]).astype(np.int64),
+            "aa_sequence": columns["aa_sequence"],
+        }
+    )
+    if record_id is not None:
+        table.insert(0, "record", record_id)
+    return table
+
+
+def iter_open_reading_frames(sequence, min_length, search_reverse=False, filter_subsets=False):
+    """Scan a multi-record FASTA or GenBank file for ORFs one record at a time.
+
+    Records are read and scanned lazily, so whole genomes and large assemblies stream through in constant
+    memory per record.
+
+    Args:
+        sequence (str): Path to a FASTA or GenBank file, or a DNA sequence
+        min_length (int): Minimum length of ORF in nucleotides
+        search_reverse (bool): Whether to also search the reverse complement strand
+        filter_subsets (bool): Whether to drop ORFs contained in another ORF on the same strand
+
+    Yields:
+        pandas.DataFrame per record with columns record, start, end, strand, frame, length and aa_sequence,
+        longest ORF first
+
+    """
+    for record_id, record_seq in _iter_sequences(sequence):
+        yield _orf_table(_find_orfs(record_seq, min_length, search_reverse, filter_subsets), record_id)
+
+
+def annotate_open_reading_frames(sequence, min_length, search_reverse=False, filter_subsets=False, columnar=False):
+    """Find all Open Reading Frames (ORFs) in a DNA sequence.
     Searches both forward and reverse complement strands.
 
+    Each frame is scanned as an array of codons and every start codon is paired with its stop codon by a
+    binary search, so bacterial genomes are annotated in seconds. For genome-scale inputs, use
+    columnar=True, or `iter_open_reading_frames` to stream the records of a FASTA file.
+
     Args:
-        sequence (str): DNA sequence
+        sequence (str): DNA sequence, or path to a FASTA or GenBank file (all records are scanned)
         min_length (int): Minimum length of ORF in nucleotides
         search_reverse (bool): Whether to search the reverse complement strand (default: False unless you want to search for reverse ORFs)
-        filter_nested (bool): Whether to filter out ORFs with same end but later start (default: False unless you want to remove nested ORFs)
+        filter_subsets (bool): Whether to filter out ORFs contained in another ORF on the same strand
+            (default: False unless you want to remove nested ORFs)
+        columnar (bool): Return the ORFs as one pandas DataFrame (without nucleotide sequences) instead of a list
 
     Returns:
         dict: Dictionary containing:
@@ -33,112 +200,52 @@ def annotate_open_reading_frames(sequence, min_length, search_reverse=False, fil
                 - end: End position in original sequence
                 - strand: '+' for forward strand, '-' for reverse complement
                 - frame: Reading frame (1,2,3 for forward; -1,-2,-3 for reverse)
+                - record: Record id (only when sequence is a file)
+              With columnar=True, a DataFrame with columns (record,) start, end, strand, frame, length and
+              aa_sequence
 
     """
-    ORF = namedtuple("ORF", ["sequence", "aa_sequence", "start", "end", "strand", "frame"])
-
-    def find_orfs_in_frame(seq_str, frame, strand):
-        """Helper function to find ORFs in a specific frame."""
-        orfs = []
-        seq_length = len(seq_str)
-
-        # Adjust sequence based on frame
-        offset = frame - 1  # Convert 1-based frame to 0-based index
-        frame_seq = seq_str[offset:]
-
-        # Find all start codons
-        start_positions = []
-        stop_positions = []
-
-        for i in range(0, len(frame_seq) - 2, 3):
-            codon = frame_seq[i : i + 3]
-            if len(codon) != 3:  # Skip incomplete codons
-                continue
-
-            # Record positions of start and stop codons
-            if codon == "ATG":
-                start_positions.append(i)
-            elif codon in ["TAA", "TAG", "TGA"]:
-                stop_positions.append(i)
-
-                # Process any active ORFs that end at this stop codon
-                while start_positions and start_positions[0] < i:
-                    start_pos = start_positions.pop(0)
-                    orf_seq = frame_seq[start_pos : i + 3]
-
-                    # Check if ORF meets minimum length requirement
-                    if len(orf_seq) >= min_length:
-                        # Convert positions to original sequence coordinates
-                        orig_start = start_pos + offset
-                        orig_end = i + offset + 3
-
-                        # For reverse strand, convert positions
-                        if strand == "-":
-                            orig_start = seq_length - orig_end
-                            orig_end = seq_length - (start_pos + offset)
-
-                        # Create Seq object for translation
-                        orf_bio_seq = Seq(orf_seq)
-                        aa_seq = str(orf_bio_seq.translate(to_stop=True))
-
-                        orfs.append(
-                            ORF(
-                                sequence=orf_seq,
-                                aa_sequence=aa_seq,
-                                start=orig_start,
-                                end=orig_end,
-                                strand=strand,
-                                frame=frame if strand == "+" else -frame,
-                            )
-                        )
-
-        return orfs
-
-    # Convert input to string and uppercase
-    sequence = str(sequence).upper()
-    seq_obj = Seq(sequence)
-
-    all_orfs = []
-
-    # Search forward strand
-    for frame in range(1, 4):
-        all_orfs.extend(find_orfs_in_frame(sequence, frame, "+"))
-
-    # Search reverse complement strand
-    if search_reverse:
-        rev_comp = str(seq_obj.reverse_complement())
-        for frame in range(1, 4):
-            all_orfs.extend(find_orfs_in_frame(rev_comp, frame, "-"))
-
-    if filter_subsets:
-        # Sort ORFs by length first (longest first)
-        all_orfs.sort(key=lambda x: len(x.sequence), reverse=True)
-
-        # Filter out ORFs that are contained within other ORFs on the same strand
-        filtered_orfs = []
-        for _i, orf in enumerate(all_orfs):
-            is_subset = False
-            for larger_orf in filtered_orfs:
-                if orf.strand == larger_orf.strand and orf.start >= larger_orf.start and orf.end <= larger_orf.end:
-                    is_subset = True
-                    break
-            if not is_subset:
-                filtered_orfs.append(orf)
-        all_orfs = filtered_orfs
+    records = _read_sequences(str(sequence))
+    is_file = not (len(records) == 1 and records[0][0] is None)
+    fields = _ORF_FIELDS + ["record"] if is_file else _ORF_FIELDS
+    ORF = namedtuple("ORF", fields)
+
+    tables, all_orfs = [], []
+    for record_id, record_seq in records:
+        columns = _find_orfs(record_seq, min_length, search_reverse, filter_subsets)
+        if columnar:
+            tables.append(_orf_table(columns, record_id))
+            continue
+        if is_file:
+            columns["record"] = [record_id] * len(columns["start"])
+        all_orfs.extend(
+            ORF(*values)
+            for values in zip(
+                *(
+                    columns[field].tolist() if isinstance(columns[field], np.ndarray) else columns[field]
+                    for field in fields
+                ),
+                strict=True,
+            )
+        )
 
-    # Sort ORFs by length (longest first)
-    all_orfs.sort(key=lambda x: len(x.sequence), reverse=True)
+    if columnar:
+        orfs = pd.concat(tables, ignore_index=True) if tables else _orf_table(_find_orfs("", min_length))
+        lengths, strands = orfs["length"].to_numpy(), orfs["strand"].to_numpy()
+    else:
+        orfs = all_orfs
+        # Records are concatenated, so the longest-first order holds across them
+        if is_file:
+            orfs.sort(key=lambda orf: orf.end - orf.start, reverse=True)
+        lengths = np.array([orf.end - orf.start for orf in orfs], dtype=np.int64)
+        strands = np.array([orf.strand for orf in orfs], dtype=object)
 
     # Calculate summary statistics
-    forward_orfs = len([orf for orf in all_orfs if orf.strand == "+"])
-    reverse_orfs = len([orf for orf in all_orfs if orf.strand == "-"])
-    avg_length = sum(len(orf.sequence) for orf in all_orfs) / len(all_orfs) if all_orfs else 0
-
     summary_stats = {
-        "total_orfs": len(all_orfs),
-        "forward_orfs": forward_orfs,
-        "reverse_orfs": reverse_orfs,
-        "avg_length": round(avg_length, 1),
+        "total_orfs": len(orfs),
+        "forward_orfs": int((strands == "+").sum()),
+        "reverse_orfs": int((strands == "-").sum()),
+        "avg_length": round(float(lengths.mean()), 1) if len(lengths) else 0,
     }
 
     explanation = (
@@ -154,13 +261,15 @@ def annotate_open_reading_frames(sequence, min_length, search_reverse=False, fil
         "  * start: Start position in original sequence (0-based)\n"
         "  * end: End position in original sequence\n"
         "  * strand: '+' for forward strand, '-' for reverse complement\n"
-        "  * frame: Reading frame (1,2,3 for forward; -1,-2,-3 for reverse)"
+        "  * frame: Reading frame (1,2,3 for forward; -1,-2,-3 for reverse)\n"
+        "  * record: Record id of the ORF (only when the input is a sequence file)\n"
+        "  With columnar output, orfs is a table with a length column and no nucleotide sequence"
     )
 
     return {
         "explanation": explanation,
         "summary_stats": summary_stats,
-        "orfs": all_orfs,
+        "orfs": orfs,
     }
 
 
@@ -419,13 +528,145 @@ def get_plasmid_sequence(identifier: str, is_addgene: bool = None) -> dict[str,
         return _get_sequence_from_ncbi(identifier)
 
 
-def align_sequences(long_seq: str, short_seqs: str | list[str]) -> list[dict]:
-    """Align short sequences (primers) to a longer sequence, allowing for one mismatch.
+# Base codes for seed lookups; anything but A, C, G and T gets 4 and never seeds a match
+_BASE_CODES = np.full(256, 4, dtype=np.uint8)
+_BASE_CODES[np.frombuffer(b"ACGT", dtype=np.uint8)] = np.arange(4, dtype=np.uint8)
+_COMPLEMENT = str.maketrans("ACGTacgt", "TGCAtgca")
+# Seeds are packed two bits per base into uint64 keys; longer seeds add little selectivity on real genomes
+_MAX_SEED = 16
+# Shorter seeds hit too many positions to beat a full scan
+_MIN_SEED = 4
+_SEQUENCE_FILE_FORMATS = {".gb": "genbank", ".gbk": "genbank", ".genbank": "genbank", ".embl": "embl"}
+
+
+def _iter_sequences(sequence: str):
+    """Yield (record id, upper-cased sequence) pairs of a sequence string or a FASTA/GenBank file, lazily.
+
+    A sequence string yields one pair with record id None.
+    """
+    if len(sequence) < 4096 and os.path.isfile(sequence):
+        file_format = _SEQUENCE_FILE_FORMATS.get(os.path.splitext(sequence)[1].lower(), "fasta")
+        for record in SeqIO.parse(sequence, file_format):
+            yield record.id, str(record.seq).upper()
+    else:
+        yield None, sequence.upper()
+
+
+def _read_sequences(sequence: str) -> list[tuple[str | None, str]]:
+    """Return the (record id, upper-cased sequence) pairs of `_iter_sequences` as a list."""
+    return list(_iter_sequences(sequence))
+
+
+class _SequenceIndex:
+    """Seed index over one target sequence for approximate matching of many short sequences.
+
+    A pattern of length m with at most k mismatches contains, by the pigeonhole principle, an exact copy
+    of at least one of k + 1 disjoint seeds. Seeds are looked up in a sorted array of the target's packed
+    k-mers, and the candidate windows are verified with one vectorized comparison.
+    """
+
+    def __init__(self, sequence: str):
+        self.bytes = np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)
+        self.codes = _BASE_CODES[self.bytes]
+        # seed length -> (sorted packed k-mers, their positions)
+        self._seeds = {}
+
+    def __len__(self) -> int:
+        return len(self.bytes)
+
+    def _seed_index(self, length: int):
+        if length not in self._seeds:
+            n = len(self) - length + 1
+            kmers = np.zeros(n, dtype=np.uint64)
+            invalid = np.zeros(n, dtype=bool)
+            for j in range(length):
+                window = self.codes[j : j + n]
+                kmers <<= np.uint64(2)
+                kmers |= window & 3
+                invalid |= window > 3
+            positions = np.flatnonzero(~invalid)
+            kmers = kmers[positions]
+            order = np.argsort(kmers, kind="stable")
+            self._seeds[length] = (kmers[order], positions[order])
+        return self._seeds[length]
+
+    def find(self, pattern: str, max_mismatches: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """Return the start positions where pattern matches with at most max_mismatches, and the counts.
+
+        Args:
+            pattern: Upper-cased sequence to match on the forward strand of the target
+            max_mismatches: Mismatch budget; a non-ACGT base in the target counts as a mismatch
+
+        Returns:
+            (positions, mismatch counts), positions ascending
+        """
+        m = len(pattern)
+        if m == 0 or m > len(self):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        query = np.frombuffer(pattern.encode("ascii", "replace"), dtype=np.uint8)
+        query_codes = _BASE_CODES[query]
+        segment = m // (max_mismatches + 1)
+        seed = min(_MAX_SEED, segment)
+        n = len(self) - m + 1
+
+        if seed < _MIN_SEED or (query_codes > 3).any():
+            # Full scan, one vectorized comparison per pattern base
+            counts = np.zeros(n, dtype=np.int32)
+            for j in range(m):
+                counts += self.bytes[j : j + n] != query[j]
+            starts = np.flatnonzero(counts <= max_mismatches)
+            return starts, counts[starts].astype(np.int64)
+
+        kmers, positions = self._seed_index(seed)
+        candidates = []
+        for i in range(max_mismatches + 1):
+            offset = i * segment
+            key = np.uint64(0)
+            for code in query_codes[offset : offset + seed]:
+                key = (key << np.uint64(2)) | np.uint64(code)
+            lo, hi = np.searchsorted(kmers, key, side="left"), np.searchsorted(kmers, key, side="right")
+            candidates.append(positions[lo:hi] - offset)
+        starts = np.unique(np.concatenate(candidates))
+        starts = starts[(starts >= 0) & (starts < n)]
+        counts = (self.bytes[starts[:, None] + np.arange(m)] != query).sum(axis=1)
+        keep = counts <= max_mismatches
+        return starts[keep], counts[keep].astype(np.int64)
+
+
+@functools.lru_cache(maxsize=8)
+def _sequence_index(sequence: str) -> _SequenceIndex:
+    return _SequenceIndex(sequence)
+
+
+def _match_primers(target: str, primers: list[str], max_mismatches: int = 1) -> list[list[dict]]:
+    """Align upper-cased primers to both strands of a target; see `align_sequences` for the alignment fields."""
+    index = _sequence_index(target)
+    results = []
+    for primer in primers:
+        alignments = []
+        for pattern, strand in ((primer, "+"), (primer.translate(_COMPLEMENT)[::-1], "-")):
+            starts, counts = index.find(pattern, max_mismatches)
+            for start, count in zip(starts.tolist(), counts.tolist(), strict=True):
+                mismatches = []
+                if count:
+                    window = target[start : start + len(pattern)]
+                    mismatches = [(j, pattern[j], window[j]) for j in range(len(pattern)) if window[j] != pattern[j]]
+                alignments.append({"position": start, "strand": strand, "mismatches": mismatches})
+        results.append(alignments)
+    return results
+
+
+def align_sequences(long_seq: str, short_seqs: str | list[str], max_mismatches: int = 1) -> list[dict]:
+    """Align short sequences (primers) to a longer sequence, allowing for up to max_mismatches mismatches.
     Checks both forward and reverse complement strands.
 
+    Seeds from each primer are looked up in an index of the target and only the candidate windows are
+    compared, so many primers can be checked against whole plasmids or genomes at once.
+
     Args:
-        long_seq (str): Target DNA sequence
+        long_seq (str): Target DNA sequence, or path to a FASTA or GenBank file (all records are searched)
         short_seqs (Union[str, List[str]]): Single primer or list of primers
+        max_mismatches (int): Maximum number of mismatches per alignment (default: 1)
 
     Returns:
         List[Dict]: List of alignment results for each short sequence, including:
@@ -436,45 +677,19 @@ def align_sequences(long_seq: str, short_seqs: str | list[str]) -> list[dict]:
                 - strand: '+' for forward strand, '-' for reverse complement
                 - mismatches: list of tuples (position, expected_base, found_base)
                   for any mismatches
+                - record: id of the matching record, when long_seq is a file
 
     """
     # Standardize input
-    long_seq = long_seq.upper()
     short_seqs = [short_seqs.upper()] if isinstance(short_seqs, str) else [seq.upper() for seq in short_seqs]
 
-    def reverse_complement(seq):
-        """Helper function to get reverse complement of a sequence."""
-        complement = {"A": "T", "T": "A", "C": "G", "G": "C"}
-        return "".join(complement.get(base, base) for base in reversed(seq))
-
-    results = []
-
-    for short_seq in short_seqs:
-        alignments = []
-        seq_len = len(short_seq)
-
-        # Check both forward and reverse complement orientations
-        sequences_to_check = [
-            (short_seq, "+"),  # Forward strand
-            (reverse_complement(short_seq), "-"),  # Reverse complement
-        ]
-
-        for seq_to_align, strand in sequences_to_check:
-            # Check each possible position in the long sequence
-            for i in range(len(long_seq) - seq_len + 1):
-                window = long_seq[i : i + seq_len]
-                mismatches = []
-
-                # Compare sequences base by base
-                for j in range(seq_len):
-                    if window[j] != seq_to_align[j]:
-                        mismatches.append((j, seq_to_align[j], window[j]))
-
-                # If we have 0 or 1 mismatches, record the alignment
-                if len(mismatches) <= 1:
-                    alignments.append({"position": i, "strand": strand, "mismatches": mismatches})
-
-        results.append({"sequence": short_seq, "alignments": alignments})
+    results = [{"sequence": short_seq, "alignments": []} for short_seq in short_seqs]
+    for record_id, target in _read_sequences(long_seq):
+        for result, alignments in zip(results, _match_primers(target, short_seqs, max_mismatches), strict=True):
+            if record_id is not None:
+                for alignment in alignments:
+                    alignment["record"] = record_id
+            result["alignments"].extend(alignments)
 
     return {
         "explanation": (
@@ -487,28 +702,41 @@ def align_sequences(long_seq: str, short_seqs: str | list[str]) -> list[dict]:
             "    - mismatches: List of mismatches, each containing:\n"
             "      * position: Position in the short sequence where mismatch occurs\n"
             "      * expected: Base expected from short sequence\n"
-            "      * found: Base found in target sequence"
+            "      * found: Base found in target sequence\n"
+            "    - record: Record id of the match (only when the target is a sequence file)"
         ),
         "sequences": results,
     }
 
 
-def pcr_simple(sequence: str, forward_primer: str, reverse_primer: str, circular: bool = False) -> dict:
+def pcr_simple(
+    sequence: str, forward_primer: str, reverse_primer: str, circular: bool = False, max_mismatches: int = 1
+) -> dict:
     """Simulate PCR amplification with given primers and sequence.
 
     Args:
-        sequence (str): Either a sequence string or path to plasmid file
+        sequence (str): Either a sequence string or path to plasmid file (FASTA or GenBank; the first record is used)
         forward_primer (str): Forward primer sequence (5' to 3')
         reverse_primer (str): Reverse primer sequence (5' to 3')
         circular (bool): Whether the sequence is circular (default: False)
+        max_mismatches (int): Maximum number of mismatches per primer binding site (default: 1)
 
     Returns:
         dict: Results of PCR simulation including products and primer binding details
 
     """
-    # First check if primers are valid using existing function
-    fwd_result = align_sequences(sequence, forward_primer)["sequences"][0]["alignments"]
-    rev_result = align_sequences(sequence, str(Seq(reverse_primer).reverse_complement()))["sequences"][0]["alignments"]
+    if len(sequence) < 4096 and os.path.isfile(sequence):
+        records = _read_sequences(sequence)
+        if not records:
+            raise ValueError(f"No sequence records found in {sequence}")
+        sequence = records[0][1]
+
+    # First check if primers are valid, aligning both in one pass over the template
+    fwd_result, rev_result = _match_primers(
+        sequence.upper(),
+        [forward_primer.upper(), str(Seq(reverse_primer).reverse_complement()).upper()],
+        max_mismatches,
+    )
 
     if not fwd_result or not rev_result:
         return {
@@ -599,8 +827,299 @@ def pcr_simple(sequence: str, forward_primer: str, reverse_primer: str, circular
     }
 
 
+# Biopython's enzyme batches, usable as panel names
+RESTRICTION_BATCHES = ("AllEnzymes", "CommOnly", "NonComm")
+# One-hot base bits for recognition-site matching; other characters only match an N in a site
+_BASE_BITS = np.zeros(256, dtype=np.uint8)
+_BASE_BITS[np.frombuffer(b"ACGT", dtype=np.uint8)] = [1, 2, 4, 8]
+# Dropped from sequences before a restriction scan, as Bio.Restriction does
+_NON_SEQUENCE_CHARACTERS = str.maketrans("", "", string.whitespace + string.digits)
+
+
+def _restriction_enzymes(enzymes) -> list:
+    """Resolve enzyme names, batch names (see RESTRICTION_BATCHES) and Biopython enzymes to enzyme classes."""
+    if isinstance(enzymes, str):
+        enzymes = [enzymes]
+    resolved = {}
+    for enzyme in enzymes:
+        if isinstance(enzyme, str) and enzyme in RESTRICTION_BATCHES:
+            resolved.update((str(e), e) for e in sorted(getattr(Restriction, enzyme), key=str))
+            continue
+        name = enzyme
+        if isinstance(enzyme, str):
+            enzyme = getattr(Restriction, enzyme, None) if enzyme.isidentifier() else None
+        if not (isinstance(enzyme, type) and issubclass(enzyme, Restriction.Restriction.AbstractCut)):
+            raise ValueError(f"Unknown restriction enzyme: {name}")
+        resolved.setdefault(str(enzyme), enzyme)
+    return list(resolved.values())
+
+
+class _RestrictionPanel:
+    """A set of restriction enzymes compiled once for scanning many sequences.
+
+    The recognition sites (both orientations) of all enzymes are deduplicated into one pattern list, each
+    anchored on its most specific 4-base window. A scan concatenates the sequences, sorts the positions by
+    4-mer once, and verifies each pattern only at the positions of its anchor; the few patterns without a
+    usable anchor are checked with a vectorized full scan. Cut positions follow Bio.Restriction exactly.
+    """
+
+    def __init__(self, enzymes):
+        from Bio.Data.IUPACData import ambiguous_dna_values
+
+        # IUPAC site letters as base bit masks; N (any base, "." in Biopython's site regex) is 0 and never checked
+        site_bits = {
+            letter: 0 if letter == "N" else int(_BASE_BITS[np.frombuffer(bases.encode(), np.uint8)].sum())
+            for letter, bases in ambiguous_dna_values.items()
+        }
+
+        self.enzymes = _restriction_enzymes(enzymes)
+        self.names = [str(enzyme) for enzyme in self.enzymes]
+        patterns: dict[str, int] = {}
+        self._forward, self._reverse = [], []
+        self._forward_offsets, self._reverse_offsets = [], []
+        for enzyme in self.enzymes:
+            # A few REBASE sites list alternatives separated by "|"; Bio.Restriction searches only the first
+            site = str(enzyme.site).upper().split("|")[0]
+            self._forward.append(patterns.setdefault(site, len(patterns)))
+            # Palindromic sites are only searched in the forward orientation
+            reverse = str(Seq(site).reverse_complement()) if not enzyme.is_palindromic() else None
+            self._reverse.append(patterns.setdefault(reverse, len(patterns)) if reverse else -1)
+            # Cut offsets from a site starting at 1-based position 0, on the forward and the reverse strand:
+            # fst5/scd5 after the site start, fst3/scd3 before it, as documented for Bio.Restriction enzymes.
+            # Enzymes that do not cut (fst5 None) report the site start
+            fst5, fst3, scd5, scd3, _ = enzyme.characteristic()
+            self._forward_offsets.append([cut for cut in (fst5, scd5) if cut is not None] or [0])
+            self._reverse_offsets.append([-cut for cut in (fst3, scd3) if cut is not None] or [0])
+
+        self._patterns = []
+        for pattern in patterns:
+            masks = np.array([site_bits[letter] for letter in pattern], dtype=np.uint8)
+            self._patterns.append((masks, self._anchor(masks)))
+        self.max_size = max((len(masks) for masks, _ in self._patterns), default=1)
+
+    def __len__(self) -> int:
+        return len(self.enzymes)
+
+    @staticmethod
+    def _anchor(masks):
+        """Return the 4-base window with the fewest concrete expansions as (offset, 4-mer codes), or None."""
+        best = None
+        for offset in range(len(masks) - 3):
+            window = masks[offset : offset + 4]
+            if (window == 0).any():
+                continue
+            choices = [[code for code in range(4) if mask >> code & 1] for mask in window.tolist()]
+            codes = np.array(
+                [
+                    a * 64 + b * 16 + c * 4 + d
+                    for a in choices[0]
+                    for b in choices[1]
+                    for c in choices[2]
+                    for d in choices[3]
+                ]
+            )
+            if len(codes) <= 16 and (best is None or len(codes) < len(best[1])):
+                best = (offset, codes)
+        return best
+
+    def _match(self, bits, bounds, order, pattern_id):
+        """Return the starts of all matches of a pattern in the concatenated sequences, ascending."""
+        masks, anchor = self._patterns[pattern_id]
+        n = len(bits) - len(masks) + 1
+        if n <= 0:
+            return np.empty(0, dtype=np.int64)
+        if anchor is None:
+            ok = np.ones(n, dtype=bool)
+            for j in np.flatnonzero(masks):
+                ok &= (bits[j : j + n] & masks[j]) != 0
+            return np.flatnonzero(ok)
+        offset, codes = anchor
+        starts = np.concatenate([order[bounds[code] : bounds[code + 1]] for code in codes]) - offset
+        starts = starts[(starts >= 0) & (starts < n)]
+        for j in np.flatnonzero(masks):
+            if not offset <= j < offset + 4:
+                starts = starts[(bits[starts + j] & masks[j]) != 0]
+        return np.sort(starts)
+
+    def scan(self, records, circular=False):
+        """Find the cut sites of every enzyme in many sequences in one pass.
+
+        Args:
+            records: List of (name, sequence) pairs
+            circular: Whether the sequences are circular; a bool, or one per record
+
+        Returns:
+            (record index, enzyme index, cut) arrays sorted by record, enzyme and cut, where cut is the
+            0-based position of the cut on the top strand (Bio.Restriction's position minus one)
+        """
+        circular = np.broadcast_to(np.asarray(circular, dtype=bool), (len(records),))
+        seqs = [
+            np.frombuffer(
+                str(sequence).translate(_NON_SEQUENCE_CHARACTERS).upper().encode("ascii", "replace"), dtype=np.uint8
+            )
+            for _, sequence in records
+        ]
+        lengths = np.array([len(seq) for seq in seqs], dtype=np.int64)
+        # Circular sequences are extended over the origin; a newline separates records as it matches no site
+        parts, starts = [], []
+        position = 0
+        for seq, is_circular in zip(seqs, circular, strict=True):
+            extended = np.concatenate([seq, seq[: self.max_size - 1]]) if is_circular else seq
+            parts += [extended, np.frombuffer(b"\n", dtype=np.uint8)]
+            starts.append(position)
+            position += len(extended) + 1
+        data = (
+            np.concatenate(parts + [np.full(self.max_size, ord("\n"), dtype=np.uint8)])
+            if parts
+            else np.empty(0, np.uint8)
+        )
+        record_starts = np.asarray(starts, dtype=np.int64)
+
+        bits = _BASE_BITS[data]
+        codes = _BASE_CODES[data].astype(np.int64)
+        kmers = np.full(len(data), 256, dtype=np.int64)
+        if len(data) >= 4:
+            valid = (codes[:-3] < 4) & (codes[1:-2] < 4) & (codes[2:-1] < 4) & (codes[3:] < 4)
+            packed = codes[:-3] * 64 + codes[1:-2] * 16 + codes[2:-1] * 4 + codes[3:]
+            kmers[:-3] = np.where(valid, packed, 256)
+        order = np.argsort(kmers, kind="stable")
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(kmers, minlength=257))])
+
+        matches = {}
+        out_records, out_enzymes, out_cuts = [], [], []
+        for index, enzyme in enumerate(self.enzymes):
+            size = len(self._patterns[self._forward[index]][0])
+            hits = []
+            for pattern_id, offsets in (
+                (self._forward[index], self._forward_offsets[index]),
+                (self._reverse[index], self._reverse_offsets[index]),
+            ):
+                if pattern_id < 0:
+                    continue
+                if pattern_id not in matches:
+                    matches[pattern_id] = self._match(bits, bounds, order, pattern_id)
+                found = matches[pattern_id]
+                if hits:
+                    # Where both orientations match, Biopython counts the forward site only
+                    found = np.setdiff1d(found, hits[0][0], assume_unique=True)
+                hits.append((found, offsets))
+            for found, offsets in hits:
+                if not len(found):
+                    continue
+                record = np.searchsorted(record_starts, found, side="right") - 1
+                local = found - record_starts[record]
+                length = lengths[record]
+                # Sites must start within the sequence and end within it (linear) or its wrapped copy
+                limit = np.where(circular[record], length + np.minimum(length, size - 1), length)
+                keep = (local < length) & (local + size <= limit)
+                record, local, length = record[keep], local[keep], length[keep]
+                for offset in offsets:
+                    cut = local + 1 + offset  # Bio.Restriction's 1-based position after the cut
+                    is_circular = circular[record]
+                    cut = np.where(is_circular & (cut < 1), cut + length, cut)
+                    cut = np.where(is_circular & (cut > length), cut - length, cut)
+                    if not enzyme.is_unknown():
+                        inside = (cut > 1) & (cut <= length) & (cut - enzyme.ovhg > 1) & (cut - enzyme.ovhg <= length)
+                        keep = is_circular | inside
+                    else:
+                        keep = np.ones(len(cut), dtype=bool)
+                    out_records.append(record[keep])
+                    out_enzymes.append(np.full(int(keep.sum()), index))
+                    out_cuts.append(cut[keep] - 1)
+
+        if not out_records:
+            return (np.empty(0, dtype=np.int64),) * 3
+        record, enzyme, cut = (
+            np.concatenate(values).astype(np.int64) for values in (out_records, out_enzymes, out_cuts)
+        )
+        order = np.lexsort((cut, enzyme, record))
+        return record[order], enzyme[order], cut[order]
+
+
+@functools.lru_cache(maxsize=16)
+def _compiled_restriction_panel(names: tuple[str, ...]) -> _RestrictionPanel:
+    return _RestrictionPanel(list(names))
+
+
+def _restriction_panel(enzymes) -> _RestrictionPanel:
+    """Return the compiled panel of a list of enzymes or a batch name, compiling it once per process."""
+    if isinstance(enzymes, str):
+        enzymes = [enzymes]
+    return _compiled_restriction_panel(tuple(str(enzyme) for enzyme in enzymes))
+
+
+def _scan_restriction_chunk(names, records, circular):
+    return _restriction_panel(names).scan(records, circular)
+
+
+def _scan_restriction_sites(panel, records, circular, processes=None):
+    """Run `_RestrictionPanel.scan`, splitting the records over a process pool when processes > 1."""
+    circular = np.broadcast_to(np.asarray(circular, dtype=bool), (len(records),))
+    if not processes or processes <= 1 or len(records) < 2:
+        return panel.scan(records, circular)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # About four chunks of similar total length per worker
+    sizes = np.cumsum([len(sequence) for _, sequence in records])
+    chunk_of = np.minimum((sizes - 1) * processes * 4 // max(int(sizes[-1]), 1), processes * 4 - 1)
+    bounds = np.flatnonzero(np.diff(chunk_of, prepend=-1)).tolist() + [len(records)]
+    chunks = list(zip(bounds[:-1], bounds[1:], strict=True))
+    with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as pool:
+        results = list(
+            pool.map(
+                _scan_restriction_chunk,
+                [panel.names] * len(chunks),
+                [records[start:stop] for start, stop in chunks],
+                [circular[start:stop] for start, stop in chunks],
+            )
+        )
+    record = np.concatenate([result[0] + start for result, (start, _) in zip(results, chunks, strict=True)])
+    enzyme = np.concatenate([result[1] for result in results])
+    cut = np.concatenate([result[2] for result in results])
+    return record, enzyme, cut
+
+
+def _restriction_fragments(group, cut, length, circular):
+    """Fragments of digests given their sorted cut positions.
+
+    Args:
+        group: Digest of each cut (e.g. a record and enzyme pair), grouped and sorted by cut
+        cut: 0-based cut positions
+        length: Sequence length of each cut's digest
+        circular: Whether each cut's sequence is circular
+
+    Returns:
+        (group, start, end, length) arrays of the fragments, sorted by group and start; circular fragments
+        may wrap (end <= start)
+    """
+    if len(cut):
+        distinct = np.ones(len(cut), dtype=bool)
+        distinct[1:] = (group[1:] != group[:-1]) | (cut[1:] != cut[:-1])
+        group, cut, length, circular = group[distinct], cut[distinct], length[distinct], circular[distinct]
+    first = np.ones(len(cut), dtype=bool)
+    first[1:] = group[1:] != group[:-1]
+    last = np.ones(len(cut), dtype=bool)
+    last[:-1] = group[1:] != group[:-1]
+    first_cut = cut[np.maximum.accumulate(np.where(first, np.arange(len(cut)), 0))] if len(cut) else cut
+
+    # Linear: one fragment ends at each cut; circular: one starts at each cut, the last one over the origin
+    previous = np.where(first, 0, np.roll(cut, 1))
+    following = np.where(last, first_cut, np.roll(cut, -1))
+    start = np.where(circular, cut, previous)
+    end = np.where(circular, following, cut)
+    size = np.where(circular, (following - cut - 1) % np.maximum(length, 1) + 1, cut - previous)
+    # Linear digests end with a fragment from the last cut to the end, inserted in place to keep the order
+    tail = np.flatnonzero(last & ~circular)
+    group = np.insert(group, tail + 1, group[tail])
+    start = np.insert(start, tail + 1, cut[tail])
+    end = np.insert(end, tail + 1, length[tail])
+    size = np.insert(size, tail + 1, length[tail] - cut[tail])
+    return group, start, end, size
+
+
 def digest_sequence(dna_sequence: str, enzyme_names: list[str], is_circular: bool = True) -> dict:
-    """Simulates restriction enzyme digestion using Biopython's catalyze method and returns the resulting DNA fragments.
+    """Simulates restriction enzyme digestion and returns the resulting DNA fragments.
 
     Args:
         enzyme_names (str | list): Name of the restriction enzyme or list of enzyme names
@@ -611,25 +1130,18 @@ def digest_sequence(dna_sequence: str, enzyme_names: list[str], is_circular: boo
         Dict: Dictionary containing the digestion fragments and their properties including positions
 
     """
-    # Convert sequence to Biopython Seq object
-    seq = Seq(dna_sequence)
-    seq_length = len(seq)
-
-    # Get all cut positions for all enzymes
-    all_cut_positions = []
-    for enzyme_name in enzyme_names:
-        enzyme_obj = getattr(Restriction, enzyme_name)
-        cut_sites = enzyme_obj.search(seq, linear=not is_circular)
-        all_cut_positions.extend(cut_sites)
+    dna_sequence = str(dna_sequence).translate(_NON_SEQUENCE_CHARACTERS)
+    seq_length = len(dna_sequence)
 
-    # Sort cut positions and remove duplicates
-    all_cut_positions = sorted(set(all_cut_positions))
+    # Cut positions of all enzymes, 0-based: each cut falls just before the base at that position
+    _, _, cuts = _restriction_panel(enzyme_names).scan([(None, dna_sequence)], is_circular)
+    all_cut_positions = np.unique(cuts).tolist()
 
     # Calculate fragments with positions
     fragments = []
     if not all_cut_positions:
         # No cuts - return full sequence
-        fragments.append({"fragment": str(seq), "length": seq_length, "start": 0, "end": seq_length})
+        fragments.append({"fragment": dna_sequence, "length": seq_length, "start": 0, "end": seq_length})
     # Handle linear and circular cases
     elif is_circular:
         for i in range(len(all_cut_positions)):
@@ -699,7 +1211,7 @@ def digest_sequence(dna_sequence: str, enzyme_names: list[str], is_circular: boo
             "- digestion_info: Overview of digestion results\n"
             "  * enzymes_used: List of restriction enzymes used\n"
             "  * number_of_fragments: Total number of fragments produced\n"
-            "  * cut_positions: List of all cut positions in sequence\n"
+            "  * cut_positions: List of all cut positions in sequence (0-based, the first base after each cut)\n"
             "- fragments: List of all fragments produced, where each contains:\n"
             "  * fragment: The DNA sequence of the fragment\n"
             "  * length: Length of the fragment in base pairs\n"
@@ -708,7 +1220,7 @@ def digest_sequence(dna_sequence: str, enzyme_names: list[str], is_circular: boo
             "  * is_wrapped: (Only for circular) Whether fragment wraps around sequence end"
         ),
         "sequence_info": {
-            "length": len(seq),
+            "length": seq_length,
             "is_circular": is_circular,
         },
         "digestion_info": {
@@ -734,14 +1246,11 @@ def find_restriction_sites(dna_sequence: str, enzymes: list[str], is_circular: b
         Dict: Dictionary containing all identified restriction sites
 
     """
-    # Convert string to Bio.Seq object
-    seq = Seq(dna_sequence.upper())
-
-    # Create Analysis batch with specified enzymes
-    rb = Restriction.RestrictionBatch(enzymes)
-
-    # Analyze sequence for restriction sites, considering topology
-    analysis = rb.search(seq, linear=not is_circular)
+    dna_sequence = str(dna_sequence).translate(_NON_SEQUENCE_CHARACTERS)
+    panel = _restriction_panel(enzymes)
+    _, enzyme_index, cuts = panel.scan([(None, dna_sequence)], is_circular)
+    # Reported as Bio.Restriction positions (1-based, first base after the cut)
+    analysis = {enzyme: (cuts[enzyme_index == i] + 1).tolist() for i, enzyme in enumerate(panel.enzymes)}
 
     results = {
         "explanation": (
@@ -756,10 +1265,10 @@ def find_restriction_sites(dna_sequence: str, enzymes: list[str], is_circular: b
             "    - 3_prime: Cut position on 3' strand relative to start of recognition site\n"
             "    - overhang: Length of overhang produced (negative for 3' overhang)\n"
             "    - overhang_type: 'sticky' for overhanging cuts, 'blunt' for even cuts\n"
-            "  * sites: List of positions where enzyme cuts in the sequence (0-based)"
+            "  * sites: List of positions where enzyme cuts in the sequence (1-based, the first base after the cut)"
         ),
         "sequence_info": {
-            "length": len(seq),
+            "length": len(dna_sequence),
             "is_circular": is_circular,
         },
         "restriction_sites": {},
@@ -775,7 +1284,7 @@ def find_restriction_sites(dna_sequence: str, enzymes: list[str], is_circular: b
                     "overhang": enzyme.ovhg,
                     "overhang_type": "sticky" if enzyme.ovhg != 0 else "blunt",
                 },
-                "sites": sorted(positions),  # Sort positions for better readability
+                "sites": positions,  # Sorted
             }
 
             results["restriction_sites"][str(enzyme)] = enzyme_info
@@ -799,26 +1308,128 @@ def find_restriction_enzymes(sequence: str, is_circular: bool = False) -> dict[s
         Dict[str, list]: Dictionary of enzymes and their cut positions
 
     """
-    # Convert to Bio.Seq and analyze
-    seq = Seq(sequence.upper())
-    analysis = Restriction.CommOnly.search(seq, linear=not is_circular)
+    panel = _restriction_panel("CommOnly")
+    _, enzyme_index, cuts = panel.scan([(None, sequence)], is_circular)
 
-    # Keep only enzymes that have sites
-    sites = {str(enzyme): list(positions) for enzyme, positions in analysis.items() if positions}
+    # Keep only enzymes that have sites, as Bio.Restriction positions
+    sites = {panel.names[i]: (cuts[enzyme_index == i] + 1).tolist() for i in np.unique(enzyme_index).tolist()}
 
     return {
         "explanation": (
             "Output fields:\n"
             "- enzyme_sites: Dictionary where keys are enzyme names and values are:\n"
-            "  * List of cut positions in the sequence (0-based)\n"
-            "  * Empty list means enzyme has no recognition sites\n"
-            "  * Positions indicate where the enzyme's recognition sequence begins\n"
+            "  * List of cut positions in the sequence (1-based, the first base after the cut)\n"
+            "  * Enzymes without recognition sites are left out\n"
             "  * For circular sequences, positions wrap around the sequence end"
         ),
         "enzyme_sites": sites,
     }
 
 
+def batch_restriction_analysis(
+    sequences: str | list[str] | dict[str, str],
+    enzymes: str | list[str] = "CommOnly",
+    is_circular: bool = True,
+    combined_digest: bool = False,
+    processes: int | None = None,
+) -> dict:
+    """Find restriction sites and digest fragments of many sequences against one enzyme panel.
+
+    The panel is compiled once per process, and all sequences are scanned together in one pass (or split
+    over a process pool), so hundreds of constructs can be checked against the same enzymes at once.
+
+    Args:
+        sequences (Union[str, List[str], Dict[str, str]]): Sequences as a list, a dict of name -> sequence,
+            or a path to a FASTA or GenBank file
+        enzymes (Union[str, List[str]]): Enzyme names, or a Biopython batch: "CommOnly" (default, commercially
+            available enzymes), "AllEnzymes" or "NonComm"
+        is_circular (bool): Whether the sequences are circular (True) or linear (False)
+        combined_digest (bool): Digest each sequence with all enzymes together instead of one enzyme at a time
+        processes (Optional[int]): Number of worker processes for large batches (default: scan in this process)
+
+    Returns:
+        dict: Dictionary containing:
+            - explanation: Explanation of the output fields
+            - summary: pandas DataFrame with one row per sequence
+            - sites: pandas DataFrame with one row per cut site
+            - fragments: pandas DataFrame with one row per digest fragment
+
+    """
+    if isinstance(sequences, dict):
+        records = list(sequences.items())
+    elif isinstance(sequences, str):
+        records = [(record_id or "sequence_1", seq) for record_id, seq in _read_sequences(sequences)]
+    else:
+        records = [(f"sequence_{i + 1}", seq) for i, seq in enumerate(sequences)]
+    names = np.array([str(name) for name, _ in records], dtype=object)
+    lengths = np.array([len(str(seq).translate(_NON_SEQUENCE_CHARACTERS)) for _, seq in records], dtype=np.int64)
+    circular = np.full(len(records), is_circular, dtype=bool)
+
+    panel = _restriction_panel(enzymes)
+    record, enzyme, cut = _scan_restriction_sites(panel, records, circular, processes)
+    # Record and enzyme columns are categorical: a few labels repeated over millions of rows
+    record_labels = pd.Categorical.from_codes(*pd.factorize(names))
+    enzyme_labels = pd.Categorical(panel.names, categories=panel.names)
+    sites = pd.DataFrame({"record": record_labels[record], "enzyme": enzyme_labels[enzyme], "position": cut})
+
+    # One digest per sequence, or per sequence and enzyme
+    if combined_digest:
+        order = np.lexsort((cut, record))
+        group, digest_record, digest_cut = record[order], record[order], cut[order]
+    else:
+        group, digest_record, digest_cut = record * len(panel) + enzyme, record, cut
+    group, start, end, size = _restriction_fragments(group, digest_cut, lengths[digest_record], circular[digest_record])
+    fragments = pd.DataFrame(
+        {
+            "record": record_labels[group if combined_digest else group // len(panel)],
+            "enzyme": "+".join(panel.names) if combined_digest else enzyme_labels[group % len(panel)],
+            "start": start,
+            "end": end,
+            "length": size,
+        }
+    )
+
+    pairs = pd.Series(np.ones(len(record), dtype=np.int64)).groupby([record, enzyme]).sum()
+    pair_records = pairs.index.get_level_values(0)
+    single = pairs[pairs.to_numpy() == 1].index
+    single_cutters = [[] for _ in records]
+    for i, e in zip(single.get_level_values(0).tolist(), single.get_level_values(1).tolist(), strict=True):
+        single_cutters[i].append(panel.names[e])
+    summary = pd.DataFrame(
+        {
+            "record": names,
+            "length": lengths,
+            "sites": np.bincount(record, minlength=len(records)),
+            "cutting_enzymes": np.bincount(pair_records, minlength=len(records)),
+            "single_cutters": single_cutters,
+        }
+    )
+
+    return {
+        "explanation": (
+            "Output fields:\n"
+            "- summary: One row per sequence\n"
+            "  * record: Sequence name\n"
+            "  * length: Length of the sequence in base pairs\n"
+            "  * sites: Number of cut sites of all enzymes\n"
+            "  * cutting_enzymes: Number of enzymes that cut the sequence\n"
+            "  * single_cutters: Enzymes that cut the sequence exactly once\n"
+            "- sites: One row per cut site\n"
+            "  * record, enzyme: Sequence and enzyme\n"
+            "  * position: 0-based cut position on the top strand (the first base of the downstream fragment)\n"
+            "- fragments: One row per fragment of each digest (each enzyme alone, or all enzymes together when\n"
+            "  combined_digest is set; sequences an enzyme does not cut have no rows)\n"
+            "  * record, enzyme: Sequence and enzyme(s)\n"
+            "  * start, end: 0-based fragment boundaries; a circular fragment that wraps around the origin has\n"
+            "    end <= start\n"
+            "  * length: Fragment length in base pairs"
+        ),
+        "summary": summary,
+        "sites": sites,
+        "fragments": fragments,
+    }
+
+
 def find_sequence_mutations(query_sequence, reference_sequence, query_start=1):
     """Compare query sequence against reference sequence to identify mutations.
 
@@ -873,76 +1484,143 @@ def find_sequence_mutations(query_sequence, reference_sequence, query_start=1):
     }
 
 
+SGRNA_LIBRARIES = {
+    "human": "sgRNA_KO_SP_human.txt",
+    "mouse": "sgRNA_KO_SP_mouse.txt",
+}
+_SGRNA_COLUMNS = ["Target Gene Symbol", "sgRNA Sequence", "Combined Rank"]
+
+
+@functools.lru_cache(maxsize=2)
+def _load_sgrna_library(path: str, mtime: float) -> dict[str, Any]:
+    """Load an sgRNA library as rank-sorted guides with a gene -> (start, stop) index."""
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path, columns=_SGRNA_COLUMNS)
+    else:
+        df = pd.read_csv(path, delimiter="\t", usecols=_SGRNA_COLUMNS)
+    codes, genes = pd.factorize(df["Target Gene Symbol"].astype(str).str.upper(), sort=True)
+    ranks = df["Combined Rank"].to_numpy()
+    order = np.lexsort((ranks, codes))
+    bounds = np.searchsorted(codes[order], np.arange(len(genes) + 1))
+    return {
+        "sequences": df["sgRNA Sequence"].to_numpy(dtype=object)[order],
+        "ranks": ranks[order],
+        "index": {gene: (int(bounds[i]), int(bounds[i + 1])) for i, gene in enumerate(genes)},
+    }
+
+
+def _sgrna_library(data_lake_path: str, species: str) -> dict[str, Any]:
+    """Return the indexed sgRNA library of a species, compiling its sorted Parquet copy on first use."""
+    from biomni.data_lake.catalog import single_flight
+    from biomni.data_lake.convert import convert_file, optimized_copy, optimized_dir
+
+    if species.lower() not in SGRNA_LIBRARIES:
+        raise ValueError(f"No sgRNA library for {species}; choose from {', '.join(SGRNA_LIBRARIES)}")
+    name = SGRNA_LIBRARIES[species.lower()]
+    library_path = data_lake_file(data_lake_path, name)
+
+    # Check if library file exists
+    if not os.path.exists(library_path):
+        raise FileNotFoundError(f"Library file for {species} not found at path: {library_path}")
+
+    path = optimized_copy(data_lake_path, name)
+    if path is None:
+        try:
+            os.makedirs(optimized_dir(data_lake_path), exist_ok=True)
+            with single_flight(optimized_dir(data_lake_path), name):
+                # Another process may have compiled it while we waited
+                if optimized_copy(data_lake_path, name) is None:
+                    convert_file(data_lake_path, name)
+            path = optimized_copy(data_lake_path, name)
+        except Exception as e:
+            print(f"✗ Could not compile {name} to Parquet, reading the TSV instead: {e}")
+        path = path or library_path
+
+    try:
+        return _load_sgrna_library(os.path.abspath(path), os.path.getmtime(path))
+    except Exception as e:
+        raise RuntimeError(f"Failed to load sgRNA library: {str(e)}") from None
+
+
+def _top_guides(library: dict[str, Any], gene: str, num_guides: int) -> list[str]:
+    """Return the best-ranked guides of a gene, falling back to genes whose symbol contains it."""
+    bounds = library["index"].get(gene)
+    if bounds is not None:
+        start, stop = bounds
+        return library["sequences"][start : min(stop, start + num_guides)].tolist()
+
+    # Try partial matching if exact match fails
+    matches = [library["index"][symbol] for symbol in library["index"] if gene in symbol]
+    if not matches:
+        return []
+    rows = np.concatenate([np.arange(start, stop) for start, stop in matches])
+    best = rows[np.argsort(library["ranks"][rows], kind="stable")[:num_guides]]
+    return library["sequences"][best].tolist()
+
+
 def design_knockout_sgrna(
-    gene_name: str,
+    gene_name: str | list[str],
     data_lake_path: str,
     species: str = "human",
     num_guides: int = 1,
 ) -> dict[str, Any]:
     """Design sgRNAs for CRISPR knockout by searching pre-computed sgRNA libraries.
-    Returns optimized guide RNAs for targeting a specific gene.
+    Returns optimized guide RNAs for targeting a specific gene, or for every gene of a screen.
+
+    The library is compiled once into a gene-sorted Parquet copy and indexed in memory, so repeated
+    calls and whole gene lists are answered without re-reading the TSV.
 
     Args:
-        gene_name (str): Target gene symbol/name (e.g., "EGFR", "TP53")
+        gene_name (str | list[str]): Target gene symbol/name (e.g., "EGFR", "TP53"), or a list of them to
+            design a whole screen in one call
         species (str): Target organism species (default: "human")
-        num_guides (int): Number of guides to return (default: 1)
+        num_guides (int): Number of guides to return per gene (default: 1)
 
     Returns:
         Dict: Dictionary containing:
             - explanation: Explanation of the output fields
-            - gene_name: Target gene name
+            - gene_name: Target gene name (or list of names)
             - species: Target species
-            - guides: List of sgRNA sequences
+            - guides: List of sgRNA sequences (for a list of genes: a dict mapping each gene to its guides)
+            - not_found: For a list of genes, the genes without guides in the library
 
     """
-    DEFAULT_LIBRARIES = {
-        "human": data_lake_path + "/sgRNA_KO_SP_human.txt",
-        "mouse": data_lake_path + "/sgRNA_KO_SP_mouse.txt",
-    }
-
-    # Use fixed library pathAdd commentMore actions
-    library_path = DEFAULT_LIBRARIES[species.lower()]
-
-    # Check if library file exists
-    if not os.path.exists(library_path):
-        raise FileNotFoundError(f"Library file for {species} not found at path: {library_path}")
-
-    # Load sgRNA library from S3
-    try:
-        df = pd.read_csv(library_path, delimiter="\t")
-    except Exception as e:
-        raise RuntimeError(f"Failed to load sgRNA library: {str(e)}") from None
+    library = _sgrna_library(data_lake_path, species)
+    genes = [gene_name] if isinstance(gene_name, str) else list(gene_name)
+    # Ensure consistent capitalization
+    genes = [str(gene).upper() for gene in genes]
+
+    if species.lower() == "human":
+        # Map aliases and previous symbols (e.g. "P53") to the library's official symbols
+        missing = [gene for gene in genes if gene not in library["index"]]
+        if missing:
+            try:
+                from biomni.data_lake.gene_ids import load_gene_normalizer
 
-    # Filter for target gene
-    gene_name = gene_name.upper()  # Ensure consistent capitalization
-    gene_df = df[df["Target Gene Symbol"].str.upper() == gene_name]
+                symbols = load_gene_normalizer(data_lake_path, fetch=False).symbols(missing)
+                resolved = {gene: symbol for gene, symbol in zip(missing, symbols, strict=True) if symbol}
+                genes = [resolved.get(gene, gene) for gene in genes]
+            except (OSError, ValueError):
+                pass
 
-    if gene_df.empty:
-        # Try partial matching if exact match fails
-        gene_df = df[df["Target Gene Symbol"].str.upper().str.contains(gene_name)]
+    guides = {gene: _top_guides(library, gene, num_guides) for gene in genes}
 
-    if gene_df.empty:
+    if isinstance(gene_name, str):
         return {
             "explanation": "Output contains target gene name, species, and list of sgRNA sequences",
-            "gene_name": gene_name,
+            "gene_name": genes[0],
             "species": species,
-            "guides": [],
+            "guides": guides[genes[0]],
         }
-
-    # Sort by combined rank (default priority)
-    gene_df = gene_df.sort_values(by=["Combined Rank"])
-
-    # Get top guides
-    top_guides = gene_df.head(num_guides)
-
-    # Extract just the sgRNA sequences
-    guides = top_guides["sgRNA Sequence"].tolist()
-
     return {
-        "explanation": "Output contains target gene name, species, and list of sgRNA sequences",
-        "gene_name": gene_name,
+        "explanation": (
+            "Output contains the target gene names, species, a mapping from each gene to its list of sgRNA "
+            "sequences, and the genes without guides in the library"
+        ),
+        "gene_name": genes,
         "species": species,
         "guides": guides,
+        "not_found": [gene for gene in genes if not guides[gene]],
     }
 
 
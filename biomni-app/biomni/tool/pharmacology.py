@@ -1,10 +1,13 @@
+import hashlib
+import importlib.util
+import json
 import os
-import pickle
 import re
 import subprocess
 import sys
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from difflib import get_close_matches
 
 import numpy as np
 import pandas as pd
@@ -93,32 +96,130 @@ def run_diffdock_with_smiles(pdb_path, smiles_string, local_output_dir, gpu_devi
         return f"An error occurred: {e}"
 
 
-def docking_autodock_vina(smiles_list, receptor_pdb_file, box_center, box_size, ncpu=1):
-    from tdc import Oracle
+# Docking scores are cached per receptor and box, one JSON line per ligand, so interrupted screens resume
+DOCKING_CACHE_DIR = os.getenv("BIOMNI_DOCKING_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "biomni", "docking"
+)
 
-    log = []
+# The pyscreener oracle of a docking worker process, created once by _init_docking_worker
+_docking_oracle = None
+
+
+def _docking_cache_path(receptor_pdb_file, box_center, box_size):
+    """Return the score cache file of a receptor (by content hash) and docking box."""
+    with open(receptor_pdb_file, "rb") as f:
+        receptor = hashlib.sha256(f.read()).hexdigest()[:16]
+    box = ",".join(f"{float(x):.3f}" for x in [*box_center, *box_size])
+    return os.path.join(DOCKING_CACHE_DIR, f"{receptor}-{hashlib.sha256(box.encode()).hexdigest()[:12]}.jsonl")
 
-    # Log the start of the process
-    log.append("Step 1: Initializing the Oracle")
-    log.append(f"Receptor PDB File: {receptor_pdb_file}")
-    log.append(f"Box Center: {box_center}")
-    log.append(f"Box Size: {box_size}")
 
-    # Initialize the Oracle object
-    oracle = Oracle(
+def _read_docking_cache(cache_path):
+    scores = {}
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by an interrupted screen
+                scores[entry["smiles"]] = entry["score"]
+    return scores
+
+
+def _init_docking_worker(receptor_pdb_file, box_center, box_size):
+    global _docking_oracle
+    from tdc import Oracle
+
+    _docking_oracle = Oracle(
         name="pyscreener",
         receptor_pdb_file=receptor_pdb_file,
         box_center=box_center,
         box_size=box_size,
-        ncpu=ncpu,
+        ncpu=1,
     )
-    log.append("Oracle initialized successfully.")
+
+
+def _dock_shard(smiles_shard):
+    return smiles_shard, list(_docking_oracle(smiles_shard))
+
+
+def _run_docking_screen(smiles_list, receptor_pdb_file, box_center, box_size, ncpu=None):
+    """Dock a list of SMILES, sharding the uncached ones across a local process pool.
+
+    Scores are appended to the receptor and box's cache file as each shard finishes, so a screen that is
+    interrupted resumes where it stopped and molecules already scored are never docked again.
+
+    Args:
+        smiles_list: Ligand SMILES strings
+        receptor_pdb_file: Path to the receptor PDB file
+        box_center: Docking box center [x, y, z]
+        box_size: Docking box size [x, y, z]
+        ncpu: Number of worker processes; defaults to the host's core count
+
+    Returns:
+        (scores in input order, number of ligands served from the cache)
+
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    canonical = [_canonical_smiles(smiles) for smiles in smiles_list]
+    cache_path = _docking_cache_path(receptor_pdb_file, box_center, box_size)
+    scores = _read_docking_cache(cache_path)
+    cached = sum(smiles in scores for smiles in canonical)
+    pending = [smiles for smiles in dict.fromkeys(canonical) if smiles not in scores]
+
+    if pending:
+        workers = max(1, min(ncpu or os.cpu_count() or 1, len(pending)))
+        # Several shards per worker, so fast and slow ligands balance out and progress is reported often
+        shard_size = max(1, -(-len(pending) // (workers * 4)))
+        shards = [pending[i : i + shard_size] for i in range(0, len(pending), shard_size)]
+        os.makedirs(DOCKING_CACHE_DIR, exist_ok=True)
+
+        with open(cache_path, "a") as cache:
+
+            def record(smiles_shard, shard_scores):
+                for smiles, score in zip(smiles_shard, shard_scores, strict=True):
+                    scores[smiles] = score
+                    # Failed dockings are not cached, so they are retried next time
+                    if score is not None and score == score:
+                        cache.write(json.dumps({"smiles": smiles, "score": float(score)}) + "\n")
+                cache.flush()
+
+            if workers == 1:
+                _init_docking_worker(receptor_pdb_file, box_center, box_size)
+                for shard in shards:
+                    record(*_dock_shard(shard))
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_docking_worker,
+                    initargs=(receptor_pdb_file, box_center, box_size),
+                ) as pool:
+                    futures = [pool.submit(_dock_shard, shard) for shard in shards]
+                    for done, future in enumerate(as_completed(futures), 1):
+                        record(*future.result())
+                        if done % max(1, len(shards) // 10) == 0 or done == len(shards):
+                            print(f"Docked {done}/{len(shards)} shards ({len(pending)} ligands, {workers} workers)")
+
+    return [scores[smiles] for smiles in canonical], cached
+
+
+def docking_autodock_vina(smiles_list, receptor_pdb_file, box_center, box_size, ncpu=None):
+    log = []
+
+    # Log the start of the process
+    log.append("Step 1: Initializing the docking scheduler")
+    log.append(f"Receptor PDB File: {receptor_pdb_file}")
+    log.append(f"Box Center: {box_center}")
+    log.append(f"Box Size: {box_size}")
+    log.append(f"Worker processes: {ncpu or os.cpu_count() or 1}")
 
     # Log the list of SMILES strings
     log.append(f"\nStep 2: Processing SMILES strings: {smiles_list}")
 
-    # Get the docking scores
-    docking_scores = oracle(smiles_list)
+    # Get the docking scores, reusing scores cached for this receptor and box
+    docking_scores, cached = _run_docking_screen(smiles_list, receptor_pdb_file, box_center, box_size, ncpu)
+    log.append(f"Reused {cached} cached docking scores for this receptor and box")
     log.append(f"Docking scores calculated: {docking_scores}")
 
     # Create a dictionary mapping SMILES to their docking scores
@@ -181,12 +282,16 @@ def run_autosite(pdb_file, output_dir, spacing=1.0):
 
 
 # Function to get TxGNN predictions and return a summarized string output
-def retrieve_topk_repurposing_drugs_from_disease_txgnn(disease_name, data_lake_path, k=5):
+def retrieve_topk_repurposing_drugs_from_disease_txgnn(disease_name: str | list[str], data_lake_path, k=5):
     """This function computes TxGNN model predictions for drug repurposing. It takes in the paths to the data,
     the disease name, and returns a summary of the top K predicted drugs with their sigmoid-transformed scores.
 
+    The predictions are compiled once into a memory-mapped disease x drug matrix (see
+    `biomni.data_lake.txgnn`), so repeated calls do not re-read the pickles.
+
     Args:
-    - disease_name (str): The name of the disease for which the drug predictions are to be retrieved.
+    - disease_name (str or list of str): The name of the disease for which the drug predictions are to be
+      retrieved, or a list of diseases to retrieve predictions for in one batch.
     - data_lake_path (str): The path to the data lake containing the TxGNN predictions.
     - k (int, optional): The number of top drug predictions to return. Defaults to 5.
 
@@ -194,64 +299,157 @@ def retrieve_topk_repurposing_drugs_from_disease_txgnn(disease_name, data_lake_p
     - str: A summary of the steps and the top K drug predictions with their scores.
 
     """
+    from biomni.data_lake.txgnn import TxGNNPredictions
 
-    # Sigmoid function to convert raw prediction scores
-    def sigmoid(x):
-        return 1 / (1 + np.exp(-x))
+    # Step 1: Open the compiled predictions (built from the pickles on first use)
+    predictions = TxGNNPredictions.open(data_lake_path)
 
-    # Step 1: Load the mappings and prediction data from the provided paths
-    name_mapping_path = data_lake_path + "/txgnn_name_mapping.pkl"
-    result_path = data_lake_path + "/txgnn_prediction.pkl"
+    # Step 2: Fuzzy match each disease name to find the closest match
+    disease_names = [disease_name] if isinstance(disease_name, str) else list(disease_name)
+    matches = {name: predictions.match_disease(name) for name in disease_names}
 
-    with open(name_mapping_path, "rb") as f:
-        mapping = pickle.load(f)
+    # Step 3: Select the top K drugs of every matched disease in one pass
+    top_k = predictions.top_drugs(list(dict.fromkeys(match for match in matches.values() if match)), k=k)
 
-    with open(result_path, "rb") as f:
-        result = pickle.load(f)
+    # Step 4: Create a human and LLM-friendly summary string
+    summaries = []
+    for name, matched_disease in matches.items():
+        if matched_disease is None:
+            summaries.append(f"Error: No matching disease found for '{name}'. Please try a different name.")
+            continue
 
-    # Step 2: Fuzzy match the disease name to find the closest match
-    possible_diseases = result.keys()
-    matched_disease = get_close_matches(disease_name, possible_diseases, n=1, cutoff=0.6)
+        summary = f"TxGNN Drug Repurposing Predictions for '{matched_disease}':\n"
+        summary += f"Top {k} predicted drugs and their corresponding prediction scores (post-sigmoid transformation):\n"
+
+        for i, (_, drug_name, score) in enumerate(top_k[matched_disease], 1):
+            summary += f"{i}. {drug_name} - Prediction Score: {score:.4f}\n"
+
+        summary += "\nProcess Summary:\n"
+        summary += f"- Fuzzy matching was used to match the input disease name to '{matched_disease}'.\n"
+        summary += "- Sigmoid function was applied to raw prediction scores to convert them into probabilities.\n"
+        summary += f"- The top {k} drugs were selected based on their prediction scores.\n"
+        summaries.append(summary)
+
+    return "\n".join(summaries)
+
+
+# DeepPurpose model registry and prediction cache, shared by every call in the process
+DEEPPURPOSE_MAX_MODELS = int(os.getenv("BIOMNI_DEEPPURPOSE_MAX_MODELS", "20"))
+DEEPPURPOSE_MAX_PREDICTIONS = int(os.getenv("BIOMNI_DEEPPURPOSE_MAX_PREDICTIONS", "1000000"))
+ADMET_TASKS = [
+    "AqSolDB",
+    "Caco2",
+    "HIA",
+    "Pgp_inhibitor",
+    "Bioavailability",
+    "BBB_MolNet",
+    "PPBR",
+    "CYP2C19",
+    "CYP2D6",
+    "CYP3A4",
+    "CYP1A2",
+    "CYP2C9",
+    "ClinTox",
+    "Lipo_AZ",
+    "Half_life_eDrug3D",
+    "Clearance_eDrug3D",
+]
+
+_deeppurpose_models: OrderedDict = OrderedDict()
+_deeppurpose_predictions: OrderedDict = OrderedDict()
+_deeppurpose_lock = threading.Lock()
+
+
+def _canonical_smiles(smiles):
+    """Canonicalize a SMILES string with RDKit when available, so equivalent inputs share cached predictions."""
+    try:
+        from rdkit import Chem
+    except ImportError:
+        return smiles.strip()
 
-    if not matched_disease:
-        return f"Error: No matching disease found for '{disease_name}'. Please try a different name."
+    mol = Chem.MolFromSmiles(smiles)
+    return Chem.MolToSmiles(mol) if mol is not None else smiles.strip()
 
-    matched_disease = matched_disease[0]
 
-    # Step 3: Retrieve the prediction scores for the matched disease
-    disease_predictions = result[matched_disease]
+def _deeppurpose_model(model_name, kind="compound"):
+    """Return a pretrained DeepPurpose model, loading it on first use.
 
-    # Step 4: Apply the sigmoid function to the raw prediction scores
-    sigmoid_predictions = {drug_id: sigmoid(score) for drug_id, score in disease_predictions.items()}
+    At most DEEPPURPOSE_MAX_MODELS models stay loaded; the least recently used one is evicted first.
+    """
+    with _deeppurpose_lock:
+        if model_name in _deeppurpose_models:
+            _deeppurpose_models.move_to_end(model_name)
+            return _deeppurpose_models[model_name]
 
-    # Step 5: Sort the drugs by prediction score in descending order
-    top_k_drugs = sorted(sigmoid_predictions.items(), key=lambda x: x[1], reverse=True)[:k]
+    from DeepPurpose import DTI, CompoundPred
 
-    # Step 6: Map drug IDs to their names and format the results
-    top_k_drug_names = [(mapping["id2name_drug"].get(drug_id, "Unknown Drug"), score) for drug_id, score in top_k_drugs]
+    model = (DTI if kind == "dti" else CompoundPred).model_pretrained(model=model_name)
+    with _deeppurpose_lock:
+        _deeppurpose_models[model_name] = model
+        while len(_deeppurpose_models) > DEEPPURPOSE_MAX_MODELS:
+            _deeppurpose_models.popitem(last=False)
+    return model
 
-    # Step 7: Create a human and LLM-friendly summary string
-    summary = f"TxGNN Drug Repurposing Predictions for '{matched_disease}':\n"
-    summary += f"Top {k} predicted drugs and their corresponding prediction scores (post-sigmoid transformation):\n"
 
-    for i, (drug_name, score) in enumerate(top_k_drug_names, 1):
-        summary += f"{i}. {drug_name} - Prediction Score: {score:.4f}\n"
+def _deeppurpose_predict(model_name, smiles_list, drug_encoding, target=None, target_encoding=None):
+    """Predict with a pretrained DeepPurpose model over a whole SMILES list.
 
-    summary += "\nProcess Summary:\n"
-    summary += "- Fuzzy matching was used to match the input disease name to '{matched_disease}'.\n"
-    summary += "- Sigmoid function was applied to raw prediction scores to convert them into probabilities.\n"
-    summary += f"- The top {k} drugs were selected based on their prediction scores.\n"
+    Predictions are cached by (canonical SMILES, model, target); the SMILES without one are featurized
+    and predicted in a single batch.
 
-    return summary
+    Args:
+        model_name: Pretrained model name, e.g. "HIA_MPNN_model" or "MPNN_CNN_BindingDB"
+        smiles_list: Compound SMILES strings
+        drug_encoding: DeepPurpose drug encoding of the model
+        target: Amino acid sequence for drug-target models, None for compound property models
+        target_encoding: DeepPurpose target encoding of a drug-target model
+
+    Returns:
+        List of predictions in input order
+
+    """
+    from DeepPurpose import utils
+
+    keys = [(_canonical_smiles(smiles), model_name, target) for smiles in smiles_list]
+    with _deeppurpose_lock:
+        cached = {}
+        for key in keys:
+            if key in _deeppurpose_predictions:
+                _deeppurpose_predictions.move_to_end(key)
+                cached[key] = _deeppurpose_predictions[key]
+
+    missing = list(dict.fromkeys(key[0] for key in keys if key not in cached))
+    if missing:
+        model = _deeppurpose_model(model_name, kind="compound" if target is None else "dti")
+        if target is None:
+            X_pred = utils.data_process(
+                X_drug=missing, y=[0] * len(missing), drug_encoding=drug_encoding, split_method="no_split"
+            )
+        else:
+            X_pred = utils.data_process(
+                X_drug=missing,
+                X_target=[target] * len(missing),
+                y=[0] * len(missing),
+                drug_encoding=drug_encoding,
+                target_encoding=target_encoding,
+                split_method="no_split",
+            )
+        predictions = [float(y_pred) for y_pred in model.predict(X_pred)]
+        with _deeppurpose_lock:
+            for smiles, y_pred in zip(missing, predictions, strict=True):
+                key = (smiles, model_name, target)
+                cached[key] = _deeppurpose_predictions[key] = y_pred
+            while len(_deeppurpose_predictions) > DEEPPURPOSE_MAX_PREDICTIONS:
+                _deeppurpose_predictions.popitem(last=False)
+
+    return [cached[key] for key in keys]
 
 
 # ADMET prediction function with research log format
 def predict_admet_properties(smiles_list, ADMET_model_type="MPNN"):
-    try:
-        from DeepPurpose import CompoundPred, utils
-    except Exception:
+    if importlib.util.find_spec("DeepPurpose") is None:
         subprocess.run([sys.executable, "-m", "pip", "install", "DeepPurpose"], check=False)
-        from DeepPurpose import CompoundPred, utils
+        importlib.invalidate_caches()
 
     # Define available model types
     available_model_types = ["MPNN", "CNN", "Morgan"]
@@ -260,42 +458,15 @@ def predict_admet_properties(smiles_list, ADMET_model_type="MPNN"):
     if ADMET_model_type not in available_model_types:
         return f"Error: Invalid ADMET model type '{ADMET_model_type}'. Available options are: {', '.join(available_model_types)}."
 
-    # Load pretrained ADMET models only once
-    model_ADMETs = {}
-    tasks = [
-        "AqSolDB",
-        "Caco2",
-        "HIA",
-        "Pgp_inhibitor",
-        "Bioavailability",
-        "BBB_MolNet",
-        "PPBR",
-        "CYP2C19",
-        "CYP2D6",
-        "CYP3A4",
-        "CYP1A2",
-        "CYP2C9",
-        "ClinTox",
-        "Lipo_AZ",
-        "Half_life_eDrug3D",
-        "Clearance_eDrug3D",
-    ]
-
-    for task in tasks:
-        model_ADMETs[task + "_" + ADMET_model_type + "_model"] = CompoundPred.model_pretrained(
-            model=task + "_" + ADMET_model_type + "_model"
-        )
+    # Predict every task over the whole SMILES list; models are loaded once per process
+    predictions = {
+        task: _deeppurpose_predict(task + "_" + ADMET_model_type + "_model", smiles_list, ADMET_model_type)
+        for task in ADMET_TASKS
+    }
 
     # Helper function for ADMET prediction
-    def ADMET_pred(drug, task, unit):
-        model = model_ADMETs[task + "_" + ADMET_model_type + "_model"]
-        X_pred = utils.data_process(
-            X_drug=[drug],
-            y=[0],
-            drug_encoding=ADMET_model_type,
-            split_method="no_split",
-        )
-        y_pred = model.predict(X_pred)[0]
+    def ADMET_pred(index, task, unit):
+        y_pred = predictions[task][index]
 
         if unit == "%":
             y_pred = y_pred * 100
@@ -307,38 +478,38 @@ def predict_admet_properties(smiles_list, ADMET_model_type="MPNN"):
     research_log += "-------------------------------------\n"
 
     # Process each SMILES string in the list
-    for smiles in smiles_list:
+    for i, smiles in enumerate(smiles_list):
         research_log += f"\nCompound SMILES: {smiles}\n"
         research_log += "Predicted ADMET properties:\n"
 
         # Physiochemical properties
-        solubility = ADMET_pred(smiles, "AqSolDB", "log mol/L")
-        lipophilicity = ADMET_pred(smiles, "Lipo_AZ", "(log-ratio)")
+        solubility = ADMET_pred(i, "AqSolDB", "log mol/L")
+        lipophilicity = ADMET_pred(i, "Lipo_AZ", "(log-ratio)")
         research_log += f"- Solubility: {solubility}\n"
         research_log += f"- Lipophilicity: {lipophilicity}\n"
 
         # Absorption
-        caco2 = ADMET_pred(smiles, "Caco2", "cm/s")
-        hia = ADMET_pred(smiles, "HIA", "%")
-        pgp = ADMET_pred(smiles, "Pgp_inhibitor", "%")
-        bioavail = ADMET_pred(smiles, "Bioavailability", "%")
+        caco2 = ADMET_pred(i, "Caco2", "cm/s")
+        hia = ADMET_pred(i, "HIA", "%")
+        pgp = ADMET_pred(i, "Pgp_inhibitor", "%")
+        bioavail = ADMET_pred(i, "Bioavailability", "%")
         research_log += f"- Absorption (Caco-2 permeability): {caco2}\n"
         research_log += f"- Absorption (HIA): {hia}\n"
         research_log += f"- Absorption (Pgp Inhibitor): {pgp}\n"
         research_log += f"- Absorption (Bioavailability): {bioavail}\n"
 
         # Distribution
-        bbb = ADMET_pred(smiles, "BBB_MolNet", "%")
-        ppbr = ADMET_pred(smiles, "PPBR", "%")
+        bbb = ADMET_pred(i, "BBB_MolNet", "%")
+        ppbr = ADMET_pred(i, "PPBR", "%")
         research_log += f"- Distribution (BBB permeation): {bbb}\n"
         research_log += f"- Distribution (PPBR): {ppbr}\n"
 
         # Metabolism
-        cyp2c19 = ADMET_pred(smiles, "CYP2C19", "%")
-        cyp2d6 = ADMET_pred(smiles, "CYP2D6", "%")
-        cyp3a4 = ADMET_pred(smiles, "CYP3A4", "%")
-        cyp1a2 = ADMET_pred(smiles, "CYP1A2", "%")
-        cyp2c9 = ADMET_pred(smiles, "CYP2C9", "%")
+        cyp2c19 = ADMET_pred(i, "CYP2C19", "%")
+        cyp2d6 = ADMET_pred(i, "CYP2D6", "%")
+        cyp3a4 = ADMET_pred(i, "CYP3A4", "%")
+        cyp1a2 = ADMET_pred(i, "CYP1A2", "%")
+        cyp2c9 = ADMET_pred(i, "CYP2C9", "%")
         research_log += f"- Metabolism (CYP2C19): {cyp2c19}\n"
         research_log += f"- Metabolism (CYP2D6): {cyp2d6}\n"
         research_log += f"- Metabolism (CYP3A4): {cyp3a4}\n"
@@ -346,13 +517,13 @@ def predict_admet_properties(smiles_list, ADMET_model_type="MPNN"):
         research_log += f"- Metabolism (CYP2C9): {cyp2c9}\n"
 
         # Excretion
-        half_life = ADMET_pred(smiles, "Half_life_eDrug3D", "h")
-        clearance = ADMET_pred(smiles, "Clearance_eDrug3D", "mL/min/kg")
+        half_life = ADMET_pred(i, "Half_life_eDrug3D", "h")
+        clearance = ADMET_pred(i, "Clearance_eDrug3D", "mL/min/kg")
         research_log += f"- Excretion (Half-life): {half_life}\n"
         research_log += f"- Excretion (Clearance): {clearance}\n"
 
         # Clinical Toxicity
-        clinical_toxicity = ADMET_pred(smiles, "ClinTox", "%")
+        clinical_toxicity = ADMET_pred(i, "ClinTox", "%")
         research_log += f"- Clinical Toxicity: {clinical_toxicity}\n"
 
         research_log += "-------------------------------------\n"
@@ -362,11 +533,9 @@ def predict_admet_properties(smiles_list, ADMET_model_type="MPNN"):
 
 # Binding Affinity prediction function with model_type validation
 def predict_binding_affinity_protein_1d_sequence(smiles_list, amino_acid_sequence, affinity_model_type="MPNN-CNN"):
-    try:
-        from DeepPurpose import DTI, utils
-    except Exception:
+    if importlib.util.find_spec("DeepPurpose") is None:
         subprocess.run([sys.executable, "-m", "pip", "install", "DeepPurpose"], check=False)
-        from DeepPurpose import DTI, utils
+        importlib.invalidate_caches()
 
     # Define available model types for Binding Affinity
     available_affinity_model_types = [
@@ -381,28 +550,25 @@ def predict_binding_affinity_protein_1d_sequence(smiles_list, amino_acid_sequenc
     if affinity_model_type not in available_affinity_model_types:
         return f"Error: Invalid affinity model type '{affinity_model_type}'. Available options are: {', '.join(available_affinity_model_types)}."
 
-    # Load the pre-trained affinity model
-    model_DTI = DTI.model_pretrained(model=affinity_model_type.replace("-", "_") + "_BindingDB")
+    # Predict binding affinity for the whole list with the cached pre-trained model
+    drug_encoding, target_encoding = affinity_model_type.split("-")
+    predictions = _deeppurpose_predict(
+        affinity_model_type.replace("-", "_") + "_BindingDB",
+        smiles_list,
+        drug_encoding,
+        target=amino_acid_sequence,
+        target_encoding=target_encoding,
+    )
 
     # Initialize research log string
     research_log = "Research Log for Binding Affinity Predictions:\n"
     research_log += "-------------------------------------\n"
 
     # Process each SMILES string in the list
-    for smiles in smiles_list:
+    for smiles, y_pred in zip(smiles_list, predictions, strict=True):
         research_log += f"\nCompound SMILES: {smiles}\n"
         research_log += f"Amino Acid Sequence: {amino_acid_sequence}\n"
 
-        # Predict binding affinity
-        X_pred = utils.data_process(
-            X_drug=[smiles],
-            X_target=[amino_acid_sequence],
-            y=[0],
-            drug_encoding=affinity_model_type.split("-")[0],
-            target_encoding=affinity_model_type.split("-")[1],
-            split_method="no_split",
-        )
-        y_pred = model_DTI.predict(X_pred)[0]
         y_pred_nM = 10 ** (-y_pred) / 1e-9
 
         research_log += f"Predicted Binding Affinity: {y_pred_nM:.2f} nM\n"
@@ -1969,307 +2135,79 @@ def analyze_western_blot(
 
 def _load_ddinter_data(data_lake_path):
     """
-    Load DDInter datasets from pickle files, processing if needed.
+    Open the compiled DDInter interaction store, compiling it from the CSV files on first use.
+
+    The store is memory-mapped and opened once per process (see `biomni.data_lake.ddinter`).
 
     Parameters
     ----------
     data_lake_path : str
-        Path to data lake directory containing DDInter pickle files
+        Path to data lake directory containing the DDInter CSV files
 
     Returns
     -------
-    tuple
-        (drug_info, interaction_matrix, name_mapping) dictionaries
+    DDInterStore
+        Integer drug table and CSR interaction matrix
     """
-    import os
-    import pickle
+    from biomni.data_lake.ddinter import DDInterStore
 
-    # Define schema directory (following established pattern)
-    schema_dir = os.path.join(os.path.dirname(__file__), "schema_db")
+    return DDInterStore.open(data_lake_path)
 
-    # Define paths to DDInter pickle files
-    drug_info_path = os.path.join(schema_dir, "ddinter_drugs.pkl")
-    interaction_path = os.path.join(schema_dir, "ddinter_interactions.pkl")
-    mapping_path = os.path.join(schema_dir, "ddinter_name_mapping.pkl")
 
-    # Check if processing is needed (lazy loading pattern)
-    pkl_files = [drug_info_path, interaction_path, mapping_path]
-    if not all(os.path.exists(f) for f in pkl_files):
-        _process_ddinter_data_inline(data_lake_path, schema_dir)
-
-    # Load data
-    try:
-        with open(drug_info_path, "rb") as f:
-            drug_info = pickle.load(f)
-
-        with open(interaction_path, "rb") as f:
-            interaction_matrix = pickle.load(f)
-
-        with open(mapping_path, "rb") as f:
-            name_mapping = pickle.load(f)
-
-        return drug_info, interaction_matrix, name_mapping
-
-    except Exception as e:
-        raise FileNotFoundError(f"Error loading DDInter data: {e}") from e
-
-
-def _process_ddinter_data_inline(data_lake_path, output_dir):
+def _resolve_ddinter_drugs(store, drug_names):
     """
-    Process DDInter CSV files into standardized pickle files.
-
-    This function processes raw DDInter 2.0 CSV files and creates standardized
-    data structures for use in Biomni drug-drug interaction analysis.
+    Map drug names to DDInter drug numbers.
 
     Parameters
     ----------
-    data_lake_path : str
-        Path to data lake directory containing raw DDInter CSV files
-    output_dir : str
-        Directory to save processed pickle files
-    """
-    import os
-    import pickle
-    from collections import defaultdict
-    from pathlib import Path
-
-    import pandas as pd
-
-    # Create output directory
-    Path(output_dir).mkdir(exist_ok=True)
-
-    # Define CSV files to process
-    csv_files = [
-        "ddinter_alimentary_tract_metabolism.csv",
-        "ddinter_antineoplastic.csv",
-        "ddinter_antiparasitic.csv",
-        "ddinter_blood_organs.csv",
-        "ddinter_dermatological.csv",
-        "ddinter_hormonal.csv",
-        "ddinter_respiratory.csv",
-        "ddinter_various.csv",
-    ]
-
-    # Load and combine all CSV files
-    dataframes = []
-    for csv_file in csv_files:
-        file_path = os.path.join(data_lake_path, csv_file)
-        if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
-            # Add source category
-            category = csv_file.replace("ddinter_", "").replace(".csv", "")
-            df["category"] = category
-            dataframes.append(df)
-
-    if not dataframes:
-        raise FileNotFoundError("No DDInter CSV files found in data lake")
-
-    # Process data
-    drug_info = _build_drug_registry_inline(dataframes)
-    interaction_matrix = _create_interaction_matrix_inline(dataframes)
-    name_mapping = _create_name_mapping_inline(drug_info)
-
-    # Save processed data
-    with open(os.path.join(output_dir, "ddinter_drugs.pkl"), "wb") as f:
-        pickle.dump(drug_info, f)
-
-    with open(os.path.join(output_dir, "ddinter_interactions.pkl"), "wb") as f:
-        pickle.dump(interaction_matrix, f)
-
-    with open(os.path.join(output_dir, "ddinter_name_mapping.pkl"), "wb") as f:
-        pickle.dump(name_mapping, f)
-
-    # Generate and save statistics
-    stats = _generate_ddinter_statistics_inline(drug_info, interaction_matrix)
-    with open(os.path.join(output_dir, "ddinter_statistics.pkl"), "wb") as f:
-        pickle.dump(stats, f)
-
-
-def _standardize_drug_name_processing(drug_name):
-    """Standardize drug names for consistent matching during processing."""
-    import pandas as pd
-
-    if pd.isna(drug_name):
-        return ""
-
-    # Convert to lowercase and strip whitespace
-    standardized = str(drug_name).strip().lower()
-
-    # Remove common suffixes and prefixes
-    standardized = standardized.replace(" hydrochloride", "")
-    standardized = standardized.replace(" sulfate", "")
-    standardized = standardized.replace(" sodium", "")
-    standardized = standardized.replace(" potassium", "")
-    standardized = standardized.replace(" calcium", "")
-    standardized = standardized.replace(" magnesium", "")
-
-    return standardized
-
-
-def _build_drug_registry_inline(dataframes):
-    """Build comprehensive drug registry from all interactions."""
-    import pandas as pd
-
-    drug_registry = {}
-
-    for df in dataframes:
-        for _, row in df.iterrows():
-            drug_a_id = row["DDInterID_A"]
-            drug_a_name = row["Drug_A"]
-            drug_b_id = row["DDInterID_B"]
-            drug_b_name = row["Drug_B"]
-
-            # Add Drug A
-            if drug_a_id not in drug_registry:
-                drug_registry[drug_a_id] = {
-                    "name": drug_a_name,
-                    "standardized_name": _standardize_drug_name_processing(drug_a_name),
-                    "categories": set(),
-                    "interactions": set(),
-                }
-            drug_registry[drug_a_id]["categories"].add(row["category"])
-
-            # Add Drug B
-            if drug_b_id not in drug_registry:
-                drug_registry[drug_b_id] = {
-                    "name": drug_b_name,
-                    "standardized_name": _standardize_drug_name_processing(drug_b_name),
-                    "categories": set(),
-                    "interactions": set(),
-                }
-            drug_registry[drug_b_id]["categories"].add(row["category"])
-
-            # Record interactions
-            drug_registry[drug_a_id]["interactions"].add(drug_b_id)
-            drug_registry[drug_b_id]["interactions"].add(drug_a_id)
-
-    # Convert sets to lists for pickle serialization
-    for drug_id in drug_registry:
-        drug_registry[drug_id]["categories"] = list(drug_registry[drug_id]["categories"])
-        drug_registry[drug_id]["interactions"] = list(drug_registry[drug_id]["interactions"])
-
-    return drug_registry
-
-
-def _create_interaction_matrix_inline(dataframes):
-    """Create interaction matrix for fast lookups using standardized drug names."""
-    from collections import defaultdict
-
-    import pandas as pd
-
-    combined_df = pd.concat(dataframes, ignore_index=True)
-    interaction_matrix = defaultdict(lambda: defaultdict(list))
-
-    # Create bidirectional interaction matrix using standardized names
-    for _, row in combined_df.iterrows():
-        drug_a_std = _standardize_drug_name_processing(row["Drug_A"])
-        drug_b_std = _standardize_drug_name_processing(row["Drug_B"])
-        level = row["Level"]
-        category = row["category"]
-
-        interaction_data = {
-            "level": level,
-            "category": category,
-            "drug_a_id": row["DDInterID_A"],
-            "drug_b_id": row["DDInterID_B"],
-            "drug_a_name": row["Drug_A"],
-            "drug_b_name": row["Drug_B"],
-        }
-
-        # Add both directions using standardized names as keys
-        interaction_matrix[drug_a_std][drug_b_std].append(interaction_data)
-        interaction_matrix[drug_b_std][drug_a_std].append(interaction_data)
-
-    # Convert to regular dict for pickle
-    interaction_matrix = dict(interaction_matrix)
-    for drug in interaction_matrix:
-        interaction_matrix[drug] = dict(interaction_matrix[drug])
-
-    return interaction_matrix
-
-
-def _create_name_mapping_inline(drug_info):
-    """Create drug name to ID mapping for fuzzy matching."""
-    name_mapping = {}
-
-    for drug_id, drug_data in drug_info.items():
-        original_name = drug_data["name"]
-        standardized_name = drug_data["standardized_name"]
-
-        # Map both original and standardized names
-        name_mapping[original_name.lower()] = drug_id
-        name_mapping[standardized_name] = drug_id
-
-    return name_mapping
-
-
-def _generate_ddinter_statistics_inline(drug_info, interaction_matrix):
-    """Generate statistics about the processed data."""
-    from collections import defaultdict
-
-    stats = {
-        "total_drugs": len(drug_info),
-        "total_interactions": 0,
-        "interaction_levels": defaultdict(int),
-        "drug_categories": defaultdict(int),
-        "most_connected_drugs": [],
-    }
-
-    # Count interactions and levels
-    for drug_a in interaction_matrix:
-        for drug_b in interaction_matrix[drug_a]:
-            interactions = interaction_matrix[drug_a][drug_b]
-            stats["total_interactions"] += len(interactions)
-
-            for interaction in interactions:
-                stats["interaction_levels"][interaction["level"]] += 1
-
-    # Count drug categories
-    for drug_data in drug_info.values():
-        for category in drug_data["categories"]:
-            stats["drug_categories"][category] += 1
-
-    # Find most connected drugs
-    connection_counts = []
-    for drug_id, drug_data in drug_info.items():
-        connection_counts.append(
-            {"drug_id": drug_id, "name": drug_data["name"], "connections": len(drug_data["interactions"])}
-        )
-
-    connection_counts.sort(key=lambda x: x["connections"], reverse=True)
-    stats["most_connected_drugs"] = connection_counts[:10]
+    store : DDInterStore
+        Compiled DDInter store
+    drug_names : list of str
+        Drug names to resolve
 
-    return stats
+    Returns
+    -------
+    tuple
+        (drug numbers of the resolved names, names that were not found)
+    """
+    drugs, missing = [], []
+    for drug_name, drug in zip(drug_names, store.resolve_many(drug_names), strict=True):
+        if drug is None:
+            missing.append(drug_name)
+        else:
+            drugs.append(drug)
+    return drugs, missing
 
 
-def _standardize_drug_name(drug_name, name_mapping):
+def _group_ddinter_pairs(pairs):
     """
-    Standardize drug names using fuzzy matching against DDInter database.
+    Group the rows of `DDInterStore.interacting_pairs` by drug pair.
 
     Parameters
     ----------
-    drug_name : str
-        Original drug name
-    name_mapping : dict
-        Drug name to ID mapping dictionary
+    pairs : pandas.DataFrame
+        Interactions with drug_a, drug_b, level and category columns
 
     Returns
     -------
-    str or None
-        Standardized drug name or None if not found
+    list of dict
+        One {"drug_a", "drug_b", "interactions"} entry per interacting pair, in the order of pairs
     """
-    from difflib import get_close_matches
-
-    # Direct match
-    if drug_name.lower() in name_mapping:
-        return drug_name.lower()
-
-    # Fuzzy match
-    matches = get_close_matches(drug_name.lower(), name_mapping.keys(), n=1, cutoff=0.8)
-    if matches:
-        return matches[0]
-
-    return None
+    if pairs.empty:
+        return []
+    drug_a, drug_b = pairs["drug_a"].to_numpy(), pairs["drug_b"].to_numpy()
+    levels, categories = pairs["level"].astype(str).tolist(), pairs["category"].astype(str).tolist()
+    # Rows of a pair are contiguous; split where the pair changes
+    starts = np.flatnonzero(np.r_[True, (drug_a[1:] != drug_a[:-1]) | (drug_b[1:] != drug_b[:-1])])
+    stops = np.r_[starts[1:], len(pairs)]
+    return [
+        {
+            "drug_a": int(drug_a[start]),
+            "drug_b": int(drug_b[start]),
+            "interactions": [{"level": levels[row], "category": categories[row]} for row in range(start, stop)],
+        }
+        for start, stop in zip(starts, stops, strict=True)
+    ]
 
 
 def _format_interaction_result(interaction_data, drug_name_a, drug_name_b, include_mechanisms=True):
@@ -2349,19 +2287,11 @@ def query_drug_interactions(drug_names, interaction_types=None, severity_levels=
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
-        log += f"Successfully loaded DDInter database with {len(drug_info)} drugs\n\n"
-
-        # Standardize drug names
-        standardized_names = []
-        missing_drugs = []
+        store = _load_ddinter_data(data_lake_path)
+        log += f"Successfully loaded DDInter database with {len(store)} drugs\n\n"
 
-        for drug_name in drug_names:
-            standardized = _standardize_drug_name(drug_name, name_mapping)
-            if standardized:
-                standardized_names.append(standardized)
-            else:
-                missing_drugs.append(drug_name)
+        # Resolve drug names to DDInter drugs
+        standardized_names, missing_drugs = _resolve_ddinter_drugs(store, drug_names)
 
         if missing_drugs:
             log += "Warning: The following drugs were not found in DDInter database:\n"
@@ -2373,36 +2303,11 @@ def query_drug_interactions(drug_names, interaction_types=None, severity_levels=
             log += "Error: No valid drugs found in DDInter database\n"
             return log
 
-        # Query interactions
-        interactions_found = []
-
-        for i, drug_a in enumerate(standardized_names):
-            for j, drug_b in enumerate(standardized_names):
-                if i >= j:  # Avoid duplicate pairs
-                    continue
-
-                if drug_a in interaction_matrix and drug_b in interaction_matrix[drug_a]:
-                    interactions = interaction_matrix[drug_a][drug_b]
-
-                    # Apply filters
-                    filtered_interactions = interactions
-
-                    if severity_levels:
-                        filtered_interactions = [
-                            int_data for int_data in filtered_interactions if int_data.get("level") in severity_levels
-                        ]
-
-                    if interaction_types:
-                        filtered_interactions = [
-                            int_data
-                            for int_data in filtered_interactions
-                            if int_data.get("category") in interaction_types
-                        ]
-
-                    if filtered_interactions:
-                        interactions_found.append(
-                            {"drug_a": drug_a, "drug_b": drug_b, "interactions": filtered_interactions}
-                        )
+        # Query interactions between every pair in the list, with the filters applied
+        pairs = store.interacting_pairs(
+            standardized_names, levels=severity_levels or None, categories=interaction_types or None
+        )
+        interactions_found = _group_ddinter_pairs(pairs)
 
         # Format results
         log += "Interaction Analysis Results:\n"
@@ -2411,7 +2316,10 @@ def query_drug_interactions(drug_names, interaction_types=None, severity_levels=
         if interactions_found:
             for pair in interactions_found:
                 log += _format_interaction_result(
-                    pair["interactions"], pair["drug_a"].title(), pair["drug_b"].title(), include_mechanisms=True
+                    pair["interactions"],
+                    store.standardized_name(pair["drug_a"]).title(),
+                    store.standardized_name(pair["drug_b"]).title(),
+                    include_mechanisms=True,
                 )
                 log += "\n"
         else:
@@ -2477,19 +2385,11 @@ def check_drug_combination_safety(drug_list, include_mechanisms=True, include_ma
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
+        store = _load_ddinter_data(data_lake_path)
         log += "Successfully loaded DDInter database\n\n"
 
-        # Standardize drug names
-        standardized_drugs = []
-        missing_drugs = []
-
-        for drug in drug_list:
-            standardized = _standardize_drug_name(drug, name_mapping)
-            if standardized:
-                standardized_drugs.append(standardized)
-            else:
-                missing_drugs.append(drug)
+        # Resolve drug names to DDInter drugs
+        standardized_drugs, missing_drugs = _resolve_ddinter_drugs(store, drug_list)
 
         if missing_drugs:
             log += "Warning: The following drugs were not found in DDInter database:\n"
@@ -2502,29 +2402,12 @@ def check_drug_combination_safety(drug_list, include_mechanisms=True, include_ma
             return log
 
         # Analyze all pairwise interactions
-        interactions_found = []
-        major_interactions = 0
-        moderate_interactions = 0
-        minor_interactions = 0
-
-        for i, drug_a in enumerate(standardized_drugs):
-            for j, drug_b in enumerate(standardized_drugs):
-                if i >= j:  # Avoid duplicate pairs
-                    continue
-
-                if drug_a in interaction_matrix and drug_b in interaction_matrix[drug_a]:
-                    interactions = interaction_matrix[drug_a][drug_b]
-
-                    for interaction in interactions:
-                        level = interaction.get("level", "Unknown")
-                        if level == "Major":
-                            major_interactions += 1
-                        elif level == "Moderate":
-                            moderate_interactions += 1
-                        elif level == "Minor":
-                            minor_interactions += 1
-
-                    interactions_found.append({"drug_a": drug_a, "drug_b": drug_b, "interactions": interactions})
+        pairs = store.interacting_pairs(standardized_drugs)
+        interactions_found = _group_ddinter_pairs(pairs)
+        level_counts = pairs["level"].value_counts()
+        major_interactions = int(level_counts.get("Major", 0))
+        moderate_interactions = int(level_counts.get("Moderate", 0))
+        minor_interactions = int(level_counts.get("Minor", 0))
 
         # Overall safety assessment
         log += "Overall Safety Assessment:\n"
@@ -2561,8 +2444,8 @@ def check_drug_combination_safety(drug_list, include_mechanisms=True, include_ma
             for pair in interactions_found:
                 log += _format_interaction_result(
                     pair["interactions"],
-                    pair["drug_a"].title(),
-                    pair["drug_b"].title(),
+                    store.standardized_name(pair["drug_a"]).title(),
+                    store.standardized_name(pair["drug_b"]).title(),
                     include_mechanisms=include_mechanisms,
                 )
                 log += "\n"
@@ -2641,44 +2524,36 @@ def analyze_interaction_mechanisms(drug_pair, detailed_analysis=True, data_lake_
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
+        store = _load_ddinter_data(data_lake_path)
         log += "Successfully loaded DDInter database\n\n"
 
-        # Standardize drug names
-        std_drug_a = _standardize_drug_name(drug_a, name_mapping)
-        std_drug_b = _standardize_drug_name(drug_b, name_mapping)
+        # Resolve drug names to DDInter drugs
+        drug_a_id = store.resolve(drug_a)
+        drug_b_id = store.resolve(drug_b)
 
-        if not std_drug_a:
+        if drug_a_id is None:
             log += f"Error: Drug '{drug_a}' not found in DDInter database\n"
             return log
-        if not std_drug_b:
+        if drug_b_id is None:
             log += f"Error: Drug '{drug_b}' not found in DDInter database\n"
             return log
 
         # Query interactions
-        interactions = []
-        if std_drug_a in interaction_matrix and std_drug_b in interaction_matrix[std_drug_a]:
-            interactions = interaction_matrix[std_drug_a][std_drug_b]
+        interactions = store.interactions(drug_a_id, drug_b_id)
 
         if not interactions:
             log += f"No interactions found between {drug_a} and {drug_b}\n"
             return log
 
-        # Get drug information
-        drug_a_id = name_mapping[std_drug_a]
-        drug_b_id = name_mapping[std_drug_b]
-        drug_a_info = drug_info.get(drug_a_id, {})
-        drug_b_info = drug_info.get(drug_b_id, {})
-
         log += "Drug Profile Analysis:\n"
         log += "-" * 20 + "\n"
         log += f"{drug_a.title()}:\n"
-        log += f"- Categories: {', '.join(drug_a_info.get('categories', ['Unknown']))}\n"
-        log += f"- Total known interactions: {len(drug_a_info.get('interactions', []))}\n\n"
+        log += f"- Categories: {', '.join(store.drug_categories(drug_a_id))}\n"
+        log += f"- Total known interactions: {store.partner_count(drug_a_id)}\n\n"
 
         log += f"{drug_b.title()}:\n"
-        log += f"- Categories: {', '.join(drug_b_info.get('categories', ['Unknown']))}\n"
-        log += f"- Total known interactions: {len(drug_b_info.get('interactions', []))}\n\n"
+        log += f"- Categories: {', '.join(store.drug_categories(drug_b_id))}\n"
+        log += f"- Total known interactions: {store.partner_count(drug_b_id)}\n\n"
 
         # Analyze interaction mechanisms
         log += "Interaction Mechanism Analysis:\n"
@@ -2798,25 +2673,17 @@ def find_alternative_drugs_ddinter(target_drug, contraindicated_drugs, therapeut
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
-        log += f"Successfully loaded DDInter database with {len(drug_info)} drugs\n\n"
+        store = _load_ddinter_data(data_lake_path)
+        log += f"Successfully loaded DDInter database with {len(store)} drugs\n\n"
 
-        # Standardize target drug name
-        std_target = _standardize_drug_name(target_drug, name_mapping)
-        if not std_target:
+        # Resolve target drug name
+        target_id = store.resolve(target_drug)
+        if target_id is None:
             log += f"Error: Target drug '{target_drug}' not found in DDInter database\n"
             return log
 
-        # Standardize contraindicated drug names
-        std_contraindicated = []
-        missing_contraindicated = []
-
-        for drug in contraindicated_drugs:
-            std_drug = _standardize_drug_name(drug, name_mapping)
-            if std_drug:
-                std_contraindicated.append(std_drug)
-            else:
-                missing_contraindicated.append(drug)
+        # Resolve contraindicated drug names
+        std_contraindicated, missing_contraindicated = _resolve_ddinter_drugs(store, contraindicated_drugs)
 
         if missing_contraindicated:
             log += "Warning: The following contraindicated drugs were not found:\n"
@@ -2825,70 +2692,31 @@ def find_alternative_drugs_ddinter(target_drug, contraindicated_drugs, therapeut
             log += "\n"
 
         # Get target drug information
-        target_id = name_mapping[std_target]
-        target_info = drug_info.get(target_id, {})
-        target_categories = target_info.get("categories", [])
+        target_categories = store.drug_categories(target_id)
 
         log += "Target Drug Profile:\n"
         log += f"- Drug: {target_drug}\n"
         log += f"- Categories: {', '.join(target_categories)}\n"
-        log += f"- Total interactions: {len(target_info.get('interactions', []))}\n\n"
-
-        # Find alternative drugs
-        alternatives = []
-
-        for drug_id, drug_data in drug_info.items():
-            drug_name = drug_data["name"]
-            drug_categories = drug_data.get("categories", [])
-
-            # Skip the target drug itself
-            if drug_id == target_id:
-                continue
-
-            # Apply therapeutic class filter
-            if therapeutic_class:
-                if not any(therapeutic_class.lower() in cat.lower() for cat in drug_categories):
-                    continue
-            else:
-                # Look for drugs in similar categories as target
-                if not any(cat in target_categories for cat in drug_categories):
-                    continue
-
-            # Check if this drug interacts with any contraindicated drugs
-            has_contraindicated_interactions = False
-            interaction_count = 0
-            major_interactions = 0
-
-            std_drug_name = drug_data["standardized_name"]
+        log += f"- Total interactions: {store.partner_count(target_id)}\n\n"
 
-            for contraindicated in std_contraindicated:
-                if std_drug_name in interaction_matrix and contraindicated in interaction_matrix[std_drug_name]:
-                    interactions = interaction_matrix[std_drug_name][contraindicated]
-                    interaction_count += len(interactions)
-
-                    # Check for major interactions
-                    for interaction in interactions:
-                        if interaction.get("level") == "Major":
-                            major_interactions += 1
-                            has_contraindicated_interactions = True
-                            break
-
-                    if has_contraindicated_interactions:
-                        break
-
-            # Add to alternatives if no major contraindicated interactions
-            if not has_contraindicated_interactions:
-                alternatives.append(
-                    {
-                        "name": drug_name,
-                        "categories": drug_categories,
-                        "interaction_count": interaction_count,
-                        "total_interactions": len(drug_data.get("interactions", [])),
-                    }
-                )
+        # Candidates share a category with the target, or match the therapeutic class filter
+        if therapeutic_class:
+            class_categories = [cat for cat in store.category_names if therapeutic_class.lower() in cat.lower()]
+            category_mask = store.category_mask(class_categories)
+        else:
+            category_mask = store.category_mask(target_categories)
 
-        # Sort alternatives by interaction count (fewer is better)
-        alternatives.sort(key=lambda x: x["interaction_count"])
+        # Drop drugs with a Major interaction against any contraindicated drug, fewest interactions first
+        ranked = store.alternatives(category_mask, std_contraindicated, exclude_levels=["Major"], exclude=[target_id])
+        alternatives = [
+            {
+                "name": row.name,
+                "categories": store.drug_categories(row.drug),
+                "interaction_count": int(row.interaction_count),
+                "total_interactions": int(row.total_interactions),
+            }
+            for row in ranked.itertuples(index=False)
+        ]
 
         # Present results
         log += "Alternative Drug Analysis:\n"
@@ -2963,6 +2791,46 @@ def find_alternative_drugs_ddinter(target_drug, contraindicated_drugs, therapeut
 
 # OpenFDA Integration Functions
 
+OPENFDA_CACHE_DIR = os.getenv("BIOMNI_OPENFDA_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "biomni", "openfda"
+)
+# Cached responses older than this (in seconds) are fetched again; OpenFDA refreshes its data weekly
+OPENFDA_CACHE_TTL = float(os.getenv("BIOMNI_OPENFDA_CACHE_TTL", 24 * 3600))
+# OpenFDA allows 240 requests per minute per IP or API key
+OPENFDA_REQUESTS_PER_SECOND = float(os.getenv("BIOMNI_OPENFDA_REQUESTS_PER_SECOND", 4))
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: up to `capacity` requests at once, refilled at `rate` per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        import time
+
+        self.rate = rate
+        self.capacity = capacity
+        self.time = time
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self.time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self.time.sleep(wait)
+
+
+# Shared by every client in the process, so concurrent tools stay within the API's rate limit together
+_openfda_rate_limiter = _TokenBucket(OPENFDA_REQUESTS_PER_SECOND, capacity=OPENFDA_REQUESTS_PER_SECOND)
+_openfda_client = None
+_openfda_client_lock = threading.Lock()
+
 
 class OpenFDAClient:
     """
@@ -2970,11 +2838,18 @@ class OpenFDAClient:
 
     Provides comprehensive drug safety monitoring, adverse event analysis,
     and regulatory intelligence capabilities through the OpenFDA API.
+
+    Responses are cached on disk by endpoint and query (see OPENFDA_CACHE_DIR), requests from all
+    clients share one rate limiter, and `fetch_all` pages through large result sets concurrently.
+    Use `get_openfda_client` for the process-wide instance.
     """
 
     BASE_URL = "https://api.fda.gov"
+    # Largest page the API serves, and the largest skip it accepts
+    MAX_LIMIT = 1000
+    MAX_SKIP = 25000
 
-    def __init__(self):
+    def __init__(self, cache_dir: str | None = OPENFDA_CACHE_DIR, max_workers: int = 4):
         import time
 
         import requests
@@ -2983,20 +2858,18 @@ class OpenFDAClient:
         self.time = time
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "Biomni-Agent/1.0 (https://biomni.stanford.edu)"})
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=max_workers))
         self.retry_attempts = 3
         self.timeout = 30
-        self.rate_limit_delay = 0.2  # 5 requests/second
-        self.last_request_time = 0
+        self.rate_limiter = _openfda_rate_limiter
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        # Optional; raises the daily request quota
+        self.api_key = os.getenv("OPENFDA_API_KEY")
 
     def _handle_rate_limiting(self):
         """Implement rate limiting to respect FDA API limits."""
-        current_time = self.time.time()
-        time_since_last = current_time - self.last_request_time
-
-        if time_since_last < self.rate_limit_delay:
-            self.time.sleep(self.rate_limit_delay - time_since_last)
-
-        self.last_request_time = self.time.time()
+        self.rate_limiter.acquire()
 
     def _validate_response(self, response_data: dict) -> dict:
         """Validate FDA API response structure and handle variations."""
@@ -3041,54 +2914,91 @@ class OpenFDAClient:
     def _build_fda_search_params(self, endpoint: str, params: dict) -> dict:
         """Build FDA API search parameters from input parameters."""
         fda_params = {}
+        clauses = []
 
         # Handle drug name searches
         if "drug_name" in params:
             drug_name = params["drug_name"]
+            # Multi-word names are quoted, so they stay one term when combined with other clauses
+            if " " in drug_name:
+                drug_name = f'"{drug_name}"'
             if endpoint == "drug/event":
                 # For adverse events, search in medicinalproduct field
-                fda_params["search"] = f"patient.drug.medicinalproduct:{drug_name}"
+                clauses.append(f"patient.drug.medicinalproduct:{drug_name}")
             elif endpoint == "drug/label":
                 # For drug labels, search in brand name
-                fda_params["search"] = f"openfda.brand_name:{drug_name}"
+                clauses.append(f"openfda.brand_name:{drug_name}")
             elif endpoint == "drug/enforcement":
                 # For enforcement/recalls, search in brand name
-                fda_params["search"] = f"openfda.brand_name:{drug_name}"
+                clauses.append(f"openfda.brand_name:{drug_name}")
+
+        # Additional raw search clauses, e.g. "serious:1", are combined with AND
+        if params.get("search"):
+            clauses.append(params["search"])
+        if clauses:
+            fda_params["search"] = " AND ".join(clauses)
 
         # Handle other parameters
-        for key, value in params.items():
-            if key not in ["drug_name"]:  # Skip drug_name as it's handled above
-                if key == "limit":
-                    fda_params["limit"] = value
-                elif key == "skip":
-                    fda_params["skip"] = value
-                # Add other FDA API parameters as needed
+        for key in ("count", "limit", "skip"):
+            if params.get(key) is not None:
+                fda_params[key] = params[key]
 
         return fda_params
 
-    def _make_request(self, endpoint: str, params: dict) -> dict:
-        """Make API request with retry logic and error handling."""
-        self._handle_rate_limiting()
-
-        # Build FDA API search parameters
-        fda_params = self._build_fda_search_params(endpoint, params)
+    def _cache_path(self, endpoint: str, fda_params: dict) -> str:
+        key = json.dumps([endpoint, sorted(fda_params.items())], default=str)
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(key.encode()).hexdigest()}.json")
 
+    def _read_cache(self, path: str) -> dict | None:
+        try:
+            if self.time.time() - os.path.getmtime(path) > OPENFDA_CACHE_TTL:
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, path: str, data: dict):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # A read-only or full cache directory only costs the cache
+            pass
+
+    def _get(self, endpoint: str, fda_params: dict) -> dict:
+        """Fetch one page of FDA API parameters, from the response cache when possible."""
+        cache_path = self._cache_path(endpoint, fda_params) if self.cache_dir else None
+        if cache_path:
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                return cached
+
+        request_params = {**fda_params, "api_key": self.api_key} if self.api_key else fda_params
         for attempt in range(self.retry_attempts):
+            self._handle_rate_limiting()
             try:
-                response = self.session.get(f"{self.BASE_URL}/{endpoint}.json", params=fda_params, timeout=self.timeout)
+                response = self.session.get(
+                    f"{self.BASE_URL}/{endpoint}.json", params=request_params, timeout=self.timeout
+                )
 
                 if response.status_code == 404:
-                    return {
+                    data = {
                         "results": [],
                         "meta": {"results": {"total": 0}},
                         "message": "No results found for the specified query",
                     }
+                else:
+                    response.raise_for_status()
 
-                response.raise_for_status()
-
-                # Validate and normalize response
-                data = self._validate_response(response.json())
+                    # Validate and normalize response
+                    data = self._validate_response(response.json())
 
+                if cache_path:
+                    self._write_cache(cache_path, data)
                 return data
 
             except self.requests.exceptions.Timeout:
@@ -3111,13 +3021,73 @@ class OpenFDAClient:
 
         return {}
 
-    def query_adverse_events(self, drug_name: str, limit: int = 100) -> dict:
+    def _make_request(self, endpoint: str, params: dict) -> dict:
+        """Make API request with retry logic and error handling."""
+        # Build FDA API search parameters
+        return self._get(endpoint, self._build_fda_search_params(endpoint, params))
+
+    def fetch_all(self, endpoint: str, params: dict, max_records: int | None = None) -> dict:
+        """Fetch every record matching a query, paging concurrently with `skip`.
+
+        Args:
+            endpoint: API endpoint, e.g. "drug/event"
+            params: Query parameters as for `_make_request` (limit and skip are ignored)
+            max_records: Maximum number of records; None for all the API serves (MAX_SKIP + MAX_LIMIT)
+
+        Returns:
+            The first page's response with the results of all pages
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        fda_params = self._build_fda_search_params(endpoint, params)
+        fda_params.pop("skip", None)
+        cap = (
+            self.MAX_SKIP + self.MAX_LIMIT if max_records is None else min(max_records, self.MAX_SKIP + self.MAX_LIMIT)
+        )
+        first = self._get(endpoint, {**fda_params, "limit": min(cap, self.MAX_LIMIT)})
+        results = list(first.get("results", []))
+        total = first.get("meta", {}).get("results", {}).get("total", len(results))
+        wanted = min(cap, total)
+
+        skips = range(len(results), wanted, self.MAX_LIMIT) if results else []
+        if skips:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                pages = pool.map(
+                    lambda skip: self._get(
+                        endpoint, {**fda_params, "skip": skip, "limit": min(self.MAX_LIMIT, wanted - skip)}
+                    ),
+                    skips,
+                )
+                for page in pages:
+                    results.extend(page.get("results", []))
+        return {**first, "results": results[:wanted]}
+
+    def count(self, endpoint: str, params: dict, field: str, limit: int | None = None) -> list[dict]:
+        """Aggregate the records matching a query by a field, server-side.
+
+        Args:
+            endpoint: API endpoint, e.g. "drug/event"
+            params: Query parameters as for `_make_request`
+            field: Field to count by, e.g. "patient.reaction.reactionmeddrapt.exact" or "receivedate"
+            limit: Maximum number of terms (the API returns 100 by default, at most MAX_LIMIT)
+
+        Returns:
+            List of {"term": ..., "count": ...} (or {"time": ..., "count": ...} for dates), most frequent first
+        """
+        return self._make_request(endpoint, {**params, "count": field, "limit": limit}).get("results", [])
+
+    def total(self, endpoint: str, params: dict) -> int:
+        """Return the number of records matching a query."""
+        data = self._make_request(endpoint, {**params, "limit": 1})
+        return data.get("meta", {}).get("results", {}).get("total", 0)
+
+    def query_adverse_events(self, drug_name: str, limit: int | None = 100) -> dict:
         """Query adverse events with robust error handling and validation."""
         endpoint = "drug/event"
-        params = {"drug_name": drug_name, "limit": limit}
+        params = {"drug_name": drug_name}
 
         try:
-            data = self._make_request(endpoint, params)
+            data = self.fetch_all(endpoint, params, max_records=limit)
 
             # Add FDA disclaimer to results
             data["disclaimer"] = (
@@ -3142,16 +3112,26 @@ class OpenFDAClient:
     def query_drug_labels(self, drug_name: str, sections: list[str] | None = None) -> dict:
         """Query FDA drug label information."""
         endpoint = "drug/label"
-        params = {"drug_name": drug_name, "limit": 50}
+        # Only the best matching label is reported, and labels are large
+        params = {"drug_name": drug_name, "limit": 1}
 
         return self._make_request(endpoint, params)
 
     def query_drug_recalls(self, drug_name: str, classification: list[str] | None = None) -> dict:
         """Query FDA drug recall and enforcement information."""
         endpoint = "drug/enforcement"
-        params = {"drug_name": drug_name, "limit": 100}
+        params = {"drug_name": drug_name}
+
+        return self.fetch_all(endpoint, params)
 
-        return self._make_request(endpoint, params)
+
+def get_openfda_client() -> OpenFDAClient:
+    """Return the process-wide OpenFDA client, so its session and connection pool are reused."""
+    global _openfda_client
+    with _openfda_client_lock:
+        if _openfda_client is None:
+            _openfda_client = OpenFDAClient()
+        return _openfda_client
 
 
 # Helper Functions for OpenFDA Data Processing
@@ -3159,21 +3139,9 @@ class OpenFDAClient:
 
 def _standardize_drug_name_fda(drug_name: str) -> str:
     """Standardize drug names for FDA API queries."""
-    # Handle None/empty values
-    if not drug_name:
-        return ""
-
-    # Remove common suffixes
-    suffixes = ["sodium", "hydrochloride", "sulfate", "phosphate", "acetate", "citrate"]
+    from biomni.data_lake.drug_names import normalize_drug_name
 
-    # Clean and standardize
-    name = drug_name.strip().lower()
-
-    for suffix in suffixes:
-        if name.endswith(f" {suffix}"):
-            name = name[: -len(f" {suffix}")]
-
-    return name
+    return normalize_drug_name(drug_name)
 
 
 def _apply_fda_filters(response_data: dict, filters: dict) -> dict:
@@ -3230,92 +3198,82 @@ def _apply_fda_filters(response_data: dict, filters: dict) -> dict:
     return response_data
 
 
-def _extract_fda_safety_signals(response_list: list[dict]) -> dict:
-    """Extract safety signals from adverse event data."""
-    drug_signals = {}
-    reaction_patterns = {}
-    temporal_patterns = {}
-
-    for response in response_list:
-        if not response.get("results"):
-            continue
+def _count_fda_safety_signals(client: OpenFDAClient, drug_list: list[str], temporal: bool = False) -> dict:
+    """Aggregate safety signals over every adverse event report of each drug with OpenFDA count queries.
 
-        for result in response["results"]:
-            # Extract drug information
-            drugs = result.get("patient", {}).get("drug", [])
-            for drug in drugs:
-                # Use the existing standardization function
-                drug_name = _standardize_drug_name_fda(drug.get("medicinalproduct", ""))
-                if drug_name:
-                    if drug_name not in drug_signals:
-                        drug_signals[drug_name] = {"total_reports": 0, "serious_reports": 0, "common_reactions": []}
-
-                    drug_signals[drug_name]["total_reports"] += 1
-                    if result.get("serious") == "1":
-                        drug_signals[drug_name]["serious_reports"] += 1
-
-            # Extract reaction patterns
-            reactions = result.get("patient", {}).get("reaction", [])
-            for reaction in reactions:
-                reaction_name = reaction.get("reactionmeddrapt", "")
-                if reaction_name:
-                    if reaction_name not in reaction_patterns:
-                        reaction_patterns[reaction_name] = {
-                            "count": 0,
-                            "severity_counts": {"serious": 0, "non_serious": 0},
-                        }
-
-                    reaction_patterns[reaction_name]["count"] += 1
-
-                    # Count severity
-                    if result.get("serious") == "1":
-                        reaction_patterns[reaction_name]["severity_counts"]["serious"] += 1
-                    else:
-                        reaction_patterns[reaction_name]["severity_counts"]["non_serious"] += 1
+    Args:
+        client: OpenFDA client
+        drug_list: Drug names; the signals are keyed by these names
+        temporal: Also count reports per month (YYYYMM)
 
-            # Extract temporal patterns
-            receipt_date = result.get("receiptdate")
-            if receipt_date and len(receipt_date) >= 6:
-                year_month = receipt_date[:6]  # YYYYMM
-                if year_month not in temporal_patterns:
-                    temporal_patterns[year_month] = {"count": 0, "serious_count": 0}
+    Returns:
+        Dict with drug_signals (total and serious reports, top 3 reactions per drug), reaction_patterns
+        (reports per reaction, by seriousness, summed over the drugs), temporal_patterns and errors (the
+        error message of each drug whose queries failed; the other drugs' signals are kept)
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
-                temporal_patterns[year_month]["count"] += 1
-                if result.get("serious") == "1":
-                    temporal_patterns[year_month]["serious_count"] += 1
+    endpoint = "drug/event"
+    reaction_field = "patient.reaction.reactionmeddrapt.exact"
 
-    # Build common reactions for each drug based on actual data
-    for drug_name in drug_signals:
-        # Find reactions that occurred with this specific drug
-        drug_reactions = {}
+    def drug_counts(drug):
+        params = {"drug_name": _standardize_drug_name_fda(drug)}
+        serious = {**params, "search": "serious:1"}
+        try:
+            counts = {
+                "total": client.total(endpoint, params),
+                "serious": client.total(endpoint, serious),
+                "reactions": client.count(endpoint, params, reaction_field, limit=client.MAX_LIMIT),
+                "serious_reactions": client.count(endpoint, serious, reaction_field, limit=client.MAX_LIMIT),
+            }
+            if temporal:
+                counts["dates"] = client.count(endpoint, params, "receivedate")
+                counts["serious_dates"] = client.count(endpoint, serious, "receivedate")
+        except Exception as e:
+            # One failing drug (e.g. an HTTP error after retries) must not discard the others' signals
+            return {"total": 0, "error": str(e)}
+        return counts
 
-        for response in response_list:
-            if not response.get("results"):
-                continue
+    # The shared rate limiter paces the requests; the threads only overlap their latency
+    with ThreadPoolExecutor(max_workers=client.max_workers) as pool:
+        all_counts = dict(zip(drug_list, pool.map(drug_counts, drug_list), strict=True))
 
-            for result in response["results"]:
-                drugs = result.get("patient", {}).get("drug", [])
-                has_this_drug = any(
-                    _standardize_drug_name_fda(drug.get("medicinalproduct", "")) == drug_name for drug in drugs
-                )
+    drug_signals = {}
+    reaction_patterns = {}
+    temporal_patterns = {}
+    errors = {}
+    for drug, counts in all_counts.items():
+        if "error" in counts:
+            errors[drug] = counts["error"]
+        if not counts["total"]:
+            continue
+        drug_signals[drug] = {
+            "total_reports": counts["total"],
+            "serious_reports": counts["serious"],
+            "common_reactions": [item["term"] for item in counts["reactions"][:3]],
+        }
 
-                if has_this_drug:
-                    reactions = result.get("patient", {}).get("reaction", [])
-                    for reaction in reactions:
-                        reaction_name = reaction.get("reactionmeddrapt", "")
-                        if reaction_name:
-                            if reaction_name not in drug_reactions:
-                                drug_reactions[reaction_name] = 0
-                            drug_reactions[reaction_name] += 1
+        serious_reactions = {item["term"]: item["count"] for item in counts["serious_reactions"]}
+        for item in counts["reactions"]:
+            pattern = reaction_patterns.setdefault(
+                item["term"], {"count": 0, "severity_counts": {"serious": 0, "non_serious": 0}}
+            )
+            serious_count = serious_reactions.get(item["term"], 0)
+            pattern["count"] += item["count"]
+            pattern["severity_counts"]["serious"] += serious_count
+            pattern["severity_counts"]["non_serious"] += item["count"] - serious_count
 
-        # Get top 3 reactions for this drug
-        top_reactions = sorted(drug_reactions.items(), key=lambda x: x[1], reverse=True)[:3]
-        drug_signals[drug_name]["common_reactions"] = [r[0] for r in top_reactions]
+        for key, field in (("dates", "count"), ("serious_dates", "serious_count")):
+            for item in counts.get(key, []):
+                year_month = item["time"][:6]  # YYYYMM
+                pattern = temporal_patterns.setdefault(year_month, {"count": 0, "serious_count": 0})
+                pattern[field] += item["count"]
 
     return {
         "drug_signals": drug_signals,
         "reaction_patterns": reaction_patterns,
-        "temporal_patterns": temporal_patterns,
+        "temporal_patterns": dict(sorted(temporal_patterns.items())),
+        "errors": errors,
     }
 
 
@@ -3541,6 +3499,9 @@ def _format_safety_signal_summary(
             if drug_data.get("common_reactions"):
                 summary += f"   - Common reactions: {', '.join(drug_data['common_reactions'])}\n"
             summary += "\n"
+        elif drug_name in signals_data.get("errors", {}):
+            summary += f"{i}. {drug_name.title()}\n"
+            summary += f"   - Query failed: {signals_data['errors'][drug_name]}\n\n"
         else:
             summary += f"{i}. {drug_name.title()}\n"
             summary += "   - No data found\n\n"
@@ -3573,7 +3534,7 @@ def query_fda_adverse_events(
     date_range: tuple[str, str] | None = None,
     severity_filter: list[str] | None = None,
     outcome_filter: list[str] | None = None,
-    limit: int = 100,
+    limit: int | None = 100,
 ) -> str:
     """
     Query FDA adverse event reports for specific drugs.
@@ -3583,7 +3544,7 @@ def query_fda_adverse_events(
         date_range: Optional date range as (start_date, end_date) in YYYY-MM-DD format
         severity_filter: Optional filter by severity levels ["serious", "non_serious"]
         outcome_filter: Optional filter by outcomes ["life_threatening", "hospitalization", "death"]
-        limit: Maximum number of results to return
+        limit: Maximum number of reports to retrieve, paged in parallel (None for all the API serves)
 
     Returns:
         Formatted string with adverse event analysis
@@ -3593,7 +3554,7 @@ def query_fda_adverse_events(
         if not drug_name or not drug_name.strip():
             return "Error: Drug name cannot be empty"
 
-        client = OpenFDAClient()
+        client = get_openfda_client()
 
         # Standardize drug name
         standardized_name = _standardize_drug_name_fda(drug_name)
@@ -3668,7 +3629,7 @@ def get_fda_drug_label_info(drug_name: str, sections: list[str] | None = None) -
         if not drug_name or not drug_name.strip():
             return "Error: Drug name cannot be empty"
 
-        client = OpenFDAClient()
+        client = get_openfda_client()
 
         # Standardize drug name
         standardized_name = _standardize_drug_name_fda(drug_name)
@@ -3708,7 +3669,7 @@ def check_fda_drug_recalls(
         if not drug_name or not drug_name.strip():
             return "Error: Drug name cannot be empty"
 
-        client = OpenFDAClient()
+        client = get_openfda_client()
 
         # Standardize drug name
         standardized_name = _standardize_drug_name_fda(drug_name)
@@ -3765,26 +3726,21 @@ def analyze_fda_safety_signals(
         if not valid_drugs:
             return "Error: No valid drug names provided"
 
-        client = OpenFDAClient()
-
-        # Collect data for all drugs
-        all_responses = []
+        client = get_openfda_client()
 
-        for drug in valid_drugs:
-            standardized_name = _standardize_drug_name_fda(drug)
-            if standardized_name:  # Only query if standardization worked
-                response = client.query_adverse_events(standardized_name, limit=200)
+        # Only query drugs whose names standardize
+        queried_drugs = [drug for drug in valid_drugs if _standardize_drug_name_fda(drug)]
 
-                if response.get("results"):
-                    all_responses.append(response)
+        # Aggregate the full report sets server-side instead of downloading a sample of reports
+        signals = _count_fda_safety_signals(client, queried_drugs, temporal=comparison_period is not None)
 
         # Check if we got any data
-        if not all_responses:
+        if not signals["drug_signals"]:
+            if signals["errors"]:
+                failures = "; ".join(f"{drug}: {error}" for drug, error in signals["errors"].items())
+                return f"Error: No adverse event data found for any of the provided drugs ({failures})"
             return "Error: No adverse event data found for any of the provided drugs"
 
-        # Extract safety signals
-        signals = _extract_fda_safety_signals(all_responses)
-
         # Format results with comparison period and threshold info
         return _format_safety_signal_summary(signals, valid_drugs, comparison_period, signal_threshold)
 
@@ -1,31 +1,61 @@
 import sys
+import threading
 from io import StringIO
 
 # Create a persistent namespace that will be shared across all executions
 _persistent_namespace = {}
 
+# Per-thread capture buffer so concurrent executions don't steal each other's output
+_capture = threading.local()
 
-def run_python_repl(command: str) -> str:
+
+class _StdoutRouter:
+    """Route writes to the calling thread's capture buffer, or to the real stdout if none is active."""
+
+    def __init__(self, default):
+        self._default = default
+
+    def write(self, text):
+        buffer = getattr(_capture, "buffer", None)
+        return (buffer if buffer is not None else self._default).write(text)
+
+    def flush(self):
+        buffer = getattr(_capture, "buffer", None)
+        (buffer if buffer is not None else self._default).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._default, name)
+
+
+def run_python_repl(command: str, namespace: dict | None = None) -> str:
     """Executes the provided Python command in a persistent environment and returns the output.
     Variables defined in one execution will be available in subsequent executions.
+
+    Args:
+        command: Python code to execute
+        namespace: Namespace to execute in. Defaults to the shared persistent namespace; the async
+            agent passes a per-session dict so concurrent sessions don't see each other's variables.
+
     """
 
     def execute_in_repl(command: str) -> str:
         """Helper function to execute the command in the persistent environment."""
-        old_stdout = sys.stdout
-        sys.stdout = mystdout = StringIO()
+        if not isinstance(sys.stdout, _StdoutRouter):
+            sys.stdout = _StdoutRouter(sys.stdout)
+        _capture.buffer = mystdout = StringIO()
 
-        # Use the persistent namespace
+        # Use the persistent namespace unless the caller brought its own
         global _persistent_namespace
+        exec_namespace = _persistent_namespace if namespace is None else namespace
 
         try:
             # Execute the command in the persistent namespace
-            exec(command, _persistent_namespace)
+            exec(command, exec_namespace)
             output = mystdout.getvalue()
         except Exception as e:
             output = f"Error: {str(e)}"
         finally:
-            sys.stdout = old_stdout
+            _capture.buffer = None
         return output
 
     command = command.strip("```").strip()
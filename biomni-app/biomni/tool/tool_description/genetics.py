@@ -257,6 +257,52 @@ description = [
             },
         ],
     },
+    {
+        "description": "Scans many DNA sequences for the binding sites of many transcription factors at once "
+        "with JASPAR motifs from a local cache, on both strands, using a relative score or p-value threshold.",
+        "name": "scan_transcription_factor_binding_sites",
+        "optional_parameters": [
+            {
+                "default": None,
+                "description": "TF names or JASPAR matrix IDs (e.g. 'GATA1', 'MA0139'); default: every cached motif",
+                "name": "tf_names",
+                "type": "List[str]",
+            },
+            {
+                "default": 0.8,
+                "description": "Minimum relative score of a site (0.0-1.0); ignored when pvalue is given",
+                "name": "threshold",
+                "type": "float",
+            },
+            {
+                "default": None,
+                "description": "Maximum p-value of a site (e.g. 1e-4)",
+                "name": "pvalue",
+                "type": "float",
+            },
+            {
+                "default": True,
+                "description": "Scan the reverse complement as well",
+                "name": "both_strands",
+                "type": "bool",
+            },
+            {
+                "default": None,
+                "description": "Path to save all sites as a tab-separated table",
+                "name": "output_file",
+                "type": "str",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "A DNA sequence, a list of sequences, a dict of name to sequence, or a path to a "
+                "FASTA or GenBank file",
+                "name": "sequences",
+                "type": "Union[str, List[str], Dict[str, str]]",
+            }
+        ],
+    },
     {
         "description": "Fit a linear mixed model for genomic prediction using genotype and phenotype data.",
         "name": "fit_genomic_prediction_model",
@@ -434,7 +434,8 @@ description = [
         ],
     },
     {
-        "description": "Analyze overlaps between two or more sets of genomic regions.",
+        "description": "Analyze overlaps between two or more sets of genomic regions: pairwise overlap counts, "
+        "overlap size and Jaccard index, plus overlap matrices across all sets.",
         "name": "analyze_genomic_region_overlap",
         "optional_parameters": [
             {
@@ -447,7 +448,8 @@ description = [
         "required_parameters": [
             {
                 "default": None,
-                "description": "List of genomic region sets. Each "
+                "description": "List of genomic region sets, or a dict "
+                "of set name to region set. Each "
                 "item can be either a string path to "
                 "a BED file or a list of "
                 "tuples/lists with format (chrom, "
@@ -458,4 +460,32 @@ description = [
             }
         ],
     },
+    {
+        "description": "Find the nearest reference region (e.g. gene or peak) to each query region on the same "
+        "chromosome, with its distance in bp.",
+        "name": "find_nearest_genomic_regions",
+        "optional_parameters": [
+            {
+                "default": "nearest_regions.tsv",
+                "description": "Path to save the nearest region of every query region",
+                "name": "output_file",
+                "type": "str",
+            }
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "Path to a BED file, or a list of tuples/lists with format (chrom, start, end) "
+                "or (chrom, start, end, name)",
+                "name": "query_regions",
+                "type": "str",
+            },
+            {
+                "default": None,
+                "description": "Reference regions, as a BED file path or a list of tuples/lists",
+                "name": "reference_regions",
+                "type": "str",
+            },
+        ],
+    },
 ]
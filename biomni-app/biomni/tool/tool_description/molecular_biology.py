@@ -1,8 +1,7 @@
 description = [
     {
-        "description": "Find all Open Reading Frames (ORFs) in a DNA sequence using "
-        "Biopython, searching both forward and reverse complement "
-        "strands.",
+        "description": "Find all Open Reading Frames (ORFs) in a DNA sequence or a multi-record FASTA/GenBank "
+        "file, searching both forward and reverse complement strands. Fast enough for whole bacterial genomes.",
         "name": "annotate_open_reading_frames",
         "optional_parameters": [
             {
@@ -13,15 +12,21 @@ description = [
             },
             {
                 "default": False,
-                "description": "Whether to filter out ORFs with same end but later start",
+                "description": "Whether to filter out ORFs contained in another ORF on the same strand",
                 "name": "filter_subsets",
                 "type": "bool",
             },
+            {
+                "default": False,
+                "description": "Return the ORFs as one compact table (pandas DataFrame) without nucleotide sequences",
+                "name": "columnar",
+                "type": "bool",
+            },
         ],
         "required_parameters": [
             {
                 "default": None,
-                "description": "DNA sequence to analyze",
+                "description": "DNA sequence to analyze, or path to a FASTA or GenBank file",
                 "name": "sequence",
                 "type": "str",
             },
@@ -107,14 +112,21 @@ description = [
     },
     {
         "description": "Align short sequences (primers) to a longer sequence, "
-        "allowing for one mismatch. Checks both forward and reverse "
-        "complement strands.",
+        "allowing for a configurable number of mismatches (default one). Checks both forward and "
+        "reverse complement strands and scales to whole genomes and multi-record FASTA files.",
         "name": "align_sequences",
-        "optional_parameters": [],
+        "optional_parameters": [
+            {
+                "default": 1,
+                "description": "Maximum number of mismatches per alignment",
+                "name": "max_mismatches",
+                "type": "int",
+            }
+        ],
         "required_parameters": [
             {
                 "default": None,
-                "description": "Target DNA sequence",
+                "description": "Target DNA sequence, or path to a FASTA or GenBank file whose records are all searched",
                 "name": "long_seq",
                 "type": "str",
             },
@@ -135,7 +147,13 @@ description = [
                 "description": "Whether the sequence is circular",
                 "name": "circular",
                 "type": "bool",
-            }
+            },
+            {
+                "default": 1,
+                "description": "Maximum number of mismatches per primer binding site",
+                "name": "max_mismatches",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
@@ -231,6 +249,47 @@ description = [
             }
         ],
     },
+    {
+        "description": "Finds the restriction sites and digest fragments of many DNA sequences against one "
+        "enzyme panel in a single pass, returning a per-sequence summary, a table of cut sites and a table of "
+        "fragments.",
+        "name": "batch_restriction_analysis",
+        "optional_parameters": [
+            {
+                "default": "CommOnly",
+                "description": "Enzyme names, or a Biopython batch: CommOnly (commercially available enzymes), "
+                "AllEnzymes or NonComm",
+                "name": "enzymes",
+                "type": "Union[str, List[str]]",
+            },
+            {
+                "default": True,
+                "description": "Whether the sequences are circular (True) or linear (False)",
+                "name": "is_circular",
+                "type": "bool",
+            },
+            {
+                "default": False,
+                "description": "Digest each sequence with all enzymes together instead of one enzyme at a time",
+                "name": "combined_digest",
+                "type": "bool",
+            },
+            {
+                "default": None,
+                "description": "Number of worker processes for large batches",
+                "name": "processes",
+                "type": "int",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "Sequences as a list, a dict of name to sequence, or a path to a FASTA or GenBank file",
+                "name": "sequences",
+                "type": "Union[str, List[str], Dict[str, str]]",
+            }
+        ],
+    },
     {
         "description": "Compare query sequence against reference sequence to identify mutations.",
         "name": "find_sequence_mutations",
@@ -260,7 +319,7 @@ description = [
     {
         "description": "Design sgRNAs for CRISPR knockout by searching pre-computed "
         "sgRNA libraries. Returns optimized guide RNAs for targeting "
-        "a specific gene.",
+        "a specific gene, or for every gene of a list in one call.",
         "name": "design_knockout_sgrna",
         "optional_parameters": [
             {
@@ -271,7 +330,7 @@ description = [
             },
             {
                 "default": 1,
-                "description": "Number of guides to return",
+                "description": "Number of guides to return per gene",
                 "name": "num_guides",
                 "type": "int",
             },
@@ -279,9 +338,10 @@ description = [
         "required_parameters": [
             {
                 "default": None,
-                "description": 'Target gene symbol/name (e.g., "EGFR", "TP53")',
+                "description": 'Target gene symbol/name (e.g., "EGFR", "TP53"), or a list of them to design a '
+                "whole screen at once",
                 "name": "gene_name",
-                "type": "str",
+                "type": "Union[str, List[str]]",
             },
             {
                 "default": None,
@@ -46,8 +46,8 @@ description = [
         "name": "docking_autodock_vina",
         "optional_parameters": [
             {
-                "default": 1,
-                "description": "Number of CPU cores to use for docking",
+                "default": None,
+                "description": "Number of docking worker processes; defaults to the host's core count",
                 "name": "ncpu",
                 "type": "int",
             }
@@ -122,9 +122,10 @@ description = [
         "required_parameters": [
             {
                 "default": None,
-                "description": "The name of the disease for which to retrieve drug predictions",
+                "description": "The name of the disease for which to retrieve drug predictions, or a list of "
+                "diseases to retrieve in one batch",
                 "name": "disease_name",
-                "type": "str",
+                "type": "Union[str, List[str]]",
             },
             {
                 "default": None,
@@ -642,7 +643,7 @@ description = [
             },
             {
                 "default": 100,
-                "description": "Maximum number of results to return",
+                "description": "Maximum number of reports to retrieve; pages of up to 1,000 are fetched in parallel, up to the API's 26,000",
                 "name": "limit",
                 "type": "int",
             },
@@ -695,7 +696,7 @@ description = [
         ],
     },
     {
-        "description": "Analyze safety signals across multiple drugs using OpenFDA adverse event data to identify patterns and comparative risk profiles.",
+        "description": "Analyze safety signals across multiple drugs using OpenFDA adverse event data to identify patterns and comparative risk profiles. Counts cover every report of each drug, aggregated server-side.",
         "name": "analyze_fda_safety_signals",
         "required_parameters": [
             {
@@ -1,5 +1,6 @@
 import ast
 import enum
+import functools
 import importlib
 import json
 import os
@@ -9,7 +10,6 @@ import tempfile
 import traceback
 import zipfile
 from typing import Any, ClassVar
-from urllib.parse import urljoin
 
 import pandas as pd
 import requests
@@ -590,8 +590,16 @@ class ID(enum.Enum):
     ENSEMBL_W_VERSION = "Ensembl with version"  # e.g. ENSG00000123374.10 (needed for GTEx)
 
 
-def get_gene_id(gene_symbol: str, id_type: ID):
-    """Get the ID for a gene symbol. If no match found, returns None."""
+def get_gene_id(gene_symbol: str, id_type: ID, data_lake_path: str | None = None):
+    """Get the ID for a gene symbol. If no match found, returns None.
+
+    With a data_lake_path, Entrez and Ensembl ids are first looked up offline in the local gene table, which
+    also resolves aliases and previous symbols; the web services are only asked about misses.
+    """
+    if data_lake_path is not None and id_type in (ID.ENTREZ, ID.ENSEMBL):
+        gene_id = _get_gene_id_offline(gene_symbol, id_type, data_lake_path)
+        if gene_id is not None:
+            return gene_id
     if id_type == ID.ENTREZ:
         return _get_gene_id_entrez(gene_symbol)
     elif id_type == ID.ENSEMBL:
@@ -602,6 +610,20 @@ def get_gene_id(gene_symbol: str, id_type: ID):
         raise ValueError(f"ID type {id_type} not supported")
 
 
+def _get_gene_id_offline(gene_symbol: str, id_type: ID, data_lake_path: str):
+    """Look up an Entrez or Ensembl ID in the local gene table. Returns None on a miss or without the table."""
+    from biomni.data_lake.gene_ids import load_gene_normalizer
+
+    try:
+        normalizer = load_gene_normalizer(data_lake_path)
+    except (OSError, ValueError, KeyError, RuntimeError):
+        return None
+    gene_id = normalizer.map([gene_symbol], to="entrez" if id_type == ID.ENTREZ else "ensembl")[0]
+    if pd.isna(gene_id):
+        return None
+    return int(gene_id) if id_type == ID.ENTREZ else gene_id
+
+
 def _get_gene_id_entrez(gene_symbol: str):
     """Get the Entrez ID for a gene symbol. If no match found, returns None
     e.g. 1017 (CDK2).
@@ -802,6 +824,27 @@ def parse_hpo_obo(file_path):
     return hp_dict
 
 
+@functools.lru_cache(maxsize=4)
+def _parse_hpo_obo_cached(file_path, mtime):
+    return parse_hpo_obo(file_path)
+
+
+def load_hpo_obo(file_path):
+    """Return the parsed HPO ontology, parsing the OBO file only once per process.
+
+    The result is shared between callers and must not be modified. Parsing it in a pre-fork master
+    lets every worker reuse the same pages copy-on-write.
+
+    Args:
+        file_path (str): Path to the HPO OBO file.
+
+    Returns:
+        dict: A dictionary where keys are HP IDs and values are phenotype descriptions.
+
+    """
+    return _parse_hpo_obo_cached(os.path.abspath(file_path), os.path.getmtime(file_path))
+
+
 def textify_api_dict(api_dict):
     """Convert a nested API dictionary to a nicely formatted string."""
     lines = []
@@ -840,36 +883,90 @@ def textify_api_dict(api_dict):
     return "\n".join(lines)
 
 
-def read_module2api():
-    fields = [
-        "literature",
-        "biochemistry",
-        "bioengineering",
-        "biophysics",
-        "cancer_biology",
-        "cell_biology",
-        "molecular_biology",
-        "genetics",
-        "genomics",
-        "immunology",
-        "microbiology",
-        "pathology",
-        "pharmacology",
-        "physiology",
-        "synthetic_biology",
-        "systems_biology",
-        "support_tools",
-        "database",
-    ]
-
+TOOL_FIELDS = [
+    "literature",
+    "biochemistry",
+    "bioengineering",
+    "biophysics",
+    "cancer_biology",
+    "cell_biology",
+    "molecular_biology",
+    "genetics",
+    "genomics",
+    "immunology",
+    "microbiology",
+    "pathology",
+    "pharmacology",
+    "physiology",
+    "synthetic_biology",
+    "systems_biology",
+    "support_tools",
+    "database",
+]
+
+TOOL_DESCRIPTION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool", "tool_description")
+TOOL_CATALOG_PATH = os.path.join(TOOL_DESCRIPTION_DIR, "catalog.json")
+
+
+def _tool_description_hash() -> str:
+    """Hash the tool_description sources so a stale precompiled catalogue is detected."""
+    import hashlib
+
+    digest = hashlib.sha256()
+    for field in TOOL_FIELDS:
+        with open(os.path.join(TOOL_DESCRIPTION_DIR, f"{field}.py"), "rb") as f:
+            digest.update(field.encode())
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _import_module2api():
     module2api = {}
-    for field in fields:
+    for field in TOOL_FIELDS:
         module_name = f"biomni.tool.tool_description.{field}"
         module = importlib.import_module(module_name)
         module2api[f"biomni.tool.{field}"] = module.description
     return module2api
 
 
+def build_tool_catalog(path: str = TOOL_CATALOG_PATH) -> str:
+    """Precompile the tool descriptions into a JSON catalogue read by `read_module2api`.
+
+    Run this after editing anything under biomni/tool/tool_description:
+    ``python -c "from biomni.utils import build_tool_catalog; build_tool_catalog()"``
+
+    Args:
+        path: Where to write the catalogue
+
+    Returns:
+        Path of the written catalogue
+
+    """
+    catalog = {"source_hash": _tool_description_hash(), "module2api": _import_module2api()}
+    with open(path, "w") as f:
+        json.dump(catalog, f, indent=1)
+        f.write("\n")
+    print(f"✓ Wrote tool catalogue for {len(TOOL_FIELDS)} modules to {path}")
+    return path
+
+
+def read_module2api():
+    """Load the tool descriptions of every tool module.
+
+    Reads the precompiled catalogue when it matches the description sources, and falls back to
+    importing the 18 description modules when it is missing or stale.
+    """
+    try:
+        with open(TOOL_CATALOG_PATH) as f:
+            catalog = json.load(f)
+        if catalog.get("source_hash") == _tool_description_hash():
+            return catalog["module2api"]
+        print("Tool catalogue is stale, importing tool descriptions (rebuild with build_tool_catalog())")
+    except (OSError, ValueError):
+        pass
+    return _import_module2api()
+
+
 def download_and_unzip(url: str, dest_dir: str) -> str:
     """Download a zip file from a URL and extract it to the destination directory.
 
@@ -913,100 +1010,36 @@ def download_and_unzip(url: str, dest_dir: str) -> str:
 
 
 def check_and_download_s3_files(
-    s3_bucket_url: str, local_data_lake_path: str, expected_files: list[str], folder: str = "data_lake"
+    s3_bucket_url: str,
+    local_data_lake_path: str,
+    expected_files: list[str],
+    folder: str = "data_lake",
+    workers: int = 8,
 ) -> dict[str, bool]:
     """Check for missing files in the local data lake and download them from S3 bucket.
 
+    Downloads run concurrently, resume from partial ``.part`` files and are checked against the
+    bucket manifest before being renamed into place (see `biomni.data_lake.download`).
+
     Args:
         s3_bucket_url: Base URL of the S3 bucket (e.g., "https://biomni-release.s3.amazonaws.com")
         local_data_lake_path: Local path to the data lake directory
         expected_files: List of expected file names in the data lake
         folder: S3 folder name ("data_lake" or "benchmark")
+        workers: Number of concurrent transfers
 
     Returns:
         Dictionary mapping file names to download success status
     """
+    from biomni.data_lake.download import DownloadManager
 
-    os.makedirs(local_data_lake_path, exist_ok=True)
-    download_results = {}
-
-    def download_with_progress(url: str, file_path: str, desc: str) -> bool:
-        """Download file with progress bar."""
-        try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get("content-length", 0))
-
-            with open(file_path, "wb") as f:
-                if total_size > 0:
-                    with tqdm.tqdm(total=total_size, unit="B", unit_scale=True, desc=desc, ncols=80) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-            return True
-        except Exception as e:
-            print(f"✗ Failed to download {desc}: {e}")
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except OSError:
-                    pass
-            return False
-
-    def cleanup_file(file_path: str):
-        """Clean up file if it exists."""
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except OSError:
-                pass
+    manager = DownloadManager(base_url=s3_bucket_url, workers=workers)
 
     # Handle benchmark folder (download as zip)
     if folder == "benchmark":
         print(f"Downloading entire {folder} folder structure...")
-        s3_zip_url = urljoin(s3_bucket_url + "/", folder + ".zip")
-
-        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp_zip:
-            tmp_zip_path = tmp_zip.name
-
-            if download_with_progress(s3_zip_url, tmp_zip_path, f"{folder}.zip"):
-                print(f"Extracting {folder}.zip...")
-                try:
-                    with zipfile.ZipFile(tmp_zip_path, "r") as zip_ref:
-                        zip_ref.extractall(local_data_lake_path)
-                    print(f"✓ Successfully downloaded and extracted {folder} folder")
-                    download_results = dict.fromkeys(expected_files, True)
-                except Exception as e:
-                    print(f"✗ Error extracting {folder}.zip: {e}")
-                    download_results = dict.fromkeys(expected_files, False)
-                finally:
-                    cleanup_file(tmp_zip_path)
-            else:
-                download_results = dict.fromkeys(expected_files, False)
-
-        return download_results
+        ok = manager.download_archive(folder, local_data_lake_path)
+        return dict.fromkeys(expected_files, ok)
 
     # Handle data_lake folder (download individual files)
-    for filename in expected_files:
-        local_file_path = os.path.join(local_data_lake_path, filename)
-
-        if os.path.exists(local_file_path):
-            download_results[filename] = True
-            continue
-
-        s3_file_url = urljoin(s3_bucket_url + "/" + folder + "/", filename)
-        print(f"Downloading {filename} from {folder}...")
-
-        if download_with_progress(s3_file_url, local_file_path, filename):
-            print(f"✓ Successfully downloaded: {filename}")
-            download_results[filename] = True
-        else:
-            download_results[filename] = False
-
-    return download_results
+    return manager.download_files(folder, local_data_lake_path, expected_files)
@@ -26,14 +26,29 @@ def create_agent() -> Any:
         llm=model_name,
         source=source,  # type: ignore[arg-type]
         api_key=api_key,
+        # Fetch data lake files on first use instead of downloading ~11GB before serving
+        lazy_data_lake=os.getenv("BIOMNI_LAZY_DATA_LAKE", "false").lower() in {"1", "true", "yes"},
     )
 
 
+def warm_up_agent(agent: Any) -> dict[str, Any]:
+    # Comma-separated data lake files to materialize before serving, e.g. "hp.obo,gene_info.parquet"
+    files = [name.strip() for name in os.getenv("BIOMNI_PRELOAD_DATA_LAKE", "").split(",") if name.strip()]
+    # Comma-separated tables to decode into the host-wide shared Arrow cache, e.g. "DisGeNET.parquet"
+    tables = [name.strip() for name in os.getenv("BIOMNI_SHARED_TABLES", "").split(",") if name.strip()]
+    if os.getenv("BIOMNI_WARMUP", "true").lower() not in {"1", "true", "yes"}:
+        return {"skipped": True}
+    return agent.warm_up(data_lake_files=files, shared_tables=tables)
+
+
 app = Flask(__name__)
 
-# Create a single shared agent instance at server startup
+# Create a single shared agent instance at server startup. Under gunicorn with preload_app
+# (see gunicorn.conf.py) this runs once in the master and workers inherit the warmed agent.
 agent = create_agent()
 agent_lock = threading.Lock()
+# Warm-up finishes before the server binds, so a reachable /ready means the agent is warm
+warm_up_summary = warm_up_agent(agent)
 
 
 @app.get("/health")
@@ -41,6 +56,11 @@ def health() -> Any:
     return jsonify({"status": "ok"})
 
 
+@app.get("/ready")
+def ready() -> Any:
+    return jsonify({"status": "ready", "warm_up": warm_up_summary})
+
+
 @app.post("/go")
 def go() -> Any:
     print("recieved request", request)
@@ -82,5 +102,6 @@ if __name__ == "__main__":
     host = os.getenv("FLASK_HOST", "0.0.0.0")
     port = int(os.getenv("FLASK_PORT", "8080"))
     debug = os.getenv("FLASK_DEBUG", "false").lower() in {"1", "true", "yes"}
-    # Flask's built-in server is fine for local/dev. Use gunicorn/uwsgi for production.
+    # Flask's built-in server is fine for local/dev. For production use the pre-fork config:
+    #   gunicorn -c gunicorn.conf.py flask_server:app
     app.run(host=host, port=port, debug=debug, threaded=True)
@@ -0,0 +1,30 @@
+"""Pre-fork serving for flask_server.
+
+    gunicorn -c gunicorn.conf.py flask_server:app
+
+The master imports flask_server once (preload_app), which builds and warms the agent: tool registry,
+system prompt, tool modules, HPO ontology and any BIOMNI_PRELOAD_DATA_LAKE files. Workers are then
+forked and share that state copy-on-write, so each one starts almost instantly and only pays for the
+memory it writes to.
+"""
+
+import gc
+import os
+
+bind = f"{os.getenv('FLASK_HOST', '0.0.0.0')}:{os.getenv('FLASK_PORT', '8080')}"
+workers = int(os.getenv("BIOMNI_WORKERS", "4"))
+# Agent requests hold the per-worker agent lock for the whole run, so extra threads only help /health and /ready
+threads = int(os.getenv("BIOMNI_WORKER_THREADS", "4"))
+# Agent runs routinely take minutes
+timeout = int(os.getenv("BIOMNI_WORKER_TIMEOUT", "900"))
+preload_app = True
+
+
+def pre_fork(server, worker):
+    # Move everything allocated during warm-up into the permanent generation. Otherwise the first
+    # collection in each worker writes to every object header and un-shares the pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    server.log.info("Worker %s forked from warmed master (%d frozen objects)", worker.pid, gc.get_freeze_count())